@@ -1,19 +1,31 @@
-from typing import Any, Generic, TypeVar
+import base64
+import json
+from datetime import datetime
+from typing import Any, Generic, Literal, TypeVar
 
 from pydantic import BaseModel
+from sqlalchemy import func, select, text, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.exceptions.http_exceptions import BadRequestException
 
 SchemaType = TypeVar("SchemaType", bound=BaseModel)
 
+# How the total count of a keyset page is computed: with a COUNT, from the query plan of the planner or not at all
+TotalCount = Literal["exact", "estimated", "none"]
+
 
 class ListResponse(BaseModel, Generic[SchemaType]):
     data: list[SchemaType]
 
 
 class PaginatedListResponse(ListResponse[SchemaType]):
-    total_count: int
+    total_count: int | None
     has_more: bool
     page: int | None = None
     items_per_page: int | None = None
+    next_cursor: str | None = None
 
 
 def paginated_response(crud_data: dict, page: int, items_per_page: int) -> dict[str, Any]:
@@ -46,6 +58,30 @@ def paginated_response(crud_data: dict, page: int, items_per_page: int) -> dict[
     }
 
 
+def cursor_paginated_response(crud_data: dict, items_per_page: int) -> dict[str, Any]:
+    """Create a paginated response from a keyset page of `keyset_paginate`.
+
+    Parameters
+    ----------
+    crud_data : dict
+        The page, with the items in `data`, the `total_count`, `has_more` and the `next_cursor`.
+    items_per_page : int
+        Number of items per page.
+
+    Returns
+    -------
+    dict[str, Any]
+        A structured paginated response dict, the next page is requested with `next_cursor` instead of a page number.
+    """
+    return {
+        "data": crud_data["data"],
+        "total_count": crud_data["total_count"],
+        "has_more": crud_data["has_more"],
+        "items_per_page": items_per_page,
+        "next_cursor": crud_data["next_cursor"],
+    }
+
+
 def compute_offset(page: int, items_per_page: int) -> int:
     """Calculate the offset for pagination based on the given page number and items per page.
 
@@ -73,3 +109,99 @@ def compute_offset(page: int, items_per_page: int) -> int:
     20
     """
     return (page - 1) * items_per_page
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Encode the position of the last item of a keyset page into an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps([created_at.isoformat(), id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor built by `encode_cursor`.
+
+    Raises
+    ------
+    BadRequestException
+        If the cursor was not built by `encode_cursor`.
+    """
+    try:
+        created_at, id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, TypeError) as e:
+        raise BadRequestException("Invalid cursor") from e
+
+
+async def keyset_paginate(
+    db: AsyncSession,
+    model: Any,
+    schema_to_select: type[BaseModel],
+    cursor: str | None,
+    items_per_page: int,
+    total: TotalCount = "none",
+    **filters: Any,
+) -> dict[str, Any]:
+    """Get a page of items, the newest first, positioned by a cursor on (`created_at`, `id`) instead of an offset.
+
+    The page is read from where the previous one ended, so with an index on the filtered columns followed by
+    (`created_at`, `id`) a deep page costs the same as the first one.
+
+    Parameters
+    ----------
+    db : AsyncSession
+        The database session.
+    model : Any
+        The SQLAlchemy model, with `created_at` and `id` columns.
+    schema_to_select : type[BaseModel]
+        The schema of the items, the matching columns of the model are selected.
+    cursor : str | None
+        The `next_cursor` of the previous page, None or empty for the first page.
+    items_per_page : int
+        Number of items per page.
+    total : TotalCount
+        How the `total_count` is computed: 'exact' runs a COUNT, 'estimated' reads the row estimate of the planner
+        and 'none' skips it.
+    **filters : Any
+        Equality filters on the columns of the model.
+
+    Returns
+    -------
+    dict[str, Any]
+        The items in `data`, the `total_count`, `has_more` and the `next_cursor`, to pass to `paginated_response`.
+    """
+    conditions = [getattr(model, column) == value for column, value in filters.items()]
+    fields = [field for field in schema_to_select.model_fields if hasattr(model, field)]
+    selected = dict.fromkeys([*fields, "created_at", "id"])
+
+    query = select(*(getattr(model, field) for field in selected)).where(*conditions)
+    if cursor:
+        query = query.where(tuple_(model.created_at, model.id) < tuple_(*decode_cursor(cursor)))
+    query = query.order_by(model.created_at.desc(), model.id.desc()).limit(items_per_page + 1)
+
+    rows = (await db.execute(query)).mappings().all()
+    has_more = len(rows) > items_per_page
+    rows = rows[:items_per_page]
+
+    total_count: int | None = None
+    if total == "exact":
+        total_count = (await db.execute(select(func.count()).select_from(model).where(*conditions))).scalar_one()
+    elif total == "estimated":
+        total_count = await estimate_count(db, select(model.id).where(*conditions))
+
+    return {
+        "data": [{field: row[field] for field in fields} for row in rows],
+        "total_count": total_count,
+        "has_more": has_more,
+        "next_cursor": encode_cursor(rows[-1]["created_at"], rows[-1]["id"]) if has_more else None,
+    }
+
+
+async def estimate_count(db: AsyncSession, query: Any) -> int:
+    """Estimate the number of rows of a query from the plan of the planner, without running it.
+
+    The estimate comes from the table statistics, it can be off by a few percent right after large changes.
+    """
+    statement = str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    plan = (await db.execute(text(f"EXPLAIN (FORMAT JSON) {statement}"))).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
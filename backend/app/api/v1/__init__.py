@@ -14,6 +14,7 @@ from .scores import router as scores_router
 from .tasks import router as tasks_router
 from .tiers import router as tiers_router
 from .users import router as users_router
+from .weight_profiles import router as weight_profiles_router
 
 router = APIRouter(prefix="/v1")
 router.include_router(login_router)
@@ -30,3 +31,4 @@ router.include_router(parsed_job_description_router)
 router.include_router(parsed_resume_router)
 router.include_router(scores_router)
 router.include_router(resume_router)
+router.include_router(weight_profiles_router)
@@ -5,8 +5,10 @@ import fastapi
 from fastapi import Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...core.config import settings
 from ...core.db.database import async_get_db
 from ...core.exceptions.http_exceptions import ForbiddenException, NotFoundException
+from ...core.exceptions.storage_exceptions import FileTooLargeError
 from ...core.logger import logging
 from ...core.utils.s3 import upload_s3_file
 from ...crud.crud_feedback import crud_feedback
@@ -36,16 +38,16 @@ async def write_feedback(
     # Upload the PDF and create the resume entry
     s3_url = None
     if feedback.pdf_file:
-        if feedback.pdf_file.size is not None and feedback.pdf_file.size > 30 * 1024 * 1024:
-            raise HTTPException(
-                status_code=400, detail="The PDF uploaded is too large, please resize it and try again."
-            )
         file_name = str(uuid.uuid4())
-        s3_url = await upload_s3_file(
-            file=feedback.pdf_file,
-            file_name=f"{file_name}.pdf",
-            folder_path=f"feedback/{username}",  # we create a new path for each user
-        )
+        try:
+            s3_url = await upload_s3_file(
+                file=feedback.pdf_file,
+                file_name=f"{file_name}.pdf",
+                folder_path=f"feedback/{username}",  # we create a new path for each user
+                max_size=settings.PDF_MAX_UPLOAD_SIZE,
+            )
+        except FileTooLargeError as e:
+            raise HTTPException(status_code=400, detail=e.message)
 
     feedback_internal_dict = feedback.model_dump()
     feedback_internal_dict.pop("pdf_file", None)  # removing the key as we already saved it to s3
@@ -1,19 +1,34 @@
-import logging
 import uuid
 from typing import Annotated
 
 import fastapi
-from fastapi import BackgroundTasks, Depends, Request, status
+from fastapi import Depends, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...api.paginated import PaginatedListResponse, compute_offset, paginated_response
+from ...api.paginated import (
+    PaginatedListResponse,
+    TotalCount,
+    compute_offset,
+    cursor_paginated_response,
+    keyset_paginate,
+    paginated_response,
+)
 from ...core.config import settings
 from ...core.db.database import async_get_db
-from ...core.exceptions.http_exceptions import ForbiddenException, NotFoundException
+from ...core.exceptions.http_exceptions import DuplicateValueException, ForbiddenException, NotFoundException
+from ...core.exceptions.storage_exceptions import FileTooLargeError
+from ...core.security import create_upload_token, verify_upload_token
+from ...core.utils import queue
 from ...core.utils.cache import cache
-from ...core.utils.s3 import upload_s3_file
+from ...core.utils.s3 import (
+    build_s3_url,
+    create_presigned_post,
+    hash_upload_file,
+    head_s3_object,
+    make_object_name,
+    upload_s3_file,
+)
 from ...crud.crud_job_description import crud_job_description
-from ...crud.crud_parsed_job_description import crud_parsed_job_description
 from ...crud.crud_users import crud_users
 from ...schemas.common import CommonResponse
 from ...schemas.job_description import (
@@ -21,59 +36,18 @@ from ...schemas.job_description import (
     JobDescriptionCreateInternal,
     JobDescriptionRead,
     JobDescriptionUpdate,
+    JobDescriptionUploadComplete,
 )
-from ...schemas.parsed_job_description import ParsedJobDescriptionCreateInternal
+from ...schemas.upload import PresignedUploadRead
 from ...schemas.user import UserRead
-from ...services.job_description.workflow import (
-    extract_job_description_skills,
-    extract_job_description_text,
-)
 from ..dependencies import get_current_user
 
 router = fastapi.APIRouter(tags=["job_description"])
 
 
-async def combined_workflow(
-    job_description: JobDescriptionRead,
-    db: Annotated[AsyncSession, Depends(async_get_db)],
-) -> None:
-    # Extract the PDF text with pdfplumber
-    logging.info(f"Extracting text from PDF {job_description.s3_url}")
-    text = await extract_job_description_text(
-        job_description=job_description,
-    )
-
-    # Update the job_description
-    job_update = JobDescriptionUpdate(description=text)
-    await crud_job_description.update(
-        db=db,
-        object=job_update,
-        id=job_description.id,
-    )
-
-    # Extract the job description skills
-    logging.info(f"Processing job description with id {job_description.id}")
-    job_skills = await extract_job_description_skills(
-        job_description,
-    )
-    logging.info(f"Parsed skills: {job_skills.model_dump()}")
-
-    # Save the parsed skills into a new model
-    parsed_job_description = await crud_parsed_job_description.create(
-        db=db,
-        object=ParsedJobDescriptionCreateInternal(
-            job_description_id=job_description.id,
-            parsed_skills=job_skills.model_dump(),
-            created_by_user_id=job_description.created_by_user_id,
-        ),
-    )
-    logging.info(f"Saved parsed job description with id {parsed_job_description.id}")
-
-
 @router.post("/{username}/job_description", response_model=JobDescriptionRead, status_code=status.HTTP_201_CREATED)
 async def create_job_description(
     request: Request,
-    background_tasks: BackgroundTasks,
     username: str,
     job_description: JobDescriptionCreate,
     current_user: Annotated[UserRead, Depends(get_current_user)],
@@ -96,10 +70,11 @@ async def create_job_description(
     job_description_internal_dict = job_description.model_dump()
     job_description_internal_dict["created_by_user_id"] = db_user["id"]
 
-    # If description is provided and pdf is None, create job descripiton with description
+    # If description is provided and pdf is None, create job descripiton with description and parse its skills
     if job_description.description and job_description.pdf_file == None:
         job_description_internal = JobDescriptionCreateInternal(**job_description_internal_dict)
         created_job_description = await crud_job_description.create(db=db, object=job_description_internal)
+        await queue.enqueue_task("parse_job_description_task", created_job_description.id)
         return created_job_description
 
     # If pdf is provided, save the pdf and create job description only with name, then trigger
@@ -109,23 +84,112 @@ async def create_job_description(
         and not isinstance(job_description.pdf_file, str)
         and job_description.description == None
     ):
-        s3_url = await upload_s3_file(job_description.pdf_file, f"{str(uuid.uuid4())}.pdf", "job_descriptions")
-        job_description_internal_dict["s3_url"] = s3_url
+        # Identical PDFs uploaded by the same user share the S3 object and the extracted description
+        try:
+            content_hash = await hash_upload_file(job_description.pdf_file, max_size=settings.PDF_MAX_UPLOAD_SIZE)
+        except FileTooLargeError as e:
+            raise fastapi.HTTPException(status_code=400, detail=e.message)
+
+        duplicate_filters = {"created_by_user_id": db_user["id"], "content_hash": content_hash, "is_deleted": False}
+        duplicate: JobDescriptionRead | None = await crud_job_description.get(
+            db=db, schema_to_select=JobDescriptionRead, return_as_model=True, description__ne=None, **duplicate_filters
+        )
+        if duplicate is None:
+            duplicate = await crud_job_description.get(
+                db=db, schema_to_select=JobDescriptionRead, return_as_model=True, **duplicate_filters
+            )
+
+        job_description_internal_dict["content_hash"] = content_hash
+        if duplicate is not None:
+            job_description_internal_dict["s3_url"] = duplicate.s3_url
+            job_description_internal_dict["description"] = duplicate.description
+        else:
+            try:
+                job_description_internal_dict["s3_url"] = await upload_s3_file(
+                    job_description.pdf_file,
+                    f"{str(uuid.uuid4())}.pdf",
+                    "job_descriptions",
+                    max_size=settings.PDF_MAX_UPLOAD_SIZE,
+                )
+            except FileTooLargeError as e:
+                raise fastapi.HTTPException(status_code=400, detail=e.message)
+
         job_description_internal = JobDescriptionCreateInternal(**job_description_internal_dict)
         created_job_description: JobDescriptionRead = await crud_job_description.create(
             db=db, object=job_description_internal
         )
-        background_tasks.add_task(combined_workflow, job_description=created_job_description, db=db)
+        if job_description_internal.description is not None:
+            await queue.enqueue_task("parse_job_description_task", created_job_description.id)
+        else:
+            await queue.enqueue_task("extract_job_description_text_task", created_job_description.id)
         return created_job_description
 
-    # If you already have the text from the job description
-    if job_description is not None:
-        background_tasks.add_task(
-            extract_job_description_skills,
-            job_description=job_description,
-            db=db,
-        )
+    raise fastapi.HTTPException(status_code=400, detail="Either a description or a pdf should be provided")
+
+
+@router.post(
+    "/{username}/job_description/upload", response_model=PresignedUploadRead, status_code=status.HTTP_201_CREATED
+)
+async def create_job_description_upload(
+    request: Request,
+    username: str,
+    current_user: Annotated[UserRead, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(async_get_db)],
+) -> PresignedUploadRead:
+    db_user = await crud_users.get(db=db, schema_to_select=UserRead, username=username, is_deleted=False)
+    if db_user is None:
+        raise NotFoundException("User not found")
 
+    if current_user["id"] != db_user["id"]:
+        raise ForbiddenException()
+
+    # The client posts the PDF straight to S3, then calls the completion endpoint with the upload token
+    object_name = make_object_name(f"{uuid.uuid4()}.pdf")
+    presigned_post = create_presigned_post(object_name=object_name, max_size=settings.PDF_MAX_UPLOAD_SIZE)
+    return PresignedUploadRead(
+        **presigned_post,
+        upload_token=await create_upload_token(object_name=object_name, kind="job_description", user_id=db_user["id"]),
+        expires_in=settings.S3_PRESIGNED_EXPIRE_SECONDS,
+    )
+
+
+@router.post(
+    "/{username}/job_description/upload/complete",
+    response_model=JobDescriptionRead,
+    status_code=status.HTTP_201_CREATED,
+)
+async def complete_job_description_upload(
+    request: Request,
+    username: str,
+    upload: JobDescriptionUploadComplete,
+    current_user: Annotated[UserRead, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(async_get_db)],
+) -> JobDescriptionRead:
+    db_user = await crud_users.get(db=db, schema_to_select=UserRead, username=username, is_deleted=False)
+    if db_user is None:
+        raise NotFoundException("User not found")
+
+    if current_user["id"] != db_user["id"]:
+        raise ForbiddenException()
+
+    object_name = await verify_upload_token(token=upload.upload_token, kind="job_description", user_id=db_user["id"])
+    if object_name is None:
+        raise fastapi.HTTPException(status_code=400, detail="The upload token is invalid or expired")
+
+    if await head_s3_object(object_name) is None:
+        raise fastapi.HTTPException(status_code=400, detail="The PDF was not uploaded, please upload it and try again.")
+
+    s3_url = build_s3_url(folder_path="job_descriptions", object_name=object_name)
+    if await crud_job_description.exists(db=db, s3_url=s3_url):
+        raise DuplicateValueException("This upload was already completed")
+
+    job_description_internal = JobDescriptionCreateInternal(
+        title=upload.title, s3_url=s3_url, created_by_user_id=db_user["id"]
+    )
+    created_job_description: JobDescriptionRead = await crud_job_description.create(
+        db=db, object=job_description_internal
+    )
+    await queue.enqueue_task("extract_job_description_text_task", created_job_description.id)
     return created_job_description
 
 
@@ -153,9 +217,11 @@ async def read_job_description(
     status_code=status.HTTP_200_OK,
 )
 @cache(
-    key_prefix="{username}_job_descriptions:page_{page}:items_per_page:{items_per_page}",
+    key_prefix="{username}_job_descriptions:page_{page}:items_per_page:{items_per_page}:cursor_{cursor}:total_{total}",
     resource_id_name="username",
     expiration=60,
+    tags=["{username}_job_descriptions"],
+    stale_ttl=300,
 )
 async def read_job_descriptions(
     request: Request,
@@ -163,11 +229,26 @@ async def read_job_descriptions(
     db: Annotated[AsyncSession, Depends(async_get_db)],
     page: int = 1,
     items_per_page: int = 20,
+    cursor: str | None = None,
+    total: TotalCount = "none",
 ) -> dict:
     db_user = await crud_users.get(db=db, schema_to_select=UserRead, username=username, is_deleted=False)
     if not db_user:
         raise NotFoundException("User not found")
 
+    if cursor is not None:
+        job_description_data = await keyset_paginate(
+            db=db,
+            model=crud_job_description.model,
+            schema_to_select=JobDescriptionRead,
+            cursor=cursor,
+            items_per_page=items_per_page,
+            total=total,
+            created_by_user_id=db_user["id"],
+            is_deleted=False,
+        )
+        return cursor_paginated_response(crud_data=job_description_data, items_per_page=items_per_page)
+
     job_description_data = await crud_job_description.get_multi(
         db=db,
         offset=compute_offset(page, items_per_page),
@@ -184,7 +265,7 @@ async def read_job_descriptions(
 @cache(
     "{username}_job_description_cache",
     resource_id_name="id",
-    pattern_to_invalidate_extra=["{username}_job_descriptions:*"],
+    tags_to_invalidate=["{username}_job_descriptions"],
 )
 async def patch_job_description(
     request: Request,
@@ -216,7 +297,7 @@ async def patch_job_description(
 @cache(
     "{username}_job_description_cache",
     resource_id_name="id",
-    to_invalidate_extra={"{username}_job_descriptions": "{username}"},
+    tags_to_invalidate=["{username}_job_descriptions"],
 )
 async def erase_job_description(
     request: Request,
@@ -248,7 +329,6 @@ async def process_job_description(
     username: str,
     id: int,
     current_user: Annotated[UserRead, Depends(get_current_user)],
-    background_tasks: BackgroundTasks,
     db: Annotated[AsyncSession, Depends(async_get_db)],
 ) -> CommonResponse:
     """Process a job description.
@@ -272,8 +352,5 @@ async def process_job_description(
     if db_job_description is None:
         raise NotFoundException("Job description not found")
 
-    background_tasks.add_task(
-        extract_job_description_skills,
-        db_job_description,
-    )
+    await queue.enqueue_task("parse_job_description_task", id)
     return CommonResponse(status=settings.STATUS_SUCCESS, message="Job description began processing successfully.")
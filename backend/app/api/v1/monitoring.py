@@ -5,8 +5,9 @@ from fastapi import APIRouter, status
 from fastapi.exceptions import HTTPException
 
 from ...core.config import settings
+from ...core.utils import cache, llm_cache, pdf_pool
 from ...schemas.common import CommonResponse
-from ...schemas.monitoring import CPUCount
+from ...schemas.monitoring import CacheStats, CPUCount, LLMCacheStats, PDFPoolStats
 
 router = APIRouter(tags=["monitoring"])
 
@@ -42,3 +43,37 @@ async def get_cpu_count() -> CPUCount:
     except Exception as e:
         logging.debug(f"Error retrieving CPU count: {e}")
         raise HTTPException(status_code=500, detail="An error occurred while retrieving CPU count.")
+
+
+@router.get("/llm_cache/stats", response_model=LLMCacheStats, status_code=status.HTTP_200_OK)
+async def get_llm_cache_stats() -> LLMCacheStats:
+    """Get the hit/miss counters of the LLM evaluation cache.
+
+    Returns:
+        LLMCacheStats: A model representing the LLM cache counters.
+    """
+    try:
+        return LLMCacheStats(**await llm_cache.get_stats())
+    except Exception as e:
+        logging.debug(f"Error retrieving LLM cache stats: {e}")
+        raise HTTPException(status_code=500, detail="An error occurred while retrieving LLM cache stats.")
+
+
+@router.get("/pdf_pool/stats", response_model=PDFPoolStats, status_code=status.HTTP_200_OK)
+async def get_pdf_pool_stats() -> PDFPoolStats:
+    """Get the queue depth and the counters of the PDF process pool of this process.
+
+    Returns:
+        PDFPoolStats: A model representing the PDF pool counters.
+    """
+    return PDFPoolStats(**pdf_pool.get_stats())
+
+
+@router.get("/cache/stats", response_model=CacheStats, status_code=status.HTTP_200_OK)
+async def get_cache_stats() -> CacheStats:
+    """Get the stampede protection counters of the response cache of this process.
+
+    Returns:
+        CacheStats: A model representing the cache counters.
+    """
+    return CacheStats(**cache.get_stats())
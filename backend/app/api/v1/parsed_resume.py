@@ -9,11 +9,13 @@ from ...core.config import settings
 from ...core.db.database import async_get_db
 from ...core.exceptions.http_exceptions import ForbiddenException, NotFoundException
 from ...core.utils.cache import cache
+from ...crud.crud_job_description import crud_job_description
 from ...crud.crud_parsed_resume import crud_parsed_resume
 from ...crud.crud_users import crud_users
 from ...schemas.common import CommonResponse
-from ...schemas.parsed_resume import ParsedResumeRead
+from ...schemas.parsed_resume import ParsedResumeRead, ParsedResumeStatsRead
 from ...schemas.user import UserRead
+from ...services.scorer.counts import job_skill_stats
 
 router = fastapi.APIRouter(tags=["parsed_resume"])
 
@@ -43,6 +45,37 @@ async def read_parsed_resume(
     return db_parsed_resume
 
 
+@router.get(
+    "/{username}/parsed_resumes/{job_id}/stats", response_model=ParsedResumeStatsRead, status_code=status.HTTP_200_OK
+)
+async def read_parsed_resume_stats(
+    request: Request,
+    username: str,
+    job_id: int,
+    current_user: Annotated[UserRead, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(async_get_db)],
+) -> dict:
+    """Get the skill match statistics of the resumes of a job.
+
+    The statistics are aggregated by the database from the match counters of the parsed resumes, without loading
+    their parsed skills.
+
+    :param job_id: ID of the job description.
+    :return: The number of parsed resumes, their average, min and max score and the sum of each match counter.
+    """
+    db_user = await crud_users.get(db=db, schema_to_select=UserRead, username=username, is_deleted=False)
+    if db_user is None:
+        raise NotFoundException("User not found")
+
+    if current_user["id"] != db_user["id"]:
+        raise ForbiddenException()
+
+    if not await crud_job_description.exists(db=db, id=job_id, created_by_user_id=db_user["id"], is_deleted=False):
+        raise NotFoundException("Job description not found")
+
+    return await job_skill_stats(db=db, job_id=job_id)
+
+
 # Note: this is a soft delete (i.e. putting the is_deleted to true
 @router.delete("/{username}/parsed_resume/{id}", response_model=CommonResponse, status_code=status.HTTP_200_OK)
 @cache(
@@ -5,7 +5,14 @@ from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...api.dependencies import get_current_superuser, get_current_user
-from ...api.paginated import PaginatedListResponse, compute_offset, paginated_response
+from ...api.paginated import (
+    PaginatedListResponse,
+    TotalCount,
+    compute_offset,
+    cursor_paginated_response,
+    keyset_paginate,
+    paginated_response,
+)
 from ...core.db.database import async_get_db
 from ...core.exceptions.http_exceptions import ForbiddenException, NotFoundException
 from ...core.utils.cache import cache
@@ -42,9 +49,10 @@ async def write_post(
 
 @router.get("/{username}/posts", response_model=PaginatedListResponse[PostRead])
 @cache(
-    key_prefix="{username}_posts:page_{page}:items_per_page:{items_per_page}",
+    key_prefix="{username}_posts:page_{page}:items_per_page:{items_per_page}:cursor_{cursor}:total_{total}",
     resource_id_name="username",
     expiration=60,
+    tags=["{username}_posts"],
 )
 async def read_posts(
     request: Request,
@@ -52,11 +60,26 @@ async def read_posts(
     db: Annotated[AsyncSession, Depends(async_get_db)],
     page: int = 1,
     items_per_page: int = 10,
+    cursor: str | None = None,
+    total: TotalCount = "none",
 ) -> dict:
     db_user = await crud_users.get(db=db, schema_to_select=UserRead, username=username, is_deleted=False)
     if not db_user:
         raise NotFoundException("User not found")
 
+    if cursor is not None:
+        posts_data = await keyset_paginate(
+            db=db,
+            model=crud_posts.model,
+            schema_to_select=PostRead,
+            cursor=cursor,
+            items_per_page=items_per_page,
+            total=total,
+            created_by_user_id=db_user["id"],
+            is_deleted=False,
+        )
+        return cursor_paginated_response(crud_data=posts_data, items_per_page=items_per_page)
+
     posts_data = await crud_posts.get_multi(
         db=db,
         offset=compute_offset(page, items_per_page),
@@ -88,7 +111,7 @@ async def read_post(
 
 
 @router.patch("/{username}/post/{id}")
-@cache("{username}_post_cache", resource_id_name="id", pattern_to_invalidate_extra=["{username}_posts:*"])
+@cache("{username}_post_cache", resource_id_name="id", tags_to_invalidate=["{username}_posts"])
 async def patch_post(
     request: Request,
     username: str,
@@ -113,7 +136,7 @@ async def patch_post(
 
 
 @router.delete("/{username}/post/{id}")
-@cache("{username}_post_cache", resource_id_name="id", to_invalidate_extra={"{username}_posts": "{username}"})
+@cache("{username}_post_cache", resource_id_name="id", tags_to_invalidate=["{username}_posts"])
 async def erase_post(
     request: Request,
     username: str,
@@ -138,7 +161,7 @@ async def erase_post(
 
 
 @router.delete("/{username}/db_post/{id}", dependencies=[Depends(get_current_superuser)])
-@cache("{username}_post_cache", resource_id_name="id", to_invalidate_extra={"{username}_posts": "{username}"})
+@cache("{username}_post_cache", resource_id_name="id", tags_to_invalidate=["{username}_posts"])
 async def erase_db_post(
     request: Request, username: str, id: int, db: Annotated[AsyncSession, Depends(async_get_db)]
 ) -> dict[str, str]:
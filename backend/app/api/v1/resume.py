@@ -2,100 +2,57 @@ import logging
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Request, status
+from fastapi import APIRouter, HTTPException, Query, Request, status
 from fastapi.param_functions import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...api.paginated import PaginatedListResponse, compute_offset, paginated_response
+from ...api.paginated import (
+    PaginatedListResponse,
+    TotalCount,
+    compute_offset,
+    cursor_paginated_response,
+    keyset_paginate,
+    paginated_response,
+)
 from ...core.config import settings
 from ...core.db.database import async_get_db
-from ...core.exceptions.http_exceptions import ForbiddenException, NotFoundException
+from ...core.exceptions.http_exceptions import DuplicateValueException, ForbiddenException, NotFoundException
+from ...core.exceptions.storage_exceptions import FileTooLargeError
+from ...core.security import create_upload_token, verify_upload_token
+from ...core.utils import leaderboard, queue
 from ...core.utils.cache import cache
-from ...core.utils.kv import set_key_value
-from ...core.utils.s3 import upload_s3_file
-from ...crud.crud_parsed_job_description import crud_parsed_job_description
-from ...crud.crud_parsed_resume import crud_parsed_resume
+from ...core.utils.s3 import (
+    build_s3_url,
+    create_presigned_post,
+    hash_upload_file,
+    head_s3_object,
+    make_object_name,
+    upload_s3_file,
+)
+from ...crud.crud_job_description import crud_job_description
 from ...crud.crud_resume import crud_resume
-from ...crud.crud_scores import crud_scores
 from ...crud.crud_users import crud_users
 from ...schemas.common import CommonResponse
-from ...schemas.parsed_job_description import ParsedJobDescriptionRead
-from ...schemas.parsed_resume import ParsedResumeCreateInternal, ParsedResumeRead
-from ...schemas.resume import ResumeCreate, ResumeCreateInternal, ResumeRead, ResumeUpdate
-from ...schemas.score import ScoreCreateInternal
+from ...schemas.resume import (
+    ResumeCreate,
+    ResumeCreateInternal,
+    ResumeRead,
+    ResumeSearchRead,
+    ResumeUpdate,
+    ResumeUploadComplete,
+)
+from ...schemas.upload import PresignedUploadRead
 from ...schemas.user import UserRead
-from ...services.resume.workflow import evaluate_resume, extract_resume_text
-from ...services.scorer.calculation import score_calculation
+from ...services.resume.search import search_resumes
 from ..dependencies import get_current_user
 
 router = APIRouter(tags=["resume"])
 
 
-# TODO: remove me and add message queue
-# celery using redis
-async def combined_workflow(
-    is_text_to_extract: bool,
-    resume: ResumeRead,
-    db: Annotated[AsyncSession, Depends(async_get_db)],
-):
-    # 1. Perform the PDF text extraction
-    if is_text_to_extract:
-        await set_key_value(key=f"job:{resume.job_id}:{resume.id}:extract_status", value=settings.STATUS_PROCESSING)
-        text = await extract_resume_text(
-            resume=resume,
-        )
-        resume_update = (ResumeUpdate(text=text),)
-        await crud_resume.update(db=db, object=resume_update, id=resume.id)
-        await set_key_value(key=f"job:{resume.job_id}:{resume.id}:extract_status", value=settings.STATUS_SUCCESS)
-
-    # 2. Start the job description parsing
-    parsed_job_description: ParsedJobDescriptionRead = await crud_parsed_job_description.get(
-        db=db,
-        id=resume.job_id,
-        schema_to_select=ParsedJobDescriptionRead,
-    )
-    if parsed_job_description is None:
-        raise ValueError("Parsed job description for resume not found.")
-
-    result = await evaluate_resume(
-        resume=resume,
-        parsed_job_description=parsed_job_description,
-    )
-    created_parsed_resume = await crud_parsed_resume.create(
-        db=db,
-        object=ParsedResumeCreateInternal(
-            job_description_id=resume.job_id,
-            resume_id=resume.id,
-            parsed_skills=result.model_dump(),
-            created_by_user_id=resume.created_by_user_id,
-        ),
-    )
-
-    parsed_resume: ParsedResumeRead = await crud_parsed_resume.get(
-        db=db,
-        schema_to_select=ParsedResumeRead,
-        id=created_parsed_resume.id,
-    )
-
-    # 3. Trigger the score calculation for that resume
-    score = await score_calculation(parsed_resume)
-    await crud_scores.create(
-        db=db,
-        object=ScoreCreateInternal(
-            resume_id=int(resume.id),
-            job_id=int(resume.job_id),
-            parsed_job_id=parsed_job_description.id,
-            score=score,
-            created_by_user_id=resume.created_by_user_id,
-        ),
-    )
-
-
 # Note: removed the 'Form()' arguments to retrieve object from frontend
 @router.post("/{username}/resume", response_model=ResumeRead, status_code=status.HTTP_200_OK)
 async def create_resume(
     request: Request,
-    background_tasks: BackgroundTasks,
     username: str,
     resume: ResumeCreate,
     # job_description_id: int = Form(...),
@@ -104,9 +61,8 @@ async def create_resume(
     current_user: Annotated[UserRead, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(async_get_db)],
 ):
-    """Store a new PDF in the database.
+    """Store a new PDF in the database and enqueue its processing on the worker.
 
-    :param background_tasks: BackgroundTasks dependency.
     :param job_id: ID of the job description related to the PDF.
     :param candidate: Candidate name.
     :param resume: Resume file.
@@ -124,32 +80,133 @@ async def create_resume(
     if isinstance(resume, str) or resume.pdf_file is None:
         raise HTTPException(status_code=400, detail="A PDF file is required")
 
-    # Check if pdf_file size is not bigger than 30MB
-    if resume.pdf_file.size is not None and resume.pdf_file.size > 30 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="The PDF uploaded is too large, please resize it and try again.")
+    if not await crud_job_description.exists(
+        db=db, id=resume.job_id, created_by_user_id=db_user["id"], is_deleted=False
+    ):
+        raise NotFoundException("Job description not found")
+
+    # Identical PDFs uploaded by the same user share the S3 object and the extracted text
+    try:
+        content_hash = await hash_upload_file(resume.pdf_file, max_size=settings.PDF_MAX_UPLOAD_SIZE)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=400, detail=e.message)
 
-    # Upload the PDF and create the resume entry
-    file_name = str(uuid.uuid4())
-    s3_url = await upload_s3_file(
-        file=resume.pdf_file,
-        file_name=f"{file_name}.pdf",
-        folder_path=f"resume/{username}",  # we create a new path for each user
+    duplicate_filters = {"created_by_user_id": db_user["id"], "content_hash": content_hash, "is_deleted": False}
+    duplicate: ResumeRead | None = await crud_resume.get(
+        db=db, schema_to_select=ResumeRead, return_as_model=True, text__ne=None, **duplicate_filters
     )
+    if duplicate is None:
+        duplicate = await crud_resume.get(db=db, schema_to_select=ResumeRead, return_as_model=True, **duplicate_filters)
+
     resume_internal_dict = resume.model_dump()
     resume_internal_dict["created_by_user_id"] = db_user["id"]
-    resume_internal_dict["s3_url"] = s3_url
+    resume_internal_dict["content_hash"] = content_hash
+    if duplicate is not None:
+        logging.info(f"Resume PDF already uploaded as resume with ID {duplicate.id}, reusing it")
+        resume_internal_dict["s3_url"] = duplicate.s3_url
+        resume_internal_dict["text"] = duplicate.text
+    else:
+        # Upload the PDF and create the resume entry, files bigger than 30MB are rejected while streaming
+        file_name = str(uuid.uuid4())
+        try:
+            resume_internal_dict["s3_url"] = await upload_s3_file(
+                file=resume.pdf_file,
+                file_name=f"{file_name}.pdf",
+                folder_path=f"resume/{username}",  # we create a new path for each user
+                max_size=settings.PDF_MAX_UPLOAD_SIZE,
+            )
+        except FileTooLargeError as e:
+            raise HTTPException(status_code=400, detail=e.message)
+
     resume_internal = ResumeCreateInternal(**resume_internal_dict)
     created_resume: ResumeRead = await crud_resume.create(db=db, object=resume_internal)
 
-    # Start Background Task execution
+    # Extraction, evaluation and scoring run on the arq worker, each stage enqueues the next one
     logging.info(f"Workflow: evaluate resume with ID {created_resume.id}")
-    background_tasks.add_task(
-        combined_workflow,
-        resume=created_resume,
-        resume_id=created_resume.id,
-        is_text_to_extract=True,
+    if resume_internal.text is not None:
+        await queue.enqueue_task("evaluate_resume_task", created_resume.id)
+    else:
+        await queue.enqueue_task("extract_resume_text_task", created_resume.id)
+
+    return created_resume
+
+
+@router.post("/{username}/resume/upload", response_model=PresignedUploadRead, status_code=status.HTTP_201_CREATED)
+async def create_resume_upload(
+    request: Request,
+    username: str,
+    current_user: Annotated[UserRead, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(async_get_db)],
+) -> PresignedUploadRead:
+    """Issue a presigned POST to upload a resume PDF straight to S3.
+
+    The client posts the PDF to `url` with the returned `fields`, then calls the completion endpoint with the
+    `upload_token` to create the resume.
+
+    :param username: The username of the user uploading the resume.
+    :return: The presigned POST and the upload token.
+    """
+    db_user = await crud_users.get(db=db, schema_to_select=UserRead, username=username, is_deleted=False)
+    if db_user is None:
+        raise NotFoundException("User not found")
+
+    if current_user["id"] != db_user["id"]:
+        raise ForbiddenException()
+
+    object_name = make_object_name(f"{uuid.uuid4()}.pdf")
+    presigned_post = create_presigned_post(object_name=object_name, max_size=settings.PDF_MAX_UPLOAD_SIZE)
+    return PresignedUploadRead(
+        **presigned_post,
+        upload_token=await create_upload_token(object_name=object_name, kind="resume", user_id=db_user["id"]),
+        expires_in=settings.S3_PRESIGNED_EXPIRE_SECONDS,
     )
 
+
+@router.post("/{username}/resume/upload/complete", response_model=ResumeRead, status_code=status.HTTP_201_CREATED)
+async def complete_resume_upload(
+    request: Request,
+    username: str,
+    upload: ResumeUploadComplete,
+    current_user: Annotated[UserRead, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(async_get_db)],
+):
+    """Create the resume of a PDF uploaded with a presigned POST and enqueue its processing on the worker.
+
+    :param username: The username of the user who uploaded the resume.
+    :param upload: The name and job of the resume, and the token returned with the presigned POST.
+    :return: The created resume.
+    """
+    db_user = await crud_users.get(db=db, schema_to_select=UserRead, username=username, is_deleted=False)
+    if db_user is None:
+        raise NotFoundException("User not found")
+
+    if current_user["id"] != db_user["id"]:
+        raise ForbiddenException()
+
+    if not await crud_job_description.exists(
+        db=db, id=upload.job_id, created_by_user_id=db_user["id"], is_deleted=False
+    ):
+        raise NotFoundException("Job description not found")
+
+    object_name = await verify_upload_token(token=upload.upload_token, kind="resume", user_id=db_user["id"])
+    if object_name is None:
+        raise HTTPException(status_code=400, detail="The upload token is invalid or expired")
+
+    if await head_s3_object(object_name) is None:
+        raise HTTPException(status_code=400, detail="The PDF was not uploaded, please upload it and try again.")
+
+    s3_url = build_s3_url(folder_path=f"resume/{username}", object_name=object_name)
+    if await crud_resume.exists(db=db, s3_url=s3_url):
+        raise DuplicateValueException("This upload was already completed")
+
+    resume_internal = ResumeCreateInternal(
+        name=upload.name, job_id=upload.job_id, s3_url=s3_url, created_by_user_id=db_user["id"]
+    )
+    created_resume: ResumeRead = await crud_resume.create(db=db, object=resume_internal)
+
+    logging.info(f"Workflow: evaluate resume with ID {created_resume.id}")
+    await queue.enqueue_task("extract_resume_text_task", created_resume.id)
+
     return created_resume
 
 
@@ -159,9 +216,11 @@ async def create_resume(
     status_code=status.HTTP_200_OK,
 )
 @cache(
-    key_prefix="{username}_resumes:page_{page}:items_per_page:{items_per_page}",
+    key_prefix="{username}_resumes:job_{job_id}:page_{page}:items_per_page:{items_per_page}:cursor_{cursor}:total_{total}",
     resource_id_name="username",
     expiration=60,
+    tags=["{username}_resumes"],
+    stale_ttl=300,
 )
 async def get_resumes(
     request: Request,
@@ -170,12 +229,17 @@ async def get_resumes(
     job_id: int,
     page: int = 1,
     items_per_page: int = 20,
+    cursor: str | None = None,
+    total: TotalCount = "none",
 ) -> dict:
     """Retrieve all non-deleted pdfs from the database for a given job id.
 
     :param job_id: the job_id for the jobs description related to the pdfs
     :param limit: limit of Resumes objects, defaults to 10.
     :param offset: offset of Resumes objects, defaults to 0.
+    :param cursor: Switches to keyset pagination, empty for the first page then the `next_cursor` of the previous
+        page. Deep pages cost the same as the first one.
+    :param total: With a cursor, how the total count is computed: exact, estimated or none.
     :param resume_dao: DAO for Resumes models.
     :return: list of Resumes objects from database.
     """
@@ -183,6 +247,20 @@ async def get_resumes(
     if not db_user:
         raise NotFoundException("User not found")
 
+    if cursor is not None:
+        resume_data = await keyset_paginate(
+            db=db,
+            model=crud_resume.model,
+            schema_to_select=ResumeRead,
+            cursor=cursor,
+            items_per_page=items_per_page,
+            total=total,
+            job_id=job_id,
+            created_by_user_id=db_user["id"],
+            is_deleted=False,
+        )
+        return cursor_paginated_response(crud_data=resume_data, items_per_page=items_per_page)
+
     resume_data = await crud_resume.get_multi(
         db=db,
         job_id=job_id,  # TODO: check whether this actually filters the results
@@ -196,6 +274,48 @@ async def get_resumes(
     return paginated_response(crud_data=resume_data, page=page, items_per_page=items_per_page)
 
 
+@router.get(
+    "/{username}/resumes/search",
+    response_model=PaginatedListResponse[ResumeSearchRead],
+    status_code=status.HTTP_200_OK,
+)
+async def search_resumes_text(
+    request: Request,
+    username: str,
+    current_user: Annotated[UserRead, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(async_get_db)],
+    q: Annotated[str, Query(min_length=1, max_length=500, examples=['kubernetes "data engineer" -java'])],
+    job_id: int | None = None,
+    page: int = 1,
+    items_per_page: int = 20,
+) -> dict:
+    """Search the text of the resumes of the user's jobs, the best matches first.
+
+    :param q: The search query, in web search syntax: quoted phrases, `or` and `-` to exclude a word.
+    :param job_id: If given, only the resumes of this job are searched.
+    :param page: The page of results.
+    :param items_per_page: The number of results per page.
+    :return: The paginated matching resumes with their rank.
+    """
+    db_user = await crud_users.get(db=db, schema_to_select=UserRead, username=username, is_deleted=False)
+    if not db_user:
+        raise NotFoundException("User not found")
+
+    if current_user["id"] != db_user["id"]:
+        raise ForbiddenException()
+
+    search_data = await search_resumes(
+        db=db,
+        user_id=db_user["id"],
+        query=q,
+        job_id=job_id,
+        offset=compute_offset(page, items_per_page),
+        limit=items_per_page,
+    )
+
+    return paginated_response(crud_data=search_data, page=page, items_per_page=items_per_page)
+
+
 @router.get(
     "/{username}/resume/{id}/process",
     response_model=ResumeRead,
@@ -206,10 +326,9 @@ async def process_resume(
     username: str,
     db: Annotated[AsyncSession, Depends(async_get_db)],
     id: int,
-    background_tasks: BackgroundTasks,
     is_text_to_extract: bool = False,
 ) -> CommonResponse:
-    """Trigger background tasks to process the PDF.
+    """Enqueue the processing of the PDF on the worker.
 
     :param job_id: ID of the job description related to the PDF.
     :param resume_id: ID of the PDF to process.
@@ -219,19 +338,15 @@ async def process_resume(
     if not db_user:
         raise NotFoundException("User not found")
 
-    # Trigger background tasks to process the PDF
+    resume = await crud_resume.get(db=db, schema_to_select=ResumeRead, id=id)
+    if resume is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    # Enqueue the first stage of the pipeline that is still needed for the resume
     try:
-        resume = await crud_resume.get(db=db, schema_to_select=ResumeRead, id=id)
-        if resume is None:
-            raise HTTPException(status_code=404, detail="Resume not found")
         logging.info(f"Evaluating resume - {id}")
-
-        background_tasks.add_task(
-            combined_workflow,
-            is_text_to_extract=is_text_to_extract,
-            resume=resume,
-            db=db,
-        )
+        task_name = "extract_resume_text_task" if is_text_to_extract else "evaluate_resume_task"
+        await queue.enqueue_task(task_name, id)
         return CommonResponse(status=settings.STATUS_PROCESSING, message=f"Processing resume - {id}")
     except Exception as e:
         logging.error(f"Error processing PDF ID {id}: {e}")
@@ -239,7 +354,7 @@ async def process_resume(
 
 
 @router.patch("/{username}/resume/{id}")
-@cache("{username}_resume_cache", resource_id_name="id", pattern_to_invalidate_extra=["{username}_resumes:*"])
+@cache("{username}_resume_cache", resource_id_name="id", tags_to_invalidate=["{username}_resumes"])
 async def update_resume(
     request: Request,
     username: str,
@@ -293,7 +408,7 @@ async def get_resume(
 
 
 @router.delete("/{username}/resume/{id}")
-@cache("{username}_resume_ache", resource_id_name="id", to_invalidate_extra={"{username}_resumes": "{username}"})
+@cache("{username}_resume_cache", resource_id_name="id", tags_to_invalidate=["{username}_resumes"])
 async def delete_resume(
     request: Request,
     username: str,
@@ -312,10 +427,13 @@ async def delete_resume(
     if current_user["id"] != db_user["id"]:
         raise ForbiddenException()
 
-    db_resume = await crud_resume.get(db=db, schema_to_select=ResumeRead(), id=id, is_deleted=False)
+    db_resume: ResumeRead | None = await crud_resume.get(
+        db=db, schema_to_select=ResumeRead, return_as_model=True, id=id, is_deleted=False
+    )
     if db_resume is None:
         raise NotFoundException("Resume not found")
 
-    await crud_resume.delete(db=db, db_row=db_resume, id=id)
+    await crud_resume.delete(db=db, id=id)
+    await leaderboard.remove_resume(job_id=db_resume.job_id, resume_id=db_resume.id)
 
     return CommonResponse(status=settings.STATUS_SUCCESS, message="Post deleted")
@@ -1,12 +1,14 @@
 import logging
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...api.dependencies import get_current_user
+from ...api.paginated import PaginatedListResponse, compute_offset, paginated_response
 from ...core.db.database import async_get_db
-from ...core.exceptions.http_exceptions import ForbiddenException, NotFoundException
+from ...core.exceptions.http_exceptions import BadRequestException, ForbiddenException, NotFoundException
+from ...core.utils import leaderboard
 from ...core.utils.cache import cache
 from ...crud.crud_parsed_job_description import crud_parsed_job_description
 from ...crud.crud_parsed_resume import crud_parsed_resume
@@ -14,40 +16,159 @@ from ...crud.crud_scores import crud_scores
 from ...crud.crud_users import crud_users
 from ...schemas.parsed_job_description import ParsedJobDescriptionRead
 from ...schemas.parsed_resume import ParsedResumeRead
-from ...schemas.score import ScoreCreate, ScoreCreateInternal, ScoreRead
+from ...schemas.score import LeaderboardEntryRead, ScoreCreate, ScoreCreateInternal, ScoreRankingRead, ScoreRead
 from ...schemas.user import UserRead
+from ...services.resume.skill_filter import (
+    GroupPredicate,
+    SkillFilterError,
+    SkillPredicate,
+    build_skill_filters,
+    get_filtered_ranking,
+)
 from ...services.scorer.calculation import score_calculation
 
 router = APIRouter(tags=["scores"])
 
 
-@router.get("/ranking/{username}/{job_id}", response_model=ScoreRead, status_code=status.HTTP_200_OK)
+@router.get(
+    "/ranking/{username}/{job_id}",
+    response_model=PaginatedListResponse[ScoreRankingRead],
+    status_code=status.HTTP_200_OK,
+)
 async def get_score_ranking(
     request: Request,
     username: str,
     db: Annotated[AsyncSession, Depends(async_get_db)],
     job_id: int,
-):
+    page: int = 1,
+    items_per_page: int = 30,
+    skill: Annotated[list[str], Query(examples=[["required_hard:Kubernetes:YES"]])] = [],
+    every: Annotated[list[str], Query(examples=[["required_hard:YES"]])] = [],
+) -> dict:
     """Get Score ranking.
 
-    :param job_description_id: ID of the job description
-    :param score_dao: The ScoreDAO object to use for database operations.
-    :return: ScoreRankingModelDTO of the retrieved score ranking.
-    :raises HTTPException: If the score is not found.
+    Only the columns of the ranking index are selected, so a page is served by an index-only scan.
+
+    :param job_id: ID of the job description.
+    :param page: The page of the ranking, the best scores first.
+    :param items_per_page: The number of scores per page.
+    :param skill: Only rank the resumes with these skill matches, as `group:skill:match`, e.g.
+        `required_hard:Kubernetes:YES`. The groups are required_hard, required_soft, nice_to_have_hard and
+        nice_to_have_soft, the matches YES, PARTIAL and NO.
+    :param every: Only rank the resumes with this match on every skill of a group, as `group:match`, e.g.
+        `required_hard:YES`.
+    :return: The paginated scores of the job.
     """
     db_user = await crud_users.get(db=db, schema_to_select=UserRead, username=username, is_deleted=False)
     if db_user is None:
         raise NotFoundException("User not found")
 
+    if skill or every:
+        try:
+            filters = build_skill_filters(
+                skills=[SkillPredicate.parse(value) for value in skill],
+                every=[GroupPredicate.parse(value) for value in every],
+            )
+        except SkillFilterError as e:
+            raise BadRequestException(str(e))
+
+        scores_data = await get_filtered_ranking(
+            db=db, job_id=job_id, filters=filters, offset=compute_offset(page, items_per_page), limit=items_per_page
+        )
+        return paginated_response(crud_data=scores_data, page=page, items_per_page=items_per_page)
+
     logging.info(f"Getting all scores for username: {username}, job_id: {job_id}")
-    response = await crud_scores.get_multi(
-        db=db, job_id=job_id, offset=0, limit=30, sort_columns=["score"], sort_orders=["desc"]
+    scores_data = await crud_scores.get_multi(
+        db=db,
+        offset=compute_offset(page, items_per_page),
+        limit=items_per_page,
+        schema_to_select=ScoreRankingRead,
+        sort_columns=["score", "id"],
+        sort_orders=["desc", "desc"],
+        job_id=job_id,
+        is_deleted=False,
     )
 
-    if response is None:
-        raise HTTPException(status_code=404, detail="Score not found")
+    return paginated_response(crud_data=scores_data, page=page, items_per_page=items_per_page)
 
-    return response
+
+@router.get(
+    "/leaderboard/{username}/{job_id}",
+    response_model=PaginatedListResponse[LeaderboardEntryRead],
+    status_code=status.HTTP_200_OK,
+)
+async def get_leaderboard(
+    request: Request,
+    username: str,
+    db: Annotated[AsyncSession, Depends(async_get_db)],
+    job_id: int,
+    page: int = 1,
+    items_per_page: int = 30,
+    min_score: float | None = None,
+    max_score: float | None = None,
+) -> dict:
+    """Get the leaderboard of a job from Redis, holding the latest score of each of its resumes.
+
+    :param job_id: ID of the job description.
+    :param page: The page of the leaderboard, the best scores first.
+    :param items_per_page: The number of resumes per page.
+    :param min_score: If given with `max_score`, only the resumes scoring in this range are returned.
+    :param max_score: If given with `min_score`, only the resumes scoring in this range are returned.
+    :return: The paginated leaderboard entries with their rank in the whole leaderboard.
+    """
+    db_user = await crud_users.get(db=db, schema_to_select=UserRead, username=username, is_deleted=False)
+    if db_user is None:
+        raise NotFoundException("User not found")
+
+    await leaderboard.ensure_built(db=db, job_id=job_id)
+
+    offset = compute_offset(page, items_per_page)
+    if min_score is not None or max_score is not None:
+        entries, total_count = await leaderboard.get_by_score_range(
+            job_id=job_id,
+            min_score=min_score if min_score is not None else float("-inf"),
+            max_score=max_score if max_score is not None else float("inf"),
+            offset=offset,
+            limit=items_per_page,
+        )
+    else:
+        entries = await leaderboard.get_top(job_id=job_id, offset=offset, limit=items_per_page)
+        total_count = await leaderboard.count(job_id=job_id)
+
+    return paginated_response(
+        crud_data={"data": entries, "total_count": total_count}, page=page, items_per_page=items_per_page
+    )
+
+
+@router.get(
+    "/leaderboard/{username}/{job_id}/{resume_id}",
+    response_model=LeaderboardEntryRead,
+    status_code=status.HTTP_200_OK,
+)
+async def get_leaderboard_rank(
+    request: Request,
+    username: str,
+    db: Annotated[AsyncSession, Depends(async_get_db)],
+    job_id: int,
+    resume_id: int,
+) -> dict:
+    """Get the rank of a resume in the leaderboard of a job.
+
+    :param job_id: ID of the job description.
+    :param resume_id: ID of the resume.
+    :return: The score and rank of the resume.
+    :raises NotFoundException: If the resume has no score for this job.
+    """
+    db_user = await crud_users.get(db=db, schema_to_select=UserRead, username=username, is_deleted=False)
+    if db_user is None:
+        raise NotFoundException("User not found")
+
+    await leaderboard.ensure_built(db=db, job_id=job_id)
+    entry = await leaderboard.get_rank(job_id=job_id, resume_id=resume_id)
+    if entry is None:
+        raise NotFoundException("Resume not ranked for this job")
+
+    return entry
 
 
 @router.post("/{username}/{resume_id}/{job_id}", response_model=ScoreRead, status_code=status.HTTP_200_OK)
@@ -84,24 +205,40 @@ async def create_score(
     # created_post: PostRead = await crud_posts.create(db=db, object=post_internal)
     # return created_post
 
-    parsed_text_result: ParsedResumeRead = await crud_parsed_resume.get(
-        db=db, schema_to_select=ParsedResumeRead, job_description_id=int(job_id), id=int(resume_id)
+    # The latest evaluation of the resume against the job
+    parsed_resumes = await crud_parsed_resume.get_multi(
+        db=db,
+        limit=1,
+        schema_to_select=ParsedResumeRead,
+        sort_columns="created_at",
+        sort_orders="desc",
+        return_as_model=True,
+        job_description_id=int(job_id),
+        resume_id=int(resume_id),
+        is_deleted=False,
     )
-    parsed_job_description: ParsedJobDescriptionRead = await crud_parsed_job_description.get(
+    if not parsed_resumes["data"]:
+        raise NotFoundException("Parsed resume not found")
+
+    parsed_job_description: ParsedJobDescriptionRead | None = await crud_parsed_job_description.get(
         db=db, schema_to_select=ParsedJobDescriptionRead, job_description_id=int(job_id)
     )
+    if parsed_job_description is None:
+        raise NotFoundException("Parsed job description not found")
 
-    score_result = await score_calculation(parsed_resume=parsed_text_result)
-    return await crud_scores.create(
+    score_result = await score_calculation(parsed_resume=parsed_resumes["data"][0])
+    created_score = await crud_scores.create(
         db=db,
         object=ScoreCreateInternal(
-            score=score_result["score"],
+            score=score_result,
             resume_id=int(resume_id),
             job_id=int(job_id),
-            parsed_job_id=parsed_job_description.id,
+            parsed_job_id=parsed_job_description["id"],
             created_by_user_id=db_user["id"],
         ),
     )
+    await leaderboard.add_score(job_id=int(job_id), resume_id=int(resume_id), score=created_score.score)
+    return created_score
 
 
 @router.get("/{username}/{resume_id}/{job_id}", response_model=ScoreRead, status_code=status.HTTP_200_OK)
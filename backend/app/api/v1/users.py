@@ -1,10 +1,17 @@
 from typing import Annotated, Any
 
 from fastapi import APIRouter, Depends, Request
-from fastcrud.paginated import PaginatedListResponse, compute_offset, paginated_response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...api.dependencies import get_current_superuser, get_current_user
+from ...api.paginated import (
+    PaginatedListResponse,
+    TotalCount,
+    compute_offset,
+    cursor_paginated_response,
+    keyset_paginate,
+    paginated_response,
+)
 from ...core.db.database import async_get_db
 from ...core.exceptions.http_exceptions import DuplicateValueException, ForbiddenException, NotFoundException
 from ...core.security import blacklist_token, get_password_hash, oauth2_scheme
@@ -41,8 +48,25 @@ async def write_user(
 
 @router.get("/users", response_model=PaginatedListResponse[UserRead])
 async def read_users(
-    request: Request, db: Annotated[AsyncSession, Depends(async_get_db)], page: int = 1, items_per_page: int = 10
+    request: Request,
+    db: Annotated[AsyncSession, Depends(async_get_db)],
+    page: int = 1,
+    items_per_page: int = 10,
+    cursor: str | None = None,
+    total: TotalCount = "none",
 ) -> dict:
+    if cursor is not None:
+        users_data = await keyset_paginate(
+            db=db,
+            model=crud_users.model,
+            schema_to_select=UserRead,
+            cursor=cursor,
+            items_per_page=items_per_page,
+            total=total,
+            is_deleted=False,
+        )
+        return cursor_paginated_response(crud_data=users_data, items_per_page=items_per_page)
+
     users_data = await crud_users.get_multi(
         db=db,
         offset=compute_offset(page, items_per_page),
@@ -0,0 +1,212 @@
+from typing import Annotated
+
+import fastapi
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...api.dependencies import get_current_user
+from ...api.paginated import PaginatedListResponse, compute_offset, paginated_response
+from ...core.db.database import async_get_db
+from ...core.exceptions.http_exceptions import ForbiddenException, NotFoundException
+from ...crud.crud_job_description import crud_job_description
+from ...crud.crud_users import crud_users
+from ...crud.crud_weight_profile import crud_weight_profile
+from ...schemas.score import LeaderboardEntryRead
+from ...schemas.user import UserRead
+from ...schemas.weight_profile import (
+    ScoreWeights,
+    WeightProfileCreate,
+    WeightProfileCreateInternal,
+    WeightProfileRead,
+    WeightProfileUpdate,
+)
+from ...services.scorer.batch import rank_job
+from ...services.scorer.weight import ScoreWeight
+
+router = fastapi.APIRouter(tags=["weight profiles"])
+
+
+@router.post("/{username}/weight_profile", response_model=WeightProfileRead, status_code=201)
+async def write_weight_profile(
+    request: Request,
+    username: str,
+    weight_profile: WeightProfileCreate,
+    current_user: Annotated[UserRead, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(async_get_db)],
+) -> WeightProfileRead:
+    """Create a weight profile, for every job of the user or only for `job_id`.
+
+    :param weight_profile: The weights of the profile, the ones left empty keep the configured values.
+    :return: The created weight profile.
+    """
+    db_user = await crud_users.get(db=db, schema_to_select=UserRead, username=username, is_deleted=False)
+    if db_user is None:
+        raise NotFoundException("User not found")
+
+    if current_user["id"] != db_user["id"]:
+        raise ForbiddenException()
+
+    if weight_profile.job_id is not None and not await crud_job_description.exists(
+        db=db, id=weight_profile.job_id, created_by_user_id=db_user["id"], is_deleted=False
+    ):
+        raise NotFoundException("Job description not found")
+
+    weight_profile_internal_dict = weight_profile.model_dump()
+    weight_profile_internal_dict["created_by_user_id"] = db_user["id"]
+
+    weight_profile_internal = WeightProfileCreateInternal(**weight_profile_internal_dict)
+    created_weight_profile: WeightProfileRead = await crud_weight_profile.create(db=db, object=weight_profile_internal)
+    return created_weight_profile
+
+
+@router.get("/{username}/weight_profiles", response_model=PaginatedListResponse[WeightProfileRead])
+async def read_weight_profiles(
+    request: Request,
+    username: str,
+    db: Annotated[AsyncSession, Depends(async_get_db)],
+    job_id: int | None = None,
+    page: int = 1,
+    items_per_page: int = 10,
+) -> dict:
+    """Get the weight profiles of a user.
+
+    :param job_id: If given, only the profiles of this job are returned.
+    :return: The paginated weight profiles.
+    """
+    db_user = await crud_users.get(db=db, schema_to_select=UserRead, username=username, is_deleted=False)
+    if db_user is None:
+        raise NotFoundException("User not found")
+
+    filters = {"job_id": job_id} if job_id is not None else {}
+    weight_profiles_data = await crud_weight_profile.get_multi(
+        db=db,
+        offset=compute_offset(page, items_per_page),
+        limit=items_per_page,
+        schema_to_select=WeightProfileRead,
+        created_by_user_id=db_user["id"],
+        is_deleted=False,
+        **filters,
+    )
+
+    return paginated_response(crud_data=weight_profiles_data, page=page, items_per_page=items_per_page)
+
+
+@router.get("/{username}/weight_profile/{id}", response_model=WeightProfileRead)
+async def read_weight_profile(
+    request: Request, username: str, id: int, db: Annotated[AsyncSession, Depends(async_get_db)]
+) -> dict:
+    db_user = await crud_users.get(db=db, schema_to_select=UserRead, username=username, is_deleted=False)
+    if db_user is None:
+        raise NotFoundException("User not found")
+
+    db_weight_profile: WeightProfileRead | None = await crud_weight_profile.get(
+        db=db, schema_to_select=WeightProfileRead, id=id, created_by_user_id=db_user["id"], is_deleted=False
+    )
+    if db_weight_profile is None:
+        raise NotFoundException("Weight profile not found")
+
+    return db_weight_profile
+
+
+@router.patch("/{username}/weight_profile/{id}")
+async def patch_weight_profile(
+    request: Request,
+    username: str,
+    id: int,
+    values: WeightProfileUpdate,
+    current_user: Annotated[UserRead, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(async_get_db)],
+) -> dict[str, str]:
+    db_user = await crud_users.get(db=db, schema_to_select=UserRead, username=username, is_deleted=False)
+    if db_user is None:
+        raise NotFoundException("User not found")
+
+    if current_user["id"] != db_user["id"]:
+        raise ForbiddenException()
+
+    if not await crud_weight_profile.exists(db=db, id=id, created_by_user_id=db_user["id"], is_deleted=False):
+        raise NotFoundException("Weight profile not found")
+
+    await crud_weight_profile.update(db=db, object=values.model_dump(exclude_unset=True), id=id)
+    return {"message": "Weight profile updated"}
+
+
+@router.delete("/{username}/weight_profile/{id}")
+async def erase_weight_profile(
+    request: Request,
+    username: str,
+    id: int,
+    current_user: Annotated[UserRead, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(async_get_db)],
+) -> dict[str, str]:
+    db_user = await crud_users.get(db=db, schema_to_select=UserRead, username=username, is_deleted=False)
+    if db_user is None:
+        raise NotFoundException("User not found")
+
+    if current_user["id"] != db_user["id"]:
+        raise ForbiddenException()
+
+    if not await crud_weight_profile.exists(db=db, id=id, created_by_user_id=db_user["id"], is_deleted=False):
+        raise NotFoundException("Weight profile not found")
+
+    await crud_weight_profile.delete(db=db, id=id)
+    return {"message": "Weight profile deleted"}
+
+
+@router.post(
+    "/{username}/rescore/{job_id}",
+    response_model=PaginatedListResponse[LeaderboardEntryRead],
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def rescore_job(
+    request: Request,
+    username: str,
+    job_id: int,
+    current_user: Annotated[UserRead, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(async_get_db)],
+    weights: ScoreWeights | None = None,
+    profile_id: int | None = None,
+    page: int = 1,
+    items_per_page: int = 30,
+) -> dict:
+    """Rank the candidates of a job under other weights, without calling the LLM or storing the scores.
+
+    The stored parsed skills of the resumes are rescored in one vectorized pass, fast enough to follow a slider.
+
+    :param job_id: ID of the job description.
+    :param weights: The weights to try, the ones left empty come from the profile or the configured values.
+    :param profile_id: ID of a weight profile of the user, for every job or for this one.
+    :param page: The page of the ranking, the best scores first.
+    :param items_per_page: The number of resumes per page.
+    :return: The paginated entries with their rank under the given weights.
+    """
+    db_user = await crud_users.get(db=db, schema_to_select=UserRead, username=username, is_deleted=False)
+    if db_user is None:
+        raise NotFoundException("User not found")
+
+    if current_user["id"] != db_user["id"]:
+        raise ForbiddenException()
+
+    if not await crud_job_description.exists(db=db, id=job_id, created_by_user_id=db_user["id"], is_deleted=False):
+        raise NotFoundException("Job description not found")
+
+    profile_weights: dict = {}
+    if profile_id is not None:
+        db_weight_profile = await crud_weight_profile.get(
+            db=db, schema_to_select=WeightProfileRead, id=profile_id, created_by_user_id=db_user["id"], is_deleted=False
+        )
+        if db_weight_profile is None or db_weight_profile["job_id"] not in (None, job_id):
+            raise NotFoundException("Weight profile not found")
+        profile_weights = ScoreWeights(**db_weight_profile).model_dump(exclude_none=True)
+
+    if weights is not None:
+        profile_weights.update(weights.model_dump(exclude_none=True))
+
+    offset = compute_offset(page, items_per_page)
+    entries, total_count = await rank_job(
+        db=db, job_id=job_id, weight=ScoreWeight(**profile_weights), offset=offset, limit=items_per_page
+    )
+
+    return paginated_response(
+        crud_data={"data": entries, "total_count": total_count}, page=page, items_per_page=items_per_page
+    )
@@ -78,6 +78,15 @@ class RedisCacheSettings(BaseSettings):
     REDIS_CACHE_HOST: str = config("REDIS_CACHE_HOST", default="localhost")
     REDIS_CACHE_PORT: int = config("REDIS_CACHE_PORT", default=6379)
     REDIS_CACHE_URL: str = f"redis://{REDIS_CACHE_HOST}:{REDIS_CACHE_PORT}"
+    CACHE_LOCAL_ENABLED: bool = config("CACHE_LOCAL_ENABLED", default=False)
+    CACHE_LOCAL_MAX_SIZE: int = config("CACHE_LOCAL_MAX_SIZE", default=1024)
+    CACHE_LOCAL_TTL: float = config("CACHE_LOCAL_TTL", default=5.0)
+    # A single process recomputes an expired key under a lock, the others wait for it up to CACHE_LOCK_WAIT seconds
+    CACHE_LOCK_TIMEOUT: float = config("CACHE_LOCK_TIMEOUT", default=10.0)
+    CACHE_LOCK_WAIT: float = config("CACHE_LOCK_WAIT", default=3.0)
+    # The serializer of the cached responses, json or orjson, and the size from which they are compressed, 0 to never
+    CACHE_CODEC: str = config("CACHE_CODEC", default="orjson")
+    CACHE_COMPRESS_MIN_SIZE: int = config("CACHE_COMPRESS_MIN_SIZE", default=0)
 
 
 class ClientSideCacheSettings(BaseSettings):
@@ -89,6 +98,15 @@ class RedisQueueSettings(BaseSettings):
     REDIS_QUEUE_PORT: int = config("REDIS_QUEUE_PORT", default=6379)
 
 
+class QueueWorkerSettings(BaseSettings):
+    WORKER_MAX_JOBS: int = config("WORKER_MAX_JOBS", default=10)
+    WORKER_JOB_TIMEOUT: int = config("WORKER_JOB_TIMEOUT", default=600)
+    # The `max_jobs` of the worker of each pipeline stage, per worker process
+    WORKER_PDF_EXTRACTION_CONCURRENCY: int = config("WORKER_PDF_EXTRACTION_CONCURRENCY", default=2)
+    WORKER_LLM_EVALUATION_CONCURRENCY: int = config("WORKER_LLM_EVALUATION_CONCURRENCY", default=4)
+    WORKER_SCORING_CONCURRENCY: int = config("WORKER_SCORING_CONCURRENCY", default=8)
+
+
 class RedisRateLimiterSettings(BaseSettings):
     REDIS_RATE_LIMIT_HOST: str = config("REDIS_RATE_LIMIT_HOST", default="localhost")
     REDIS_RATE_LIMIT_PORT: int = config("REDIS_RATE_LIMIT_PORT", default=6379)
@@ -119,6 +137,36 @@ class OpenAISettings(BaseSettings):
     OPENAI_TEMPERATURE: float = config("TEMPERATURE", default=0.0)
     OPENAI_PRESENCE_PENALTY: float = config("PRESENCE_PENALTY", default=0.1)
     OPENAI_FREQUENCY_PENALTY: float = config("FREQUENCY_PENALTY", default=0.1)
+    OPENAI_REQUEST_TIMEOUT: float = config("OPENAI_REQUEST_TIMEOUT", default=120.0)
+    OPENAI_CONNECT_TIMEOUT: float = config("OPENAI_CONNECT_TIMEOUT", default=10.0)
+    OPENAI_MAX_CONNECTIONS: int = config("OPENAI_MAX_CONNECTIONS", default=100)
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = config("OPENAI_MAX_KEEPALIVE_CONNECTIONS", default=20)
+    OPENAI_KEEPALIVE_EXPIRY: float = config("OPENAI_KEEPALIVE_EXPIRY", default=60.0)
+    OPENAI_HTTP2: bool = config("OPENAI_HTTP2", default=True)
+    # Budgets of a single process and model, they are lowered automatically from the provider rate limit headers
+    OPENAI_REQUESTS_PER_MINUTE: int = config("OPENAI_REQUESTS_PER_MINUTE", default=500)
+    OPENAI_TOKENS_PER_MINUTE: int = config("OPENAI_TOKENS_PER_MINUTE", default=300000)
+
+
+class LLMCacheSettings(BaseSettings):
+    LLM_CACHE_ENABLED: bool = config("LLM_CACHE_ENABLED", default=True)
+    LLM_CACHE_TTL: int = config("LLM_CACHE_TTL", default=60 * 60 * 24 * 30)
+    LLM_CACHE_MAX_ENTRIES: int = config("LLM_CACHE_MAX_ENTRIES", default=10000)
+
+
+class PDFProcessingSettings(BaseSettings):
+    PDF_POOL_WORKERS: int = config("PDF_POOL_WORKERS", default=2)
+    PDF_POOL_TIMEOUT: float = config("PDF_POOL_TIMEOUT", default=60.0)
+    PDF_POOL_MAX_QUEUE: int = config("PDF_POOL_MAX_QUEUE", default=100)
+    # Documents with at least this many pages are split in page ranges parsed in parallel
+    PDF_PARALLEL_MIN_PAGES: int = config("PDF_PARALLEL_MIN_PAGES", default=8)
+    # The pages of each of these ranges, smaller ranges stop sooner once the text is long enough
+    PDF_PARALLEL_CHUNK_PAGES: int = config("PDF_PARALLEL_CHUNK_PAGES", default=4)
+    PDF_MAX_PAGES: int = config("PDF_MAX_PAGES", default=100)
+    # The longest text accepted for a resume or a job description, pages past it are not parsed
+    PDF_MAX_TEXT_LENGTH: int = config("PDF_MAX_TEXT_LENGTH", default=63206)
+    # Where PDFs downloaded from S3 are spooled before parsing, defaults to the system temporary directory
+    PDF_SPOOL_DIR: str | None = config("PDF_SPOOL_DIR", default=None)
 
 
 class S3Settings(BaseSettings):
@@ -139,6 +187,11 @@ class S3Settings(BaseSettings):
         "TALENT_COPILOT_AWS_SECRET_ACCESS_KEY",
         "test",
     )
+    S3_MAX_POOL_CONNECTIONS: int = config("S3_MAX_POOL_CONNECTIONS", default=20)
+    # Parts of a multipart upload must be at least 5MB, except the last one
+    S3_MULTIPART_CHUNK_SIZE: int = config("S3_MULTIPART_CHUNK_SIZE", default=5 * 1024 * 1024)
+    PDF_MAX_UPLOAD_SIZE: int = config("PDF_MAX_UPLOAD_SIZE", default=30 * 1024 * 1024)
+    S3_PRESIGNED_EXPIRE_SECONDS: int = config("S3_PRESIGNED_EXPIRE_SECONDS", default=15 * 60)
 
 
 class LLMBaseSettings(BaseSettings):
@@ -179,8 +232,11 @@ class Settings(
     FirstUserSettings,
     LoggingSettings,
     LLMBaseSettings,
+    LLMCacheSettings,
     OpenAISettings,
+    PDFProcessingSettings,
     PostgresSettings,
+    QueueWorkerSettings,
     RedisRateLimiterSettings,
     RedisQueueSettings,
     RedisCacheSettings,
@@ -0,0 +1,4 @@
+class FileTooLargeError(Exception):
+    def __init__(self, message: str = "The PDF uploaded is too large, please resize it and try again.") -> None:
+        self.message = message
+        super().__init__(self.message)
@@ -100,3 +100,28 @@ async def blacklist_token(token: str, db: AsyncSession) -> None:
     payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     expires_at = datetime.fromtimestamp(payload.get("exp"))
     await crud_token_blacklist.create(db, object=TokenBlacklistCreate(**{"token": token, "expires_at": expires_at}))
+
+
+async def create_upload_token(object_name: str, kind: str, user_id: int) -> str:
+    """Create the token proving that a presigned upload was issued to a user.
+
+    The token has no `sub` claim, so it is never accepted as an access token.
+    """
+    expire = datetime.now(UTC).replace(tzinfo=None) + timedelta(seconds=settings.S3_PRESIGNED_EXPIRE_SECONDS)
+    to_encode = {"upload_key": object_name, "upload_kind": kind, "user_id": user_id, "exp": expire}
+    encoded_jwt: str = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return encoded_jwt
+
+
+async def verify_upload_token(token: str, kind: str, user_id: int) -> str | None:
+    """Verify an upload token and return the object name it was issued for, or None if it is not valid."""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+
+    if payload.get("upload_kind") != kind or payload.get("user_id") != user_id:
+        return None
+
+    object_name: str | None = payload.get("upload_key")
+    return object_name
@@ -1,3 +1,5 @@
+import asyncio
+import contextlib
 from collections.abc import AsyncGenerator, Callable
 from contextlib import _AsyncGeneratorContextManager, asynccontextmanager
 from typing import Any
@@ -24,15 +26,19 @@ from .config import (
     DatabaseSettings,
     EnvironmentOption,
     EnvironmentSettings,
+    LLMCacheSettings,
+    OpenAISettings,
+    PDFProcessingSettings,
     RedisCacheSettings,
     RedisQueueSettings,
     RedisRateLimiterSettings,
+    S3Settings,
     SentrySettings,
     settings,
 )
 from .db.database import Base
 from .db.database import async_engine as engine
-from .utils import cache, queue, rate_limit
+from .utils import cache, leaderboard, llm, llm_cache, pdf_pool, queue, rate_limit, s3
 
 
 # -------------- database --------------
@@ -65,11 +71,44 @@ async def create_redis_cache_pool() -> None:
     cache.pool = redis.ConnectionPool.from_url(settings.REDIS_CACHE_URL)
     cache.client = redis.Redis.from_pool(cache.pool)  # type: ignore
 
+    if settings.CACHE_LOCAL_ENABLED:
+        cache.local_cache = cache.LocalCache(max_size=settings.CACHE_LOCAL_MAX_SIZE, ttl=settings.CACHE_LOCAL_TTL)
+        cache.invalidation_task = asyncio.create_task(cache.listen_for_invalidations())
+
 
 async def close_redis_cache_pool() -> None:
+    if cache.invalidation_task is not None:
+        cache.invalidation_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await cache.invalidation_task
+        cache.invalidation_task = None
+    cache.local_cache = None
+
+    cache.cancel_refreshes()
+
     await cache.client.aclose()  # type: ignore
 
 
+# -------------- llm cache --------------
+async def create_redis_llm_cache_pool() -> None:
+    llm_cache.pool = redis.ConnectionPool.from_url(settings.REDIS_CACHE_URL)
+    llm_cache.client = redis.Redis.from_pool(llm_cache.pool)  # type: ignore
+
+
+async def close_redis_llm_cache_pool() -> None:
+    await llm_cache.client.aclose()  # type: ignore
+
+
+# -------------- leaderboard --------------
+async def create_redis_leaderboard_pool() -> None:
+    leaderboard.pool = redis.ConnectionPool.from_url(settings.REDIS_CACHE_URL)
+    leaderboard.client = redis.Redis.from_pool(leaderboard.pool)  # type: ignore
+
+
+async def close_redis_leaderboard_pool() -> None:
+    await leaderboard.client.aclose()  # type: ignore
+
+
 # -------------- queue --------------
 async def create_redis_queue_pool() -> None:
     queue.pool = await create_pool(RedisSettings(host=settings.REDIS_QUEUE_HOST, port=settings.REDIS_QUEUE_PORT))
@@ -89,6 +128,46 @@ async def close_redis_rate_limit_pool() -> None:
     await rate_limit.client.aclose()  # type: ignore
 
 
+# -------------- llm --------------
+async def create_llm_clients() -> None:
+    llm.scheduler = llm.create_scheduler()
+    llm.http_client = llm.create_http_client(scheduler=llm.scheduler)
+    llm.clients["openai"] = llm.create_openai_client(llm.http_client)
+
+
+async def close_llm_clients() -> None:
+    llm.clients.clear()
+    llm.scheduler = None
+    await llm.http_client.aclose()  # type: ignore
+
+
+# -------------- pdf pool --------------
+async def create_pdf_pool() -> None:
+    pdf_pool.executor = pdf_pool.create_executor()
+    pdf_pool.semaphore = asyncio.Semaphore(settings.PDF_POOL_WORKERS)
+
+
+async def close_pdf_pool() -> None:
+    pdf_pool.executor.shutdown(wait=False, cancel_futures=True)  # type: ignore
+    pdf_pool.executor = None
+    pdf_pool.semaphore = None
+
+
+# -------------- s3 --------------
+async def create_s3_client() -> None:
+    s3.client = s3.create_s3_client()
+    try:
+        await s3.ensure_bucket()
+    except Exception as e:
+        # Not fatal, the uploads report the error until the storage is reachable
+        logging.error(f"Error checking S3 bucket {settings.S3_BUCKET_NAME}: {e}")
+
+
+async def close_s3_client() -> None:
+    s3.client.close()  # type: ignore
+    s3.client = None
+
+
 # -------------- application --------------
 async def set_threadpool_tokens(number_of_tokens: int = 100) -> None:
     limiter = anyio.to_thread.current_default_thread_limiter()
@@ -122,23 +201,53 @@ def lifespan_factory(
         if isinstance(settings, RedisCacheSettings):
             await create_redis_cache_pool()
 
+        if isinstance(settings, RedisCacheSettings) and isinstance(settings, LLMCacheSettings):
+            await create_redis_llm_cache_pool()
+
+        if isinstance(settings, RedisCacheSettings):
+            await create_redis_leaderboard_pool()
+
         if isinstance(settings, RedisQueueSettings):
             await create_redis_queue_pool()
 
         if isinstance(settings, RedisRateLimiterSettings):
             await create_redis_rate_limit_pool()
 
+        if isinstance(settings, OpenAISettings):
+            await create_llm_clients()
+
+        if isinstance(settings, PDFProcessingSettings):
+            await create_pdf_pool()
+
+        if isinstance(settings, S3Settings):
+            await create_s3_client()
+
         yield
 
         if isinstance(settings, RedisCacheSettings):
             await close_redis_cache_pool()
 
+        if isinstance(settings, RedisCacheSettings) and isinstance(settings, LLMCacheSettings):
+            await close_redis_llm_cache_pool()
+
+        if isinstance(settings, RedisCacheSettings):
+            await close_redis_leaderboard_pool()
+
         if isinstance(settings, RedisQueueSettings):
             await close_redis_queue_pool()
 
         if isinstance(settings, RedisRateLimiterSettings):
             await close_redis_rate_limit_pool()
 
+        if isinstance(settings, OpenAISettings):
+            await close_llm_clients()
+
+        if isinstance(settings, PDFProcessingSettings):
+            await close_pdf_pool()
+
+        if isinstance(settings, S3Settings):
+            await close_s3_client()
+
     return lifespan
 
 
@@ -1,17 +1,320 @@
+import asyncio
+import fnmatch
 import functools
 import json
 import re
-from collections.abc import Callable
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 from fastapi import Request, Response
-from fastapi.encoders import jsonable_encoder
 from redis.asyncio import ConnectionPool, Redis
+from redis.exceptions import LockError
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..config import settings
+from ..db.database import local_session
 from ..exceptions.cache_exceptions import CacheIdentificationInferenceError, InvalidRequestError, MissingClientError
+from ..logger import logging
+from . import cache_codec
+
+logger = logging.getLogger(__name__)
+
+codec = cache_codec.CODECS[settings.CACHE_CODEC]
 
 pool: ConnectionPool | None = None
 client: Redis | None = None
+local_cache: "LocalCache | None" = None
+invalidation_task: asyncio.Task | None = None
+
+# The Redis set of the keys cached under a tag, see the `tags` of `cache`
+TAG_KEY_PREFIX = "cache:tag"
+
+# Appended to the keys of the responses stored with the time they go stale, see the `stale_ttl` of `cache`. Their
+# format differs from the plain responses, the suffix keeps the processes of another version from reading them.
+STALE_KEY_SUFFIX = ":swr"
+
+# Every process publishes the keys it invalidates on this channel, so that the others drop them from their local cache
+INVALIDATION_CHANNEL = "cache:invalidations"
+
+# The short Redis lock letting a single process recompute an expired key, see `_compute_once`
+LOCK_KEY_PREFIX = "cache:lock"
+LOCK_POLL_INTERVAL = 0.05
+
+# The recomputations in flight in this process, by cache key
+_inflight: dict[str, asyncio.Future] = {}
+# The background refreshes of stale keys started by this process, see the `stale_ttl` of `cache`
+_refresh_tasks: dict[str, asyncio.Task] = {}
+
+# Per process counters, exposed through the monitoring API
+metrics: dict[str, int] = {
+    "coalesced": 0,
+    "lock_acquired": 0,
+    "lock_waits": 0,
+    "lock_wait_hits": 0,
+    "lock_wait_timeouts": 0,
+    "stale_served": 0,
+    "refreshes": 0,
+    "refresh_failures": 0,
+}
+
+
+class LocalCache:
+    """An in-process LRU cache of responses, in front of Redis.
+
+    The entries expire after `ttl` seconds, which bounds how long a process can serve an entry invalidated while it
+    was not receiving the invalidation messages.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        self._entries[key] = (time.monotonic() + min(self.ttl, ttl if ttl is not None else self.ttl), value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def delete_pattern(self, pattern: str) -> None:
+        """Delete the keys matching a Redis glob-style pattern."""
+        for key in [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+async def _publish_invalidation(keys: list[str], patterns: list[str]) -> None:
+    """Drop keys from the local cache of this process and tell the other processes to do the same.
+
+    The invalidation is published even without a local cache in this process, e.g. in the worker, as other processes
+    may hold a copy of the keys.
+    """
+    if local_cache is not None:
+        local_cache.delete(*keys)
+        for pattern in patterns:
+            local_cache.delete_pattern(pattern)
+
+    if client is not None:
+        await client.publish(INVALIDATION_CHANNEL, json.dumps({"keys": keys, "patterns": patterns}))
+
+
+async def listen_for_invalidations() -> None:
+    """Apply the invalidations published by every process to the local cache, until cancelled.
+
+    While the subscription is down, invalidations are missed: the local cache is cleared whenever it is
+    (re)established.
+    """
+    while True:
+        try:
+            if client is None:
+                raise MissingClientError
+
+            async with client.pubsub(ignore_subscribe_messages=True) as pubsub:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                if local_cache is not None:
+                    local_cache.clear()
+
+                async for message in pubsub.listen():
+                    if local_cache is None or message["type"] != "message":
+                        continue
+                    invalidation = json.loads(message["data"])
+                    local_cache.delete(*invalidation["keys"])
+                    for pattern in invalidation["patterns"]:
+                        local_cache.delete_pattern(pattern)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Cache invalidation subscription lost, retrying: {e}")
+            if local_cache is not None:
+                local_cache.clear()
+            await asyncio.sleep(1)
+
+
+def _encode(data: Any, fresh_until: float | None) -> bytes:
+    """Serialize a response, wrapped with the time it goes stale when it is served stale afterwards."""
+    if fresh_until is not None:
+        data = {"fresh_until": fresh_until, "data": data}
+
+    return cache_codec.encode(data, codec, settings.CACHE_COMPRESS_MIN_SIZE)
+
+
+def _decode(cached_data: bytes, stale: bool) -> tuple[Any, float | None]:
+    """Deserialize a cached response, see `_encode`.
+
+    Returns
+    -------
+    tuple[Any, float | None]
+        The JSON-decoded response and the epoch time it goes stale, None when it is not served stale.
+    """
+    decoded_data = cache_codec.decode(cached_data, codec)
+    if not stale:
+        return decoded_data, None
+
+    return decoded_data["data"], decoded_data["fresh_until"]
+
+
+async def _wait_for_key(cache_key: str, stale: bool = False) -> Any | None:
+    """Poll Redis for a key recomputed by another process, for up to `CACHE_LOCK_WAIT` seconds."""
+    if client is None:
+        raise MissingClientError
+
+    deadline = time.monotonic() + settings.CACHE_LOCK_WAIT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(LOCK_POLL_INTERVAL)
+        cached_data = await client.get(cache_key)
+        if cached_data:
+            return _decode(cached_data, stale)[0]
+
+    return None
+
+
+async def _compute_once(cache_key: str, compute: Callable[[], Awaitable[Any]], stale: bool = False) -> Any:
+    """Recompute a missing key once, however many requests miss it at the same time.
+
+    The first caller of this process registers a future that the concurrent callers await instead of running the
+    endpoint again. Across processes, the caller holding the `CACHE_LOCK_TIMEOUT` seconds lock of the key recomputes
+    it while the others poll Redis for the result, and recompute it themselves if it is not there after
+    `CACHE_LOCK_WAIT` seconds.
+
+    Parameters
+    ----------
+    cache_key: str
+        The missing key.
+    compute: Callable[[], Awaitable[Any]]
+        Runs the endpoint and caches its result, returns the result.
+    stale: bool
+        Whether the key is cached with the time it goes stale, see `_encode`.
+
+    Returns
+    -------
+    Any
+        The result of the endpoint.
+    """
+    if client is None:
+        raise MissingClientError
+
+    inflight = _inflight.get(cache_key)
+    if inflight is not None:
+        metrics["coalesced"] += 1
+        try:
+            return await asyncio.shield(inflight)
+        except asyncio.CancelledError:
+            # The recomputing request was cancelled, not this one
+            if not inflight.cancelled():
+                raise
+            return await compute()
+
+    future: asyncio.Future = asyncio.get_running_loop().create_future()
+    _inflight[cache_key] = future
+    try:
+        lock = client.lock(f"{LOCK_KEY_PREFIX}:{cache_key}", timeout=settings.CACHE_LOCK_TIMEOUT)
+        if await lock.acquire(blocking=False):
+            metrics["lock_acquired"] += 1
+        else:
+            lock = None
+            metrics["lock_waits"] += 1
+            cached_data = await _wait_for_key(cache_key, stale)
+            if cached_data is not None:
+                metrics["lock_wait_hits"] += 1
+                future.set_result(cached_data)
+                return cached_data
+            metrics["lock_wait_timeouts"] += 1
+
+        try:
+            result = await compute()
+        finally:
+            if lock is not None:
+                try:
+                    await lock.release()
+                except LockError:
+                    logger.warning(f"Cache lock of {cache_key} expired before the key was recomputed")
+
+        future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Mark the exception as retrieved, there may be no other caller waiting for it
+        future.exception()
+        raise
+    finally:
+        _inflight.pop(cache_key, None)
+
+
+async def _refresh(cache_key: str, compute: Callable[[], Awaitable[Any]]) -> None:
+    """Recompute a stale key in the background, unless another process holds its lock."""
+    if client is None:
+        raise MissingClientError
+
+    lock = client.lock(f"{LOCK_KEY_PREFIX}:{cache_key}", timeout=settings.CACHE_LOCK_TIMEOUT)
+    if not await lock.acquire(blocking=False):
+        return
+
+    try:
+        await compute()
+        metrics["refreshes"] += 1
+    except Exception as e:
+        # The stale response is served until it expires, the next request tries again
+        metrics["refresh_failures"] += 1
+        logger.warning(f"Background refresh of {cache_key} failed: {e}")
+    finally:
+        try:
+            await lock.release()
+        except LockError:
+            logger.warning(f"Cache lock of {cache_key} expired before the key was refreshed")
+
+
+def _schedule_refresh(cache_key: str, compute: Callable[[], Awaitable[Any]]) -> None:
+    """Start the background refresh of a stale key, if this process is not already refreshing or recomputing it."""
+    if cache_key in _refresh_tasks or cache_key in _inflight:
+        return
+
+    task = asyncio.create_task(_refresh(cache_key, compute))
+    _refresh_tasks[cache_key] = task
+    task.add_done_callback(lambda _: _refresh_tasks.pop(cache_key, None))
+
+
+def cancel_refreshes() -> None:
+    """Cancel the background refreshes of this process, at shutdown."""
+    for task in list(_refresh_tasks.values()):
+        task.cancel()
+
+
+def get_stats() -> dict[str, int]:
+    """Get the stampede protection counters of this process.
+
+    Returns
+    -------
+    dict[str, int]
+        The `inflight` recomputations, the misses `coalesced` into a recomputation of this process, the locks
+        acquired, the `lock_waits` for a recomputation of another process, the waits ending with the key cached
+        (`lock_wait_hits`) and the ones giving up (`lock_wait_timeouts`), the `stale_served` responses, the
+        `refreshing` keys and the background `refreshes` and `refresh_failures`.
+    """
+    return {"inflight": len(_inflight), "refreshing": len(_refresh_tasks), **metrics}
 
 
 def _infer_resource_id(kwargs: dict[str, Any], resource_id_type: type | tuple[type, ...]) -> int | str:
@@ -74,72 +377,24 @@ def _extract_data_inside_brackets(input_string: str) -> list[str]:
     return data_inside_brackets
 
 
-def _construct_data_dict(data_inside_brackets: list[str], kwargs: dict[str, Any]) -> dict[str, Any]:
-    """Construct a dictionary based on data inside brackets and keyword arguments.
-
-    Parameters
-    ----------
-    data_inside_brackets: List[str]
-        A list of keys inside brackets.
-    kwargs: Dict[str, Any]
-        A dictionary of keyword arguments.
-
-    Returns
-    -------
-    Dict[str, Any]: A dictionary with keys from data_inside_brackets and corresponding values from kwargs.
-    """
-    data_dict = {}
-    for key in data_inside_brackets:
-        data_dict[key] = kwargs[key]
-    return data_dict
-
-
-def _format_prefix(prefix: str, kwargs: dict[str, Any]) -> str:
-    """Format a prefix using keyword arguments.
-
-    Parameters
-    ----------
-    prefix: str
-        The prefix template to be formatted.
-    kwargs: Dict[str, Any]
-        A dictionary of keyword arguments.
-
-    Returns
-    -------
-    str: The formatted prefix.
-    """
-    data_inside_brackets = _extract_data_inside_brackets(prefix)
-    data_dict = _construct_data_dict(data_inside_brackets, kwargs)
-    formatted_prefix = prefix.format(**data_dict)
-    return formatted_prefix
-
-
-def _format_extra_data(to_invalidate_extra: dict[str, str], kwargs: dict[str, Any]) -> dict[str, Any]:
-    """Format extra data based on provided templates and keyword arguments.
-
-    This function takes a dictionary of templates and their associated values and a dictionary of keyword arguments.
-    It formats the templates with the corresponding values from the keyword arguments and returns a dictionary
-    where keys are the formatted templates and values are the associated keyword argument values.
+def _compile_template(template: str) -> Callable[[dict[str, Any]], str]:
+    """Compile a key template once, when an endpoint is decorated, instead of parsing it on every request.
 
     Parameters
     ----------
-    to_invalidate_extra: Dict[str, str]
-        A dictionary where keys are templates and values are the associated values.
-    kwargs: Dict[str, Any]
-        A dictionary of keyword arguments.
+    template: str
+        The template, e.g. '{username}_posts', formatted with the keyword arguments named inside curly brackets.
 
     Returns
     -------
-        Dict[str, Any]: A dictionary where keys are formatted templates and values
-        are associated keyword argument values.
+    Callable[[dict[str, Any]], str]
+        Formats the template with the keyword arguments of a call.
     """
-    formatted_extra = {}
-    for prefix, id_template in to_invalidate_extra.items():
-        formatted_prefix = _format_prefix(prefix, kwargs)
-        id = _extract_data_inside_brackets(id_template)[0]
-        formatted_extra[formatted_prefix] = kwargs[id]
+    fields = _extract_data_inside_brackets(template)
+    if not fields:
+        return lambda kwargs: template
 
-    return formatted_extra
+    return lambda kwargs: template.format(**{field: kwargs[field] for field in fields})
 
 
 async def _delete_keys_by_pattern(pattern: str) -> None:
@@ -181,6 +436,49 @@ async def _delete_keys_by_pattern(pattern: str) -> None:
             await client.delete(*keys)
 
 
+async def _invalidate(keys: list[str], tag_keys: list[str]) -> list[str]:
+    """Delete keys and the keys cached under tags.
+
+    The members of every tag are read in one pipeline, then all the keys are unlinked and removed from their tag set
+    in another, so the cost follows the number of affected keys instead of the size of the keyspace. Removing only
+    the members read, rather than the whole set, keeps the keys cached by concurrent requests in the meantime.
+
+    Parameters
+    ----------
+    keys: list[str]
+        The keys to delete, along with their `STALE_KEY_SUFFIX` variant.
+    tag_keys: list[str]
+        The Redis sets of the tags, see `TAG_KEY_PREFIX`.
+
+    Returns
+    -------
+    list[str]
+        The deleted keys, the ones of the tags included.
+    """
+    if client is None:
+        raise MissingClientError
+
+    tag_members: list[set[bytes]] = []
+    if tag_keys:
+        async with client.pipeline(transaction=False) as pipe:
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            tag_members = await pipe.execute()
+
+    deleted_keys = [*keys, *(key + STALE_KEY_SUFFIX for key in keys)]
+    async with client.pipeline(transaction=False) as pipe:
+        for tag_key, members in zip(tag_keys, tag_members, strict=True):
+            if members:
+                decoded_members = [member.decode() for member in members]
+                pipe.srem(tag_key, *decoded_members)
+                deleted_keys.extend(decoded_members)
+        if deleted_keys:
+            pipe.unlink(*deleted_keys)
+            await pipe.execute()
+
+    return deleted_keys
+
+
 def cache(
     key_prefix: str,
     resource_id_name: Any = None,
@@ -188,6 +486,9 @@ def cache(
     resource_id_type: type | tuple[type, ...] = int,
     to_invalidate_extra: dict[str, Any] | None = None,
     pattern_to_invalidate_extra: list[str] | None = None,
+    tags: list[str] | None = None,
+    tags_to_invalidate: list[str] | None = None,
+    stale_ttl: int | None = None,
 ) -> Callable:
     """Cache decorator for FastAPI endpoints.
 
@@ -213,6 +514,15 @@ def cache(
     pattern_to_invalidate_extra: List[str] | None, optional
         A list of string patterns for cache keys that should be invalidated when the decorated function is called.
         This allows for bulk invalidation of cache keys based on a matching pattern.
+    tags: List[str] | None, optional
+        Templates of tags registering the key of a GET response, e.g. '{username}_resumes' for every page of a list.
+    tags_to_invalidate: List[str] | None, optional
+        Templates of tags whose keys are invalidated when the decorated function is called with a method other than
+        GET. Prefer them to `pattern_to_invalidate_extra`, which scans the whole keyspace.
+    stale_ttl: int | None, optional
+        For how many seconds after `expiration` a GET response is still served, while it is refreshed in the
+        background. The refresh runs the endpoint with a new database session, so it must not depend on the state of
+        the request.
 
     Returns
     -------
@@ -281,8 +591,26 @@ def cache(
     - `to_invalidate_extra` and `pattern_to_invalidate_extra` are used for cache invalidation on methods other than GET.
     - Using `pattern_to_invalidate_extra` can be resource-intensive on large datasets. Use it judiciously and
       consider the potential impact on Redis performance.
+    - When `CACHE_LOCAL_ENABLED` is set, GET responses are also kept in the `LocalCache` of the process for up to
+      `CACHE_LOCAL_TTL` seconds. The keys invalidated by other methods are published on `INVALIDATION_CHANNEL` so
+      that every process drops them.
+    - Concurrent GET requests missing the same key run the endpoint once, see `_compute_once`.
+    - With `stale_ttl`, the response is stored with the time it goes stale, under the key suffixed with
+      `STALE_KEY_SUFFIX`, and kept in Redis for `expiration` plus `stale_ttl` seconds. Invalidations delete it right
+      away, a stale response is only served after an expiration.
     """
 
+    ttl = expiration + stale_ttl if stale_ttl is not None else expiration
+
+    format_key_prefix = _compile_template(key_prefix)
+    format_tags = [_compile_template(f"{TAG_KEY_PREFIX}:{tag}") for tag in tags or []]
+    format_tags_to_invalidate = [_compile_template(f"{TAG_KEY_PREFIX}:{tag}") for tag in tags_to_invalidate or []]
+    format_patterns = [_compile_template(pattern + "*") for pattern in pattern_to_invalidate_extra or []]
+    format_extra_keys = [
+        (_compile_template(prefix), _extract_data_inside_brackets(id_template)[0])
+        for prefix, id_template in (to_invalidate_extra or {}).items()
+    ]
+
     def wrapper(func: Callable) -> Callable:
         @functools.wraps(func)
         async def inner(request: Request, *args: Any, **kwargs: Any) -> Response:
@@ -294,39 +622,80 @@ def cache(
             else:
                 resource_id = _infer_resource_id(kwargs=kwargs, resource_id_type=resource_id_type)
 
-            formatted_key_prefix = _format_prefix(key_prefix, kwargs)
-            cache_key = f"{formatted_key_prefix}:{resource_id}"
+            cache_key = f"{format_key_prefix(kwargs)}:{resource_id}"
+            if stale_ttl is not None:
+                cache_key += STALE_KEY_SUFFIX
             if request.method == "GET":
-                if to_invalidate_extra is not None or pattern_to_invalidate_extra is not None:
+                if to_invalidate_extra is not None or pattern_to_invalidate_extra is not None or tags_to_invalidate:
                     raise InvalidRequestError
 
+                if local_cache is not None:
+                    local_data = local_cache.get(cache_key)
+                    if local_data is not None:
+                        return local_data
+
+                async def compute(call_kwargs: dict[str, Any] = kwargs) -> Any:
+                    # The result is returned as is to the concurrent callers and kept in the local cache, instead of
+                    # decoding the value just stored
+                    if client is None:
+                        raise MissingClientError
+
+                    result = await func(request, *args, **call_kwargs)
+                    fresh_until = time.time() + expiration if stale_ttl is not None else None
+
+                    async with client.pipeline(transaction=False) as pipe:
+                        pipe.set(cache_key, _encode(result, fresh_until), ex=ttl)
+                        for format_tag in format_tags:
+                            tag_key = format_tag(kwargs)
+                            pipe.sadd(tag_key, cache_key)
+                            # The set lives as long as its longest-lived key
+                            pipe.expire(tag_key, ttl, nx=True)
+                            pipe.expire(tag_key, ttl, gt=True)
+                        await pipe.execute()
+
+                    if local_cache is not None:
+                        local_cache.set(cache_key, result, ttl=expiration)
+
+                    return result
+
+                async def refresh() -> Any:
+                    # The session of the request is closed once it is answered
+                    async with local_session() as db:
+                        return await compute(
+                            {name: db if isinstance(value, AsyncSession) else value for name, value in kwargs.items()}
+                        )
+
                 cached_data = await client.get(cache_key)
                 if cached_data:
-                    return json.loads(cached_data.decode())
+                    decoded_data, fresh_until = _decode(cached_data, stale_ttl is not None)
+                    if fresh_until is not None and fresh_until <= time.time():
+                        metrics["stale_served"] += 1
+                        _schedule_refresh(cache_key, refresh)
+                        return decoded_data
 
-            result = await func(request, *args, **kwargs)
+                    if local_cache is not None:
+                        local_cache.set(
+                            cache_key, decoded_data, ttl=fresh_until - time.time() if fresh_until is not None else None
+                        )
+                    return decoded_data
 
-            if request.method == "GET":
-                serializable_data = jsonable_encoder(result)
-                serialized_data = json.dumps(serializable_data)
+                return await _compute_once(cache_key, compute, stale_ttl is not None)
 
-                await client.set(cache_key, serialized_data)
-                await client.expire(cache_key, expiration)
+            result = await func(request, *args, **kwargs)
 
-                serialized_data = json.loads(serialized_data)
+            invalidated_keys = await _invalidate(
+                [
+                    cache_key,
+                    *(f"{format_prefix(kwargs)}:{kwargs[id_name]}" for format_prefix, id_name in format_extra_keys),
+                ],
+                [format_tag(kwargs) for format_tag in format_tags_to_invalidate],
+            )
 
-            else:
-                await client.delete(cache_key)
-                if to_invalidate_extra is not None:
-                    formatted_extra = _format_extra_data(to_invalidate_extra, kwargs)
-                    for prefix, id in formatted_extra.items():
-                        extra_cache_key = f"{prefix}:{id}"
-                        await client.delete(extra_cache_key)
-
-                if pattern_to_invalidate_extra is not None:
-                    for pattern in pattern_to_invalidate_extra:
-                        formatted_pattern = _format_prefix(pattern, kwargs)
-                        await _delete_keys_by_pattern(formatted_pattern + "*")
+            invalidated_patterns = [format_pattern(kwargs) for format_pattern in format_patterns]
+            for pattern in invalidated_patterns:
+                await _delete_keys_by_pattern(pattern)
+
+            await _publish_invalidation(invalidated_keys, invalidated_patterns)
 
             return result
 
@@ -0,0 +1,77 @@
+import json
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+# Every zlib stream starts with 0x78, which never starts a JSON document: the values smaller than the threshold, or
+# stored before compression was enabled, are read as they are
+ZLIB_HEADER = b"x"
+ZLIB_LEVEL = 1
+
+
+@dataclass(frozen=True)
+class CacheCodec:
+    """Serializes the responses stored by the `cache` decorator to JSON.
+
+    Attributes
+    ----------
+    dumps: Callable[[Any], bytes]
+        Serializes a response, as returned by an endpoint.
+    loads: Callable[[bytes], Any]
+        Deserializes a response into JSON types.
+    """
+
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+def _json_dumps(data: Any) -> bytes:
+    return json.dumps(jsonable_encoder(data)).encode()
+
+
+def _orjson_dumps(data: Any) -> bytes:
+    # Dicts, lists, datetimes and UUIDs are serialized natively, only the other types such as Pydantic models go
+    # through jsonable_encoder
+    return orjson.dumps(data, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS)
+
+
+CODECS = {
+    "json": CacheCodec(dumps=_json_dumps, loads=json.loads),
+    "orjson": CacheCodec(dumps=_orjson_dumps, loads=orjson.loads),
+}
+
+
+def encode(data: Any, codec: CacheCodec, compress_min_size: int = 0) -> bytes:
+    """Serialize a response, compressed with zlib when it is larger than `compress_min_size` bytes.
+
+    Parameters
+    ----------
+    data: Any
+        The response, as returned by an endpoint.
+    codec: CacheCodec
+        The codec serializing the response.
+    compress_min_size: int
+        The size from which the serialized response is compressed, 0 to never compress it.
+
+    Returns
+    -------
+    bytes
+        The value to store.
+    """
+    payload = codec.dumps(data)
+    if compress_min_size and len(payload) >= compress_min_size:
+        return zlib.compress(payload, ZLIB_LEVEL)
+
+    return payload
+
+
+def decode(payload: bytes, codec: CacheCodec) -> Any:
+    """Deserialize a value stored by `encode`, with any codec as they all produce JSON."""
+    if payload[:1] == ZLIB_HEADER:
+        payload = zlib.decompress(payload)
+
+    return codec.loads(payload)
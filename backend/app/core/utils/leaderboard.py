@@ -0,0 +1,190 @@
+from redis.asyncio import ConnectionPool, Redis
+from redis.exceptions import WatchError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...models.resume import Resume
+from ...models.score import Score
+from ..exceptions.cache_exceptions import MissingClientError
+from ..logger import logging
+
+logger = logging.getLogger(__name__)
+
+pool: ConnectionPool | None = None
+client: Redis | None = None
+
+KEY_PREFIX = "leaderboard:job"
+REBUILD_ATTEMPTS = 3
+
+
+def _key(job_id: int) -> str:
+    return f"{KEY_PREFIX}:{job_id}"
+
+
+def _built_key(job_id: int) -> str:
+    return f"{KEY_PREFIX}:{job_id}:built"
+
+
+def _get_client() -> Redis:
+    if client is None:
+        raise MissingClientError
+
+    return client
+
+
+async def add_score(job_id: int, resume_id: int, score: float) -> None:
+    """Set the score of a resume in the leaderboard of its job, the latest score of a resume wins.
+
+    Parameters
+    ----------
+    job_id: int
+        The ID of the job description.
+    resume_id: int
+        The ID of the scored resume.
+    score: float
+        The score of the resume.
+    """
+    await _get_client().zadd(_key(job_id), {str(resume_id): score})
+
+
+async def remove_resume(job_id: int, resume_id: int) -> None:
+    """Remove a resume from the leaderboard of its job, e.g. when the resume is deleted."""
+    await _get_client().zrem(_key(job_id), str(resume_id))
+
+
+async def rebuild(db: AsyncSession, job_id: int) -> int | None:
+    """Rebuild the leaderboard of a job from the latest score of each of its non-deleted resumes.
+
+    The leaderboard key is watched while the database is read: a score added or removed in the meantime aborts the
+    transaction, so the snapshot never overwrites it, and the rebuild starts over. The leaderboard is replaced in a
+    transaction, so readers never see it partially built.
+
+    Parameters
+    ----------
+    db: AsyncSession
+        The database session.
+    job_id: int
+        The ID of the job description.
+
+    Returns
+    -------
+    int | None
+        The number of resumes in the leaderboard, or None if it kept changing during every attempt, it is then left
+        marked as not built and rebuilt on the next read.
+    """
+    query = (
+        select(Score.resume_id, Score.score)
+        .join(Resume, Resume.id == Score.resume_id)
+        .where(Score.job_id == job_id, Score.is_deleted.is_(False), Resume.is_deleted.is_(False))
+        .order_by(Score.resume_id, Score.created_at.desc())
+        .distinct(Score.resume_id)
+    )
+    key = _key(job_id)
+    for _ in range(REBUILD_ATTEMPTS):
+        async with _get_client().pipeline(transaction=True) as pipe:
+            await pipe.watch(key)
+            scores = {str(resume_id): score for resume_id, score in (await db.execute(query)).all()}
+
+            pipe.multi()
+            pipe.delete(key)
+            if scores:
+                pipe.zadd(key, scores)
+            pipe.set(_built_key(job_id), 1)
+            try:
+                await pipe.execute()
+            except WatchError:
+                continue
+
+        logger.info(f"Rebuilt leaderboard of job {job_id} with {len(scores)} resumes")
+        return len(scores)
+
+    logger.warning(f"Leaderboard of job {job_id} changed during every rebuild attempt, it is rebuilt on the next read")
+    return None
+
+
+async def ensure_built(db: AsyncSession, job_id: int) -> None:
+    """Rebuild the leaderboard of a job from the database if it was never built or Redis was flushed."""
+    if not await _get_client().exists(_built_key(job_id)):
+        await rebuild(db=db, job_id=job_id)
+
+
+async def count(job_id: int) -> int:
+    """Get the number of resumes in the leaderboard of a job."""
+    total: int = await _get_client().zcard(_key(job_id))
+    return total
+
+
+async def get_top(job_id: int, offset: int = 0, limit: int = 10) -> list[dict[str, int | float]]:
+    """Get a page of the leaderboard of a job, the best scores first.
+
+    Parameters
+    ----------
+    job_id: int
+        The ID of the job description.
+    offset: int
+        The number of entries to skip.
+    limit: int
+        The maximum number of entries to return.
+
+    Returns
+    -------
+    list[dict[str, int | float]]
+        The `resume_id`, `score` and 1-based `rank` of each entry.
+    """
+    entries = await _get_client().zrevrange(_key(job_id), offset, offset + limit - 1, withscores=True)
+    return [
+        {"resume_id": int(resume_id), "score": score, "rank": offset + index + 1}
+        for index, (resume_id, score) in enumerate(entries)
+    ]
+
+
+async def get_rank(job_id: int, resume_id: int) -> dict[str, int | float] | None:
+    """Get the score and the 1-based rank of a resume in the leaderboard of its job, or None if it is not ranked."""
+    async with _get_client().pipeline(transaction=False) as pipe:
+        pipe.zrevrank(_key(job_id), str(resume_id))
+        pipe.zscore(_key(job_id), str(resume_id))
+        rank, score = await pipe.execute()
+
+    if rank is None or score is None:
+        return None
+
+    return {"resume_id": resume_id, "score": score, "rank": rank + 1}
+
+
+async def get_by_score_range(
+    job_id: int, min_score: float, max_score: float, offset: int = 0, limit: int = 10
+) -> tuple[list[dict[str, int | float]], int]:
+    """Get a page of the resumes of a job scoring between `min_score` and `max_score`, the best scores first.
+
+    Parameters
+    ----------
+    job_id: int
+        The ID of the job description.
+    min_score: float
+        The lowest score included.
+    max_score: float
+        The highest score included.
+    offset: int
+        The number of entries to skip.
+    limit: int
+        The maximum number of entries to return.
+
+    Returns
+    -------
+    tuple[list[dict[str, int | float]], int]
+        The `resume_id`, `score` and 1-based `rank` in the whole leaderboard of each entry, and the number of resumes
+        in the range.
+    """
+    key = _key(job_id)
+    async with _get_client().pipeline(transaction=False) as pipe:
+        pipe.zrevrangebyscore(key, max_score, min_score, start=offset, num=limit, withscores=True)
+        pipe.zcount(key, min_score, max_score)
+        # Resumes scoring above the range, the rank of the first entry of the range follows them
+        pipe.zcount(key, f"({max_score}", "+inf")
+        entries, total, above = await pipe.execute()
+
+    entries = [
+        {"resume_id": int(resume_id), "score": score, "rank": above + offset + index + 1}
+        for index, (resume_id, score) in enumerate(entries)
+    ]
+    return entries, total
@@ -0,0 +1,110 @@
+from typing import Any
+
+import httpx
+import instructor
+from openai import AsyncOpenAI
+
+from ..config import settings
+from ..exceptions.cache_exceptions import MissingClientError
+from .llm_scheduler import LLMScheduler
+
+http_client: httpx.AsyncClient | None = None
+clients: dict[str, AsyncOpenAI] = {}
+scheduler: LLMScheduler | None = None
+
+
+def create_scheduler() -> LLMScheduler:
+    """Create the scheduler keeping the requests of the process within the provider rate limits."""
+    return LLMScheduler(
+        requests_per_minute=settings.OPENAI_REQUESTS_PER_MINUTE,
+        tokens_per_minute=settings.OPENAI_TOKENS_PER_MINUTE,
+    )
+
+
+def create_http_client(scheduler: LLMScheduler | None = None) -> httpx.AsyncClient:
+    """Create the HTTP client shared by every LLM client of the process.
+
+    Parameters
+    ----------
+    scheduler: LLMScheduler | None
+        If given, every request waits for the budgets of the scheduler and the rate limit headers of every response
+        are fed to it.
+
+    Returns
+    -------
+    httpx.AsyncClient
+        A client keeping up to `OPENAI_MAX_KEEPALIVE_CONNECTIONS` connections alive, so that consecutive calls reuse
+        the same TLS sessions, and multiplexing requests over HTTP/2 when `OPENAI_HTTP2` is set.
+    """
+    return httpx.AsyncClient(
+        event_hooks=(
+            {"request": [scheduler.before_request], "response": [scheduler.observe_response]}
+            if scheduler is not None
+            else None
+        ),
+        http2=settings.OPENAI_HTTP2,
+        limits=httpx.Limits(
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(settings.OPENAI_REQUEST_TIMEOUT, connect=settings.OPENAI_CONNECT_TIMEOUT),
+    )
+
+
+def create_openai_client(http_client: httpx.AsyncClient) -> AsyncOpenAI:
+    """Create an OpenAI client patched by instructor on top of the shared HTTP client."""
+    return instructor.patch(
+        AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_API_URL or None,
+            http_client=http_client,
+        )
+    )
+
+
+def get_client(provider: str | None = None) -> AsyncOpenAI:
+    """Get the client of a LLM provider from the process-wide registry.
+
+    Parameters
+    ----------
+    provider: str | None
+        The name of the provider, defaults to `LLM_PROVIDER`.
+
+    Returns
+    -------
+    AsyncOpenAI
+        The client created at startup for the provider.
+
+    Raises
+    ------
+    MissingClientError
+        If the clients were not created, i.e. outside of the application lifespan or the worker.
+    """
+    client = clients.get(provider or settings.LLM_PROVIDER)
+    if client is None:
+        raise MissingClientError
+
+    return client
+
+
+async def create_chat_completion(timeout: float | None = None, **kwargs: Any) -> Any:
+    """Send a chat completion request through the pooled client of the current provider.
+
+    Every HTTP request of the call, retries included, first waits for the scheduler to have enough request and token
+    budget for its model, so that bursts are spread at the provider rate limit instead of failing with 429s.
+
+    Parameters
+    ----------
+    timeout: float | None
+        The timeout of this call in seconds, defaults to `OPENAI_REQUEST_TIMEOUT`.
+    **kwargs
+        The arguments of `chat.completions.create`, including the instructor ones such as `response_model`.
+
+    Returns
+    -------
+    Any
+        The completion, or the `response_model` instance when one is given.
+    """
+    client = get_client()
+    return await client.chat.completions.create(timeout=timeout or settings.OPENAI_REQUEST_TIMEOUT, **kwargs)
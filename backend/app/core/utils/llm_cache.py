@@ -0,0 +1,157 @@
+import hashlib
+import json
+import time
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+from redis.asyncio import ConnectionPool, Redis
+
+from ..config import settings
+from ..exceptions.cache_exceptions import MissingClientError
+from ..logger import logging
+
+logger = logging.getLogger(__name__)
+
+pool: ConnectionPool | None = None
+client: Redis | None = None
+
+KEY_PREFIX = "llm_cache"
+LRU_KEY = f"{KEY_PREFIX}:lru"
+HITS_KEY = f"{KEY_PREFIX}:stats:hits"
+MISSES_KEY = f"{KEY_PREFIX}:stats:misses"
+
+ModelType = TypeVar("ModelType", bound=BaseModel)
+
+
+def canonical_json(value: Any) -> str:
+    """Serialize a value to JSON so that equal values always produce the same string.
+
+    Parameters
+    ----------
+    value: Any
+        A JSON serializable value, e.g. the `parsed_skills` of a parsed job description.
+
+    Returns
+    -------
+    str
+        The JSON string with sorted keys and no insignificant whitespace.
+    """
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def make_cache_key(*parts: str) -> str:
+    """Build a content-addressed cache key from the given parts.
+
+    Parameters
+    ----------
+    *parts: str
+        The values identifying the LLM call, e.g. the input text, the model name and the prompt version.
+
+    Returns
+    -------
+    str
+        The cache key, made of the `llm_cache` prefix and the SHA-256 of the parts.
+    """
+    digest = hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+    return f"{KEY_PREFIX}:{digest}"
+
+
+async def get_cached_model(key: str, response_model: type[ModelType]) -> ModelType | None:
+    """Get a cached LLM response and mark it as recently used.
+
+    A hit also extends the expiration of the entry, so it lives `LLM_CACHE_TTL` seconds after its last use, like its
+    recency in the LRU sorted set. A miss drops the key from the sorted set, in case Redis evicted it.
+
+    Parameters
+    ----------
+    key: str
+        The key built with `make_cache_key`.
+    response_model: type[ModelType]
+        The pydantic model the cached response is validated against.
+
+    Returns
+    -------
+    ModelType | None
+        The cached response, or None on a miss or if Redis is unavailable.
+    """
+    if client is None:
+        raise MissingClientError
+
+    try:
+        cached_data = await client.get(key)
+        if cached_data is None:
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.incr(MISSES_KEY)
+                pipe.zrem(LRU_KEY, key)
+                await pipe.execute()
+            return None
+
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.incr(HITS_KEY)
+            pipe.zadd(LRU_KEY, {key: time.time()})
+            pipe.expire(key, settings.LLM_CACHE_TTL)
+            await pipe.execute()
+        return response_model.model_validate_json(cached_data)
+    except Exception as e:
+        logger.error(f"Error reading LLM cache key {key}: {e}")
+        return None
+
+
+async def set_cached_model(key: str, value: BaseModel) -> None:
+    """Cache an LLM response, evicting expired and least recently used entries.
+
+    Entries expire `LLM_CACHE_TTL` seconds after their last use and at most `LLM_CACHE_MAX_ENTRIES` are kept: the
+    recency of every entry is tracked in a sorted set and the oldest ones are deleted once the limit is exceeded.
+
+    Parameters
+    ----------
+    key: str
+        The key built with `make_cache_key`.
+    value: BaseModel
+        The LLM response to cache.
+    """
+    if client is None:
+        raise MissingClientError
+
+    now = time.time()
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.set(key, value.model_dump_json(), ex=settings.LLM_CACHE_TTL)
+            pipe.zadd(LRU_KEY, {key: now})
+            pipe.zremrangebyscore(LRU_KEY, "-inf", now - settings.LLM_CACHE_TTL)
+            pipe.zcard(LRU_KEY)
+            *_, total_entries = await pipe.execute()
+
+        excess = total_entries - settings.LLM_CACHE_MAX_ENTRIES
+        if excess > 0:
+            evicted = await client.zpopmin(LRU_KEY, excess)
+            await client.delete(*[evicted_key for evicted_key, _ in evicted])
+    except Exception as e:
+        logger.error(f"Error writing LLM cache key {key}: {e}")
+
+
+async def get_stats() -> dict[str, int | float]:
+    """Get the hit/miss counters and the number of entries of the LLM cache.
+
+    Returns
+    -------
+    dict[str, int | float]
+        The `hits`, `misses`, `entries` and `hit_ratio` of the cache.
+    """
+    if client is None:
+        raise MissingClientError
+
+    async with client.pipeline(transaction=False) as pipe:
+        pipe.get(HITS_KEY)
+        pipe.get(MISSES_KEY)
+        pipe.zcard(LRU_KEY)
+        hits, misses, entries = await pipe.execute()
+
+    hits, misses = int(hits or 0), int(misses or 0)
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "entries": entries,
+        "hit_ratio": hits / lookups if lookups else 0.0,
+    }
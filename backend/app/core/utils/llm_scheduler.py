@@ -0,0 +1,235 @@
+import asyncio
+import json
+import re
+import time
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import httpx
+
+from ..logger import logging
+
+logger = logging.getLogger(__name__)
+
+# Rough average for English and Dutch text with the OpenAI tokenizers, good enough to budget requests
+CHARS_PER_TOKEN = 4
+TOKENS_PER_MESSAGE = 4
+
+_DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset_duration(value: str | None) -> float | None:
+    """Parse the duration of a `x-ratelimit-reset-*` header.
+
+    Parameters
+    ----------
+    value: str | None
+        The header value, e.g. '1s', '6m0s' or '20ms'.
+
+    Returns
+    -------
+    float | None
+        The duration in seconds, or None if the value is missing or cannot be parsed.
+
+    Example
+    -------
+    >>> parse_reset_duration("1m30.5s")
+    90.5
+    """
+    if not value:
+        return None
+
+    matches = _DURATION_PATTERN.findall(value)
+    if not matches:
+        return None
+
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in matches)
+
+
+def estimate_request_tokens(messages: Iterable[Mapping[str, Any]], max_tokens: int | None = None) -> int:
+    """Estimate how many tokens a chat completion request counts against the tokens-per-minute limit.
+
+    The provider counts both the prompt and `max_tokens` when rate limiting, so both are included.
+
+    Parameters
+    ----------
+    messages: Iterable[Mapping[str, Any]]
+        The messages of the request.
+    max_tokens: int | None
+        The `max_tokens` of the request.
+
+    Returns
+    -------
+    int
+        The estimated number of tokens.
+    """
+    prompt_tokens = sum(
+        len(str(message.get("content") or "")) // CHARS_PER_TOKEN + TOKENS_PER_MESSAGE for message in messages
+    )
+    return prompt_tokens + (max_tokens or 0)
+
+
+class TokenBucket:
+    """A budget refilled continuously up to `limit` units per minute, never above the configured `max_limit`."""
+
+    def __init__(self, limit: float, now: float | None = None) -> None:
+        self.max_limit = limit
+        self.limit = limit
+        self.available = limit
+        self.updated_at = time.monotonic() if now is None else now
+
+    def _refill(self, now: float) -> None:
+        self.available = min(self.limit, self.available + (now - self.updated_at) * self.limit / 60)
+        self.updated_at = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds to wait until `amount` units are available, requests larger than the limit wait for a full
+        bucket."""
+        self._refill(now)
+        missing = min(amount, self.limit) - self.available
+        return max(0.0, missing * 60 / self.limit)
+
+    def consume(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.available -= min(amount, self.limit)
+
+    def sync(self, limit: float | None, remaining: float | None, reset_after: float | None, now: float) -> None:
+        """Align the bucket with the budget reported by the provider.
+
+        The provider sees the requests of every process sharing the API key, so its view wins whenever it is more
+        restrictive than the local one. The limit follows the provider, but never above the configured one.
+        """
+        self._refill(now)
+        if limit:
+            self.limit = min(self.max_limit, limit)
+            self.available = min(self.available, self.limit)
+        if remaining is not None:
+            self.available = min(self.available, remaining)
+        if reset_after is not None and remaining is not None and remaining <= 0:
+            # Nothing left until the reset, make the bucket refill exactly at that time
+            self.available = min(self.available, -reset_after * self.limit / 60)
+
+
+class ModelBudget:
+    """The request and token budgets of one model, the provider rate limits them separately."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float) -> None:
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.blocked_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def wait_time(self, estimated_tokens: int, now: float) -> float:
+        """Seconds to wait until a request of `estimated_tokens` tokens fits in the budgets."""
+        return max(
+            self.blocked_until - now,
+            self.requests.wait_time(1, now),
+            self.tokens.wait_time(estimated_tokens, now),
+        )
+
+
+class LLMScheduler:
+    """Schedule LLM requests within requests-per-minute and tokens-per-minute budgets, per model.
+
+    Callers are served first come, first served: the caller at the head of the queue of a model waits for enough
+    budget while the others wait behind it, so a large request cannot be starved by a stream of small ones. The
+    budgets start from the configured limits and follow the `x-ratelimit-*` headers of every response, see
+    `observe_response`. Every HTTP request goes through `before_request`, the retries of the SDK and of instructor
+    included.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int) -> None:
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.budgets: dict[str, ModelBudget] = {}
+        self.waiting = 0
+
+    def budget(self, model: str) -> ModelBudget:
+        """Get the budgets of a model, starting from the configured limits."""
+        budget = self.budgets.get(model)
+        if budget is None:
+            budget = self.budgets[model] = ModelBudget(self.requests_per_minute, self.tokens_per_minute)
+
+        return budget
+
+    async def acquire(self, estimated_tokens: int, model: str = "") -> None:
+        """Wait until a request of `estimated_tokens` tokens to `model` fits in its budgets, then reserve it."""
+        budget = self.budget(model)
+        self.waiting += 1
+        try:
+            async with budget.lock:
+                while True:
+                    now = time.monotonic()
+                    delay = budget.wait_time(estimated_tokens, now)
+                    if delay <= 0:
+                        break
+                    logger.debug(f"LLM scheduler waiting {delay:.2f}s for {model}, {self.waiting} requests queued")
+                    await asyncio.sleep(delay)
+
+                budget.requests.consume(1, now)
+                budget.tokens.consume(estimated_tokens, now)
+        finally:
+            self.waiting -= 1
+
+    def observe(self, headers: Mapping[str, str], status_code: int, model: str = "") -> None:
+        """Update the budgets of a model from the rate limit headers of a response.
+
+        Parameters
+        ----------
+        headers: Mapping[str, str]
+            The response headers.
+        status_code: int
+            The response status code, on a 429 no request is sent to the model until the limit resets.
+        model: str
+            The model of the request.
+        """
+        budget = self.budget(model)
+        now = time.monotonic()
+        request_reset = parse_reset_duration(headers.get("x-ratelimit-reset-requests"))
+        token_reset = parse_reset_duration(headers.get("x-ratelimit-reset-tokens"))
+
+        budget.requests.sync(
+            limit=_to_float(headers.get("x-ratelimit-limit-requests")),
+            remaining=_to_float(headers.get("x-ratelimit-remaining-requests")),
+            reset_after=request_reset,
+            now=now,
+        )
+        budget.tokens.sync(
+            limit=_to_float(headers.get("x-ratelimit-limit-tokens")),
+            remaining=_to_float(headers.get("x-ratelimit-remaining-tokens")),
+            reset_after=token_reset,
+            now=now,
+        )
+
+        if status_code == 429:
+            retry_after = _to_float(headers.get("retry-after")) or max(request_reset or 0.0, token_reset or 0.0) or 1.0
+            budget.blocked_until = max(budget.blocked_until, now + retry_after)
+            logger.warning(f"LLM provider rate limit reached for {model}, pausing requests for {retry_after:.2f}s")
+
+    async def before_request(self, request: httpx.Request) -> None:
+        """Httpx request hook waiting for the budgets of the model of the request, see `acquire`."""
+        body = _request_body(request)
+        await self.acquire(
+            estimate_request_tokens(body.get("messages") or [], body.get("max_tokens")), str(body.get("model", ""))
+        )
+
+    async def observe_response(self, response: httpx.Response) -> None:
+        """Httpx response hook feeding `observe`."""
+        self.observe(response.headers, response.status_code, str(_request_body(response.request).get("model", "")))
+
+
+def _request_body(request: httpx.Request) -> dict[str, Any]:
+    try:
+        body = json.loads(request.content)
+    except (ValueError, httpx.RequestNotRead):
+        return {}
+
+    return body if isinstance(body, dict) else {}
+
+
+def _to_float(value: str | None) -> float | None:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
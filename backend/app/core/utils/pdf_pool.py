@@ -0,0 +1,164 @@
+import asyncio
+import contextlib
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, TypeVar
+
+from ..config import settings
+from ..logger import logging
+
+logger = logging.getLogger(__name__)
+
+executor: ProcessPoolExecutor | None = None
+semaphore: asyncio.Semaphore | None = None
+
+# Per process counters, exposed through the monitoring API
+metrics: dict[str, int | float] = {
+    "waiting": 0,
+    "running": 0,
+    "completed": 0,
+    "failed": 0,
+    "timed_out": 0,
+    "rejected": 0,
+    "total_seconds": 0.0,
+}
+
+ReturnType = TypeVar("ReturnType")
+
+
+class PDFPoolFullError(Exception):
+    """Exception raised when more PDF documents are waiting than `PDF_POOL_MAX_QUEUE`."""
+
+
+def create_executor() -> ProcessPoolExecutor:
+    """Create the process pool, with `PDF_POOL_WORKERS` children."""
+    # Spawned rather than forked, the children must not inherit the event loop and the open connections
+    return ProcessPoolExecutor(max_workers=settings.PDF_POOL_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _recycle_executor(pool: ProcessPoolExecutor) -> None:
+    """Replace a pool whose child is stuck on a document, killing its children.
+
+    A running child cannot be interrupted, and the pool does not tell which child runs which document, so all of
+    them are killed. The other documents of the pool fail with `BrokenProcessPool` and are retried on the new one.
+    """
+    global executor
+    if executor is not pool:
+        # Already replaced after another timeout
+        return
+
+    executor = create_executor()
+    # The children are only reachable through this private attribute
+    for process in list((pool._processes or {}).values()):
+        process.kill()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _release_slot(slots: asyncio.Semaphore, loop: asyncio.AbstractEventLoop) -> None:
+    # Called from a thread of the pool, the loop may already be closed at shutdown
+    with contextlib.suppress(RuntimeError):
+        loop.call_soon_threadsafe(slots.release)
+
+
+async def run_in_pool(func: Callable[..., ReturnType], *args: Any) -> ReturnType:
+    """Run a CPU-bound function in the PDF process pool, so that it does not block the event loop.
+
+    At most `PDF_POOL_WORKERS` documents are parsed at the same time, the others wait in line and each one is given
+    `PDF_POOL_TIMEOUT` seconds once it starts. A document running longer is abandoned and the pool is replaced, so
+    that stuck children do not hold the pool forever. Outside of the application lifespan or the worker the pool
+    does not exist and the function runs in the default thread pool instead.
+
+    Parameters
+    ----------
+    func: Callable[..., ReturnType]
+        A module level function, it is pickled to be sent to the pool.
+    *args: Any
+        The picklable arguments of the function.
+
+    Returns
+    -------
+    ReturnType
+        The result of the function.
+
+    Raises
+    ------
+    PDFPoolFullError
+        If `PDF_POOL_MAX_QUEUE` documents are already waiting.
+    TimeoutError
+        If the function runs for more than `PDF_POOL_TIMEOUT` seconds.
+    """
+    loop = asyncio.get_running_loop()
+    if executor is None or semaphore is None:
+        return await loop.run_in_executor(None, func, *args)
+
+    if metrics["waiting"] >= settings.PDF_POOL_MAX_QUEUE:
+        metrics["rejected"] += 1
+        raise PDFPoolFullError(f"{metrics['waiting']} PDF documents are already waiting for the pool")
+
+    slots = semaphore
+    while True:
+        metrics["waiting"] += 1
+        try:
+            await slots.acquire()
+        finally:
+            metrics["waiting"] -= 1
+
+        # The slot is held until the child is done with the document, not only until the caller stops waiting, so a
+        # document is only submitted when a child is free and its timeout starts when the child starts parsing it
+        pool = executor
+        try:
+            future = pool.submit(func, *args)
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: _release_slot(slots, loop))
+
+        metrics["running"] += 1
+        started_at = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout=settings.PDF_POOL_TIMEOUT)
+        except TimeoutError:
+            metrics["timed_out"] += 1
+            logger.error(f"PDF parsing timed out after {settings.PDF_POOL_TIMEOUT}s, replacing the PDF pool")
+            _recycle_executor(pool)
+            raise
+        except BrokenProcessPool:
+            if pool is not executor:
+                # Killed with a stuck document of the same pool, parse it again on the new one
+                continue
+            metrics["failed"] += 1
+            raise
+        except Exception:
+            metrics["failed"] += 1
+            raise
+        else:
+            metrics["completed"] += 1
+            return result
+        finally:
+            metrics["running"] -= 1
+            metrics["total_seconds"] += time.perf_counter() - started_at
+
+
+def get_stats() -> dict[str, int | float]:
+    """Get the queue depth and the counters of the PDF process pool.
+
+    Returns
+    -------
+    dict[str, int | float]
+        The `workers` of the pool, the documents `waiting` and `running`, the `completed`, `failed`, `timed_out` and
+        `rejected` counters and the `average_seconds` spent per document.
+    """
+    finished = metrics["completed"] + metrics["failed"] + metrics["timed_out"]
+    return {
+        "workers": settings.PDF_POOL_WORKERS if executor is not None else 0,
+        "waiting": metrics["waiting"],
+        "running": metrics["running"],
+        "completed": metrics["completed"],
+        "failed": metrics["failed"],
+        "timed_out": metrics["timed_out"],
+        "rejected": metrics["rejected"],
+        "average_seconds": metrics["total_seconds"] / finished if finished else 0.0,
+    }
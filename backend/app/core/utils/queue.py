@@ -1,3 +1,41 @@
+from typing import Any
+
 from arq.connections import ArqRedis
+from arq.constants import default_queue_name
+from arq.jobs import Job
 
 pool: ArqRedis | None = None
+
+# Each stage of the pipelines has its own queue, served by a worker whose `max_jobs` is the concurrency of the stage,
+# so the jobs of a busy stage wait in Redis rather than in a worker
+PDF_EXTRACTION_QUEUE = f"{default_queue_name}:pdf_extraction"
+LLM_EVALUATION_QUEUE = f"{default_queue_name}:llm_evaluation"
+SCORING_QUEUE = f"{default_queue_name}:scoring"
+
+TASK_QUEUES = {
+    "extract_resume_text_task": PDF_EXTRACTION_QUEUE,
+    "extract_job_description_text_task": PDF_EXTRACTION_QUEUE,
+    "evaluate_resume_task": LLM_EVALUATION_QUEUE,
+    "parse_job_description_task": LLM_EVALUATION_QUEUE,
+    "score_resume_task": SCORING_QUEUE,
+}
+
+
+async def enqueue_task(function: str, *args: Any) -> Job | None:
+    """Enqueue a task on the queue of its stage, or on the default queue if it is not part of a pipeline.
+
+    Parameters
+    ----------
+    function: str
+        The name of the task.
+    *args: Any
+        The arguments of the task.
+
+    Returns
+    -------
+    Job | None
+        The enqueued job, or None if a job with the same ID already exists.
+    """
+    return await pool.enqueue_job(  # type: ignore
+        function, *args, _queue_name=TASK_QUEUES.get(function, default_queue_name)
+    )
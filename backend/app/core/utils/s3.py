@@ -1,46 +1,204 @@
+import asyncio
+import hashlib
 import logging
-from typing import Any
+from typing import Any, BinaryIO
 
 import boto3
 import pendulum
+from botocore.config import Config
+from botocore.exceptions import ClientError
 from fastapi import UploadFile
 
 from ...core.config import settings
+from ..exceptions.cache_exceptions import MissingClientError
+from ..exceptions.storage_exceptions import FileTooLargeError
 
+# botocore clients are thread safe, the blocking calls run in threads sharing the connection pool of this client
+client: Any = None
 
-async def create_s3_client() -> Any:
+
+def create_s3_client() -> Any:
     """Create an s3 client."""
     logging.info("Creating S3 Client!")
     logging.info(f"Endpoint: {settings.S3_ENDPOINT_URL}")
-    logging.info(f"Access key id: {settings.AWS_ACCESS_KEY_ID}")
     return boto3.client(
         "s3",
         endpoint_url=settings.S3_ENDPOINT_URL if settings.ENVIRONMENT == "local" else None,
         aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
         aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        config=Config(max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS),
     )
 
 
-async def upload_s3_file(file: UploadFile, file_name: str, folder_path: str) -> str:
-    """Upload the s3 file."""
-    s3_client = await create_s3_client()
+def get_client() -> Any:
+    """Get the s3 client created at startup."""
+    if client is None:
+        raise MissingClientError
+
+    return client
+
+
+async def ensure_bucket() -> None:
+    """Create the bucket if it does not exist yet, called once at startup."""
+    s3_client = get_client()
     bucket_name = settings.S3_BUCKET_NAME
+    try:
+        await asyncio.to_thread(s3_client.head_bucket, Bucket=bucket_name)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") not in ("404", "NoSuchBucket"):
+            raise
+        logging.info(f"Creating S3 bucket {bucket_name}")
+        await asyncio.to_thread(s3_client.create_bucket, Bucket=bucket_name)
+
+
+def build_s3_url(folder_path: str, object_name: str) -> str:
+    """Build the URL stored for an uploaded object."""
+    bucket_name = settings.S3_BUCKET_NAME
+    if settings.ENVIRONMENT == "development":
+        return f"{settings.S3_ENDPOINT_URL}/{bucket_name}/{folder_path}/{object_name}"
+
+    return f"https://{bucket_name}.s3.amazonaws.com/{folder_path}/{object_name}"
 
-    if len([x for x in s3_client.list_buckets()["Buckets"] if x["Name"] == bucket_name]) == 0:
-        s3_client.create_bucket(Bucket=bucket_name)
 
-    file_contents = await file.read()
+async def hash_upload_file(file: UploadFile, max_size: int | None = None) -> str:
+    """Compute the SHA-256 of an uploaded file, reading its spool in chunks and rewinding it afterwards.
+
+    :param file: The uploaded file.
+    :type file: UploadFile
+    :param max_size: The maximum size in bytes, checked as the file is read.
+    :type max_size: int | None
+    :raises FileTooLargeError: If the file is larger than `max_size`.
+    :return: The hex digest of the content.
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    total_size = 0
+    while chunk := await file.read(settings.S3_MULTIPART_CHUNK_SIZE):
+        total_size += len(chunk)
+        if max_size is not None and total_size > max_size:
+            raise FileTooLargeError
+        digest.update(chunk)
+
+    await file.seek(0)
+    return digest.hexdigest()
+
+
+def make_object_name(file_name: str) -> str:
+    """Build the name of a new object, prefixed with the upload time."""
     current_time = pendulum.now().to_iso8601_string()
-    object_name = f"{current_time}_{file_name}"
+    return f"{current_time}_{file_name}"
+
+
+async def upload_s3_file(file: UploadFile, file_name: str, folder_path: str, max_size: int | None = None) -> str:
+    """Upload the s3 file.
+
+    The file is streamed from its spool in chunks of `S3_MULTIPART_CHUNK_SIZE` bytes, so at most one chunk per upload
+    is held in memory. A file smaller than a chunk is sent with one PUT, larger ones as a multipart upload.
+
+    :param file: The uploaded file.
+    :type file: UploadFile
+    :param file_name: The name of the object, prefixed with the upload time.
+    :type file_name: str
+    :param folder_path: The folder of the object in the returned URL.
+    :type folder_path: str
+    :param max_size: The maximum size in bytes, checked as the file is read.
+    :type max_size: int | None
+    :raises FileTooLargeError: If the file is larger than `max_size`, nothing is left in the bucket.
+    :return: The URL of the object.
+    :rtype: str
+    """
+    s3_client = get_client()
+    bucket_name = settings.S3_BUCKET_NAME
+    chunk_size = settings.S3_MULTIPART_CHUNK_SIZE
+
+    if max_size is not None and file.size is not None and file.size > max_size:
+        raise FileTooLargeError
+
+    object_name = make_object_name(file_name)
+
+    chunk = await file.read(chunk_size)
+    total_size = len(chunk)
+    if max_size is not None and total_size > max_size:
+        raise FileTooLargeError
+
+    if len(chunk) < chunk_size:
+        await asyncio.to_thread(s3_client.put_object, Body=chunk, Bucket=bucket_name, Key=object_name)
+        return build_s3_url(folder_path, object_name)
+
+    multipart_upload = await asyncio.to_thread(s3_client.create_multipart_upload, Bucket=bucket_name, Key=object_name)
+    upload_id = multipart_upload["UploadId"]
+    parts: list[dict[str, Any]] = []
+    try:
+        while chunk:
+            part_number = len(parts) + 1
+            part = await asyncio.to_thread(
+                s3_client.upload_part,
+                Body=chunk,
+                Bucket=bucket_name,
+                Key=object_name,
+                PartNumber=part_number,
+                UploadId=upload_id,
+            )
+            parts.append({"ETag": part["ETag"], "PartNumber": part_number})
+
+            chunk = await file.read(chunk_size)
+            total_size += len(chunk)
+            if max_size is not None and total_size > max_size:
+                raise FileTooLargeError
+
+        await asyncio.to_thread(
+            s3_client.complete_multipart_upload,
+            Bucket=bucket_name,
+            Key=object_name,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+    except Exception:
+        await asyncio.to_thread(
+            s3_client.abort_multipart_upload, Bucket=bucket_name, Key=object_name, UploadId=upload_id
+        )
+        raise
+
+    return build_s3_url(folder_path, object_name)
 
-    s3_client.put_object(
-        Body=file_contents,
-        Bucket=bucket_name,
+
+async def download_s3_file(s3_url: str, file: BinaryIO) -> None:
+    """Stream an uploaded object, from the URL built by `build_s3_url`, into a file."""
+    s3_client = get_client()
+    object_name = str(s3_url).split("/")[-1]
+
+    await asyncio.to_thread(s3_client.download_fileobj, settings.S3_BUCKET_NAME, object_name, file)
+
+
+def create_presigned_post(object_name: str, max_size: int) -> dict[str, Any]:
+    """Create a presigned POST letting a client upload a PDF straight to the bucket.
+
+    :param object_name: The name of the object to create.
+    :type object_name: str
+    :param max_size: The maximum size in bytes, enforced by S3 through a `content-length-range` condition.
+    :type max_size: int
+    :return: The `url` to post the form to and the form `fields` to send along with the file.
+    :rtype: dict[str, Any]
+    """
+    presigned_post: dict[str, Any] = get_client().generate_presigned_post(
+        Bucket=settings.S3_BUCKET_NAME,
         Key=object_name,
+        Fields={"Content-Type": "application/pdf"},
+        Conditions=[{"Content-Type": "application/pdf"}, ["content-length-range", 1, max_size]],
+        ExpiresIn=settings.S3_PRESIGNED_EXPIRE_SECONDS,
     )
-    if settings.ENVIRONMENT == "development":
-        s3_url = f"{settings.S3_ENDPOINT_URL}/{bucket_name}/{folder_path}/{object_name}"
-    else:
-        s3_url = f"https://{bucket_name}.s3.amazonaws.com/{folder_path}/{object_name}"
+    return presigned_post
+
+
+async def head_s3_object(object_name: str) -> dict[str, Any] | None:
+    """Get the metadata of an object, or None if it does not exist."""
+    try:
+        head: dict[str, Any] = await asyncio.to_thread(
+            get_client().head_object, Bucket=settings.S3_BUCKET_NAME, Key=object_name
+        )
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+            return None
+        raise
 
-    return s3_url
+    return head
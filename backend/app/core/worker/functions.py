@@ -1,9 +1,37 @@
 import asyncio
 import logging
 
+import redis.asyncio as redis
 import uvloop
 from arq.worker import Worker
 
+from ...crud.crud_job_description import crud_job_description
+from ...crud.crud_parsed_job_description import crud_parsed_job_description
+from ...crud.crud_parsed_resume import crud_parsed_resume
+from ...crud.crud_resume import crud_resume
+from ...crud.crud_scores import crud_scores
+from ...schemas.job_description import JobDescriptionRead, JobDescriptionUpdate
+from ...schemas.parsed_job_description import ParsedJobDescriptionCreateInternal, ParsedJobDescriptionRead
+from ...schemas.parsed_resume import ParsedResumeCreateInternal, ParsedResumeRead
+from ...schemas.resume import ResumeRead, ResumeUpdate
+from ...schemas.score import ScoreCreateInternal
+from ...services.job_description.workflow import extract_job_description_skills, extract_job_description_text
+from ...services.resume.workflow import evaluate_resume, extract_resume_text
+from ...services.scorer.calculation import score_calculation
+from ...services.scorer.counts import count_skill_matches
+from ..config import settings
+from ..db.database import local_session
+from ..setup import (
+    close_llm_clients,
+    close_pdf_pool,
+    close_s3_client,
+    create_llm_clients,
+    create_pdf_pool,
+    create_s3_client,
+)
+from ..utils import kv, leaderboard, llm_cache, queue
+from ..utils.kv import set_key_value
+
 asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
@@ -15,10 +43,182 @@ async def sample_background_task(ctx: Worker, name: str) -> str:
     return f"Task {name} is complete!"
 
 
+# -------- resume pipeline --------
+async def extract_resume_text_task(ctx: Worker, resume_id: int) -> None:
+    """Extract the text of an uploaded resume PDF, then enqueue its evaluation."""
+    async with local_session() as db:
+        resume: ResumeRead | None = await crud_resume.get(
+            db=db, schema_to_select=ResumeRead, return_as_model=True, id=resume_id, is_deleted=False
+        )
+        if resume is None:
+            logging.warning(f"Resume {resume_id} not found, skipping text extraction")
+            return
+
+        status_key = f"job:{resume.job_id}:{resume.id}:extract_status"
+        await set_key_value(key=status_key, value=settings.STATUS_PROCESSING)
+        try:
+            text = await extract_resume_text(resume=resume)
+            if text is not None:
+                await crud_resume.update(db=db, object=ResumeUpdate(text=text), id=resume.id)
+        except (Exception, asyncio.CancelledError):
+            # Failed or timed out, the resume must not stay in processing
+            await set_key_value(key=status_key, value=settings.STATUS_ERROR)
+            raise
+
+        if text is None:
+            await set_key_value(key=status_key, value=settings.STATUS_ERROR)
+            return
+
+        await set_key_value(key=status_key, value=settings.STATUS_SUCCESS)
+
+    await queue.enqueue_task("evaluate_resume_task", resume_id)
+
+
+async def evaluate_resume_task(ctx: Worker, resume_id: int) -> None:
+    """Evaluate a resume against the skills of its job description, then enqueue the scoring."""
+    async with local_session() as db:
+        resume: ResumeRead | None = await crud_resume.get(
+            db=db, schema_to_select=ResumeRead, return_as_model=True, id=resume_id, is_deleted=False
+        )
+        if resume is None:
+            logging.warning(f"Resume {resume_id} not found, skipping evaluation")
+            return
+
+        parsed_job_description: ParsedJobDescriptionRead | None = await crud_parsed_job_description.get(
+            db=db,
+            schema_to_select=ParsedJobDescriptionRead,
+            return_as_model=True,
+            job_description_id=resume.job_id,
+            is_deleted=False,
+        )
+        if parsed_job_description is None:
+            raise ValueError("Parsed job description for resume not found.")
+
+        result = await evaluate_resume(resume=resume, parsed_job_description=parsed_job_description)
+        parsed_skills = result.model_dump()
+        created_parsed_resume = await crud_parsed_resume.create(
+            db=db,
+            object=ParsedResumeCreateInternal(
+                job_description_id=resume.job_id,
+                resume_id=resume.id,
+                parsed_skills=parsed_skills,
+                created_by_user_id=resume.created_by_user_id,
+                **count_skill_matches(parsed_skills),
+            ),
+        )
+
+    await queue.enqueue_task(
+        "score_resume_task", created_parsed_resume.id, parsed_job_description.id, resume.created_by_user_id
+    )
+
+
+async def score_resume_task(
+    ctx: Worker, parsed_resume_id: int, parsed_job_description_id: int, created_by_user_id: int
+) -> None:
+    """Compute and store the score of an evaluated resume."""
+    async with local_session() as db:
+        parsed_resume: ParsedResumeRead | None = await crud_parsed_resume.get(
+            db=db, schema_to_select=ParsedResumeRead, return_as_model=True, id=parsed_resume_id
+        )
+        if parsed_resume is None:
+            logging.warning(f"Parsed resume {parsed_resume_id} not found, skipping scoring")
+            return
+
+        score = await score_calculation(parsed_resume)
+        await crud_scores.create(
+            db=db,
+            object=ScoreCreateInternal(
+                resume_id=parsed_resume.resume_id,
+                job_id=parsed_resume.job_description_id,
+                parsed_job_id=parsed_job_description_id,
+                score=score,
+                created_by_user_id=created_by_user_id,
+            ),
+        )
+
+        # A resume deleted while it was being processed must not show up in the leaderboard
+        if await crud_resume.exists(db=db, id=parsed_resume.resume_id, is_deleted=False):
+            await leaderboard.add_score(
+                job_id=parsed_resume.job_description_id, resume_id=parsed_resume.resume_id, score=score
+            )
+
+
+# -------- job description pipeline --------
+async def extract_job_description_text_task(ctx: Worker, job_description_id: int) -> None:
+    """Extract the text of an uploaded job description PDF, then enqueue its skills parsing."""
+    async with local_session() as db:
+        job_description: JobDescriptionRead | None = await crud_job_description.get(
+            db=db, schema_to_select=JobDescriptionRead, return_as_model=True, id=job_description_id, is_deleted=False
+        )
+        if job_description is None:
+            logging.warning(f"Job description {job_description_id} not found, skipping text extraction")
+            return
+
+        logging.info(f"Extracting text from PDF {job_description.s3_url}")
+        status_key = f"job:{job_description.id}:extract_status"
+        try:
+            text = await extract_job_description_text(job_description=job_description)
+        except (Exception, asyncio.CancelledError):
+            await set_key_value(key=status_key, value=settings.STATUS_ERROR)
+            raise
+
+        if text is None:
+            await set_key_value(key=status_key, value=settings.STATUS_ERROR)
+            return
+
+        await crud_job_description.update(db=db, object=JobDescriptionUpdate(description=text), id=job_description.id)
+
+    await queue.enqueue_task("parse_job_description_task", job_description_id)
+
+
+async def parse_job_description_task(ctx: Worker, job_description_id: int) -> None:
+    """Extract the skills of a job description and store them as a parsed job description."""
+    async with local_session() as db:
+        job_description: JobDescriptionRead | None = await crud_job_description.get(
+            db=db, schema_to_select=JobDescriptionRead, return_as_model=True, id=job_description_id, is_deleted=False
+        )
+        if job_description is None:
+            logging.warning(f"Job description {job_description_id} not found, skipping skills parsing")
+            return
+
+        logging.info(f"Processing job description with id {job_description.id}")
+        try:
+            job_skills = await extract_job_description_skills(job_description)
+        except (Exception, asyncio.CancelledError):
+            await set_key_value(key=f"job:{job_description.id}:extract_status", value=settings.STATUS_ERROR)
+            raise
+        parsed_job_description = await crud_parsed_job_description.create(
+            db=db,
+            object=ParsedJobDescriptionCreateInternal(
+                job_description_id=job_description.id,
+                parsed_skills=job_skills.model_dump(),
+                created_by_user_id=job_description.created_by_user_id,
+            ),
+        )
+        logging.info(f"Saved parsed job description with id {parsed_job_description.id}")
+
+
 # -------- base functions --------
 async def startup(ctx: Worker) -> None:
+    # The pipeline tasks chain into each other through the same pool the API enqueues with
+    queue.pool = ctx["redis"]
+    kv.pool = redis.ConnectionPool.from_url(settings.REDIS_CACHE_URL)
+    kv.client = redis.Redis.from_pool(kv.pool)  # type: ignore
+    llm_cache.pool = redis.ConnectionPool.from_url(settings.REDIS_CACHE_URL)
+    llm_cache.client = redis.Redis.from_pool(llm_cache.pool)  # type: ignore
+    leaderboard.pool = redis.ConnectionPool.from_url(settings.REDIS_CACHE_URL)
+    leaderboard.client = redis.Redis.from_pool(leaderboard.pool)  # type: ignore
+    await create_llm_clients()
+    await create_pdf_pool()
+    await create_s3_client()
     logging.info("Worker Started")
 
 
 async def shutdown(ctx: Worker) -> None:
+    await kv.client.aclose()  # type: ignore
+    await llm_cache.client.aclose()  # type: ignore
+    await leaderboard.client.aclose()  # type: ignore
+    await close_llm_clients()
+    await close_pdf_pool()
+    await close_s3_client()
     logging.info("Worker end")
@@ -1,7 +1,17 @@
 from arq.connections import RedisSettings
 
 from ...core.config import settings
-from .functions import sample_background_task, shutdown, startup
+from ..utils import queue
+from .functions import (
+    evaluate_resume_task,
+    extract_job_description_text_task,
+    extract_resume_text_task,
+    parse_job_description_task,
+    sample_background_task,
+    score_resume_task,
+    shutdown,
+    startup,
+)
 
 REDIS_QUEUE_HOST = settings.REDIS_QUEUE_HOST
 REDIS_QUEUE_PORT = settings.REDIS_QUEUE_PORT
@@ -10,6 +20,43 @@ REDIS_QUEUE_PORT = settings.REDIS_QUEUE_PORT
 class WorkerSettings:
     functions = [sample_background_task]
     redis_settings = RedisSettings(host=REDIS_QUEUE_HOST, port=REDIS_QUEUE_PORT)
+    max_jobs = settings.WORKER_MAX_JOBS
+    job_timeout = settings.WORKER_JOB_TIMEOUT
+    on_startup = startup
+    on_shutdown = shutdown
+    handle_signals = False
+
+
+# One worker per stage of the pipelines, its `max_jobs` caps the concurrency of the stage. arq does not inherit the
+# settings of a parent class, so each class lists them all.
+class PdfExtractionWorkerSettings:
+    functions = [extract_resume_text_task, extract_job_description_text_task]
+    queue_name = queue.PDF_EXTRACTION_QUEUE
+    redis_settings = RedisSettings(host=REDIS_QUEUE_HOST, port=REDIS_QUEUE_PORT)
+    max_jobs = settings.WORKER_PDF_EXTRACTION_CONCURRENCY
+    job_timeout = settings.WORKER_JOB_TIMEOUT
+    on_startup = startup
+    on_shutdown = shutdown
+    handle_signals = False
+
+
+class LLMEvaluationWorkerSettings:
+    functions = [evaluate_resume_task, parse_job_description_task]
+    queue_name = queue.LLM_EVALUATION_QUEUE
+    redis_settings = RedisSettings(host=REDIS_QUEUE_HOST, port=REDIS_QUEUE_PORT)
+    max_jobs = settings.WORKER_LLM_EVALUATION_CONCURRENCY
+    job_timeout = settings.WORKER_JOB_TIMEOUT
+    on_startup = startup
+    on_shutdown = shutdown
+    handle_signals = False
+
+
+class ScoringWorkerSettings:
+    functions = [score_resume_task]
+    queue_name = queue.SCORING_QUEUE
+    redis_settings = RedisSettings(host=REDIS_QUEUE_HOST, port=REDIS_QUEUE_PORT)
+    max_jobs = settings.WORKER_SCORING_CONCURRENCY
+    job_timeout = settings.WORKER_JOB_TIMEOUT
     on_startup = startup
     on_shutdown = shutdown
     handle_signals = False
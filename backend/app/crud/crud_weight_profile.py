@@ -0,0 +1,14 @@
+from fastcrud import FastCRUD
+
+from ..models.weight_profile import WeightProfile
+from ..schemas.weight_profile import (
+    WeightProfileCreateInternal,
+    WeightProfileDelete,
+    WeightProfileUpdate,
+    WeightProfileUpdateInternal,
+)
+
+CRUDWeightProfile = FastCRUD[
+    WeightProfile, WeightProfileCreateInternal, WeightProfileDelete, WeightProfileUpdate, WeightProfileUpdateInternal
+]
+crud_weight_profile = CRUDWeightProfile(WeightProfile)
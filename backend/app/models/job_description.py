@@ -1,7 +1,7 @@
 import uuid as uuid_pkg
 from datetime import UTC, datetime
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DateTime, ForeignKey, Index, String, desc
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..core.db.database import Base
@@ -9,6 +9,17 @@ from ..core.db.database import Base
 
 class JobDescription(Base):
     __tablename__ = "job_descriptions"
+    __table_args__ = (
+        Index("ix_job_descriptions_created_by_user_id_content_hash", "created_by_user_id", "content_hash"),
+        # Serves the keyset pagination of the list endpoint, the newest first
+        Index(
+            "ix_job_descriptions_created_by_user_id_created_at",
+            "created_by_user_id",
+            "is_deleted",
+            desc("created_at"),
+            desc("id"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column("id", autoincrement=True, nullable=False, unique=True, primary_key=True, init=False)
     created_by_user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), index=True)
@@ -16,6 +27,8 @@ class JobDescription(Base):
     description: Mapped[str | None] = mapped_column(String(63206), nullable=True)
     s3_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
     uuid: Mapped[uuid_pkg.UUID] = mapped_column(default_factory=uuid_pkg.uuid4, primary_key=True, unique=True)
+    # SHA-256 of the uploaded PDF, identical uploads of a user share the S3 object and the extracted text
+    content_hash: Mapped[str | None] = mapped_column(String(64), default=None)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default_factory=lambda: datetime.now(UTC))
     updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None)
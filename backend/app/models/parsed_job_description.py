@@ -12,7 +12,7 @@ class ParsedJobDescription(Base):
 
     __tablename__ = "parsed_job_descriptions"
 
-    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, init=False)
     created_by_user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), index=True)
     job_description_id: Mapped[int] = mapped_column(
         Integer,
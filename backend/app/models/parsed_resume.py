@@ -1,7 +1,7 @@
 import uuid as uuid_pkg
 from datetime import UTC, datetime
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql.sqltypes import DateTime, Integer
@@ -13,6 +13,15 @@ class ParsedResume(Base):
     """Model for the match between the Job description and the CV."""
 
     __tablename__ = "parsed_resumes"
+    __table_args__ = (
+        # Serves the `parsed_skills @> ...` containment of the skill filters
+        Index(
+            "ix_parsed_resumes_parsed_skills",
+            "parsed_skills",
+            postgresql_using="gin",
+            postgresql_ops={"parsed_skills": "jsonb_path_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column("id", autoincrement=True, nullable=False, unique=True, primary_key=True, init=False)
     created_by_user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), index=True)
@@ -20,6 +29,7 @@ class ParsedResume(Base):
         Integer,
         ForeignKey("job_descriptions.id"),
         nullable=False,
+        index=True,
     )
     resume_id: Mapped[int] = mapped_column(
         Integer,
@@ -27,6 +37,23 @@ class ParsedResume(Base):
         nullable=False,
     )
     parsed_skills: Mapped[JSONB] = mapped_column(JSONB, nullable=False)
+    # Match counters of `parsed_skills` by skill group, see `services.scorer.counts`
+    required_hard_yes: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    required_hard_partial: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    required_hard_no: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    required_hard_total: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    required_soft_yes: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    required_soft_partial: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    required_soft_no: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    required_soft_total: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    nice_to_have_hard_yes: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    nice_to_have_hard_partial: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    nice_to_have_hard_no: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    nice_to_have_hard_total: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    nice_to_have_soft_yes: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    nice_to_have_soft_partial: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    nice_to_have_soft_no: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    nice_to_have_soft_total: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     uuid: Mapped[uuid_pkg.UUID] = mapped_column(default_factory=uuid_pkg.uuid4, primary_key=True, unique=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default_factory=lambda: datetime.now(UTC))
@@ -1,17 +1,37 @@
 import uuid as uuid_pkg
 from datetime import UTC, datetime
+from typing import Any
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import Computed, ForeignKey, Index, desc
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql.sqltypes import DateTime, Integer, String
 
 from ..core.db.database import Base
 
+TEXT_SEARCH_CONFIGURATIONS = ("english", "dutch")
+TEXT_SEARCH_DOCUMENT = " || ".join(
+    f"to_tsvector('{configuration}'::regconfig, coalesce(text, ''))" for configuration in TEXT_SEARCH_CONFIGURATIONS
+)
+
 
 class Resume(Base):
     """Model for Resumes."""
 
     __tablename__ = "resumes"
+    __table_args__ = (
+        Index("ix_resumes_created_by_user_id_content_hash", "created_by_user_id", "content_hash"),
+        Index("ix_resumes_text_search", "text_search", postgresql_using="gin"),
+        # Serves the keyset pagination of the list endpoint, the newest first
+        Index(
+            "ix_resumes_created_by_user_id_job_id_created_at",
+            "created_by_user_id",
+            "job_id",
+            "is_deleted",
+            desc("created_at"),
+            desc("id"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column("id", autoincrement=True, nullable=False, unique=True, primary_key=True, init=False)
     created_by_user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), index=True)
@@ -19,10 +39,14 @@ class Resume(Base):
         String(length=2000),
         nullable=False,
     )
-    job_id: Mapped[int] = mapped_column(Integer, ForeignKey("job_descriptions.id"), nullable=False)
+    job_id: Mapped[int] = mapped_column(Integer, ForeignKey("job_descriptions.id"), nullable=False, index=True)
     text: Mapped[str] = mapped_column(String(63206), nullable=True)
     s3_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    # Maintained by Postgres on every change of the text, stemmed with both configurations as CVs mix the languages
+    text_search: Mapped[Any] = mapped_column(TSVECTOR, Computed(TEXT_SEARCH_DOCUMENT, persisted=True), init=False)
     uuid: Mapped[uuid_pkg.UUID] = mapped_column(default_factory=uuid_pkg.uuid4, primary_key=True, unique=True)
+    # SHA-256 of the uploaded PDF, identical uploads of a user share the S3 object and the extracted text
+    content_hash: Mapped[str | None] = mapped_column(String(64), default=None)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default_factory=lambda: datetime.now(UTC))
     updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None)
@@ -1,7 +1,7 @@
 import uuid as uuid_pkg
 from datetime import UTC, datetime
 
-from sqlalchemy import DateTime, Float, ForeignKey, String
+from sqlalchemy import DateTime, Float, ForeignKey, Index, desc
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..core.db.database import Base
@@ -11,21 +11,23 @@ class Score(Base):
     """Model for Scores."""
 
     __tablename__ = "scores"
+    __table_args__ = (
+        # Serves the ranking of a job with an index-only scan, `id` makes the order of equal scores stable
+        Index(
+            "ix_scores_job_id_is_deleted_score",
+            "job_id",
+            "is_deleted",
+            desc("score"),
+            desc("id"),
+            postgresql_include=["resume_id"],
+        ),
+    )
 
-    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, init=False)
     score: Mapped[float] = mapped_column(Float, nullable=False)
-    resume_id: Mapped[int] = mapped_column(
-        String(length=100),
-        nullable=False,
-    )
-    job_id: Mapped[int] = mapped_column(
-        String(length=100),
-        nullable=False,
-    )
-    parsed_job_id: Mapped[int] = mapped_column(
-        String(length=100),
-        nullable=False,
-    )
+    resume_id: Mapped[int] = mapped_column(ForeignKey("resumes.id"), nullable=False, index=True)
+    job_id: Mapped[int] = mapped_column(ForeignKey("job_descriptions.id"), nullable=False)
+    parsed_job_id: Mapped[int] = mapped_column(ForeignKey("parsed_job_descriptions.id"), nullable=False)
     created_by_user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), index=True)
     uuid: Mapped[uuid_pkg.UUID] = mapped_column(default_factory=uuid_pkg.uuid4, primary_key=True, unique=True)
 
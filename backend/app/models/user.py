@@ -1,7 +1,7 @@
 import uuid as uuid_pkg
 from datetime import UTC, datetime
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DateTime, ForeignKey, Index, String, desc
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..core.db.database import Base
@@ -9,6 +9,10 @@ from ..core.db.database import Base
 
 class User(Base):
     __tablename__ = "user"
+    __table_args__ = (
+        # Serves the keyset pagination of the list endpoint, the newest first
+        Index("ix_user_is_deleted_created_at", "is_deleted", desc("created_at"), desc("id")),
+    )
 
     id: Mapped[int] = mapped_column("id", autoincrement=True, nullable=False, unique=True, primary_key=True, init=False)
 
@@ -0,0 +1,32 @@
+import uuid as uuid_pkg
+from datetime import UTC, datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..core.db.database import Base
+
+
+class WeightProfile(Base):
+    """Model for the score weights of a user, optionally restricted to one job description.
+
+    A weight left to None keeps the configured value of `ScoreSettings`.
+    """
+
+    __tablename__ = "weight_profiles"
+
+    id: Mapped[int] = mapped_column("id", autoincrement=True, nullable=False, unique=True, primary_key=True, init=False)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    created_by_user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), index=True)
+    job_id: Mapped[int | None] = mapped_column(ForeignKey("job_descriptions.id"), index=True, default=None)
+    yes_match_weight: Mapped[float | None] = mapped_column(Float, default=None)
+    partial_match_weight: Mapped[float | None] = mapped_column(Float, default=None)
+    no_match_weight: Mapped[float | None] = mapped_column(Float, default=None)
+    required_skills_weight: Mapped[float | None] = mapped_column(Float, default=None)
+    nice_to_have_skills_weight: Mapped[float | None] = mapped_column(Float, default=None)
+    uuid: Mapped[uuid_pkg.UUID] = mapped_column(default_factory=uuid_pkg.uuid4, primary_key=True, unique=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default_factory=lambda: datetime.now(UTC))
+    updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None)
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None)
+    is_deleted: Mapped[bool] = mapped_column(default=False, index=True)
@@ -43,8 +43,20 @@ class JobDescriptionCreate(JobDescriptionBase):
     model_config = ConfigDict(extra="forbid")
 
 
-class JobDescriptionCreateInternal(JobDescriptionCreate):
+class JobDescriptionCreateInternal(JobDescriptionBase):
+    s3_url: Annotated[
+        str | None,
+        Field(pattern=r"^(https?|ftp)://[^\s/$.?#].[^\s]*$", examples=["s3.exampleurl.com"], default=None),
+    ]
     created_by_user_id: int
+    content_hash: Annotated[str | None, Field(min_length=64, max_length=64, default=None)]
+
+
+class JobDescriptionUploadComplete(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    title: Annotated[str, Field(min_length=1, max_length=2000, examples=["This is my job description title"])]
+    upload_token: str
 
 
 class JobDescriptionUpdate(BaseModel):
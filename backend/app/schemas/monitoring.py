@@ -3,3 +3,34 @@ from pydantic import BaseModel
 
 class CPUCount(BaseModel):
     cpus: int
+
+
+class LLMCacheStats(BaseModel):
+    hits: int
+    misses: int
+    entries: int
+    hit_ratio: float
+
+
+class PDFPoolStats(BaseModel):
+    workers: int
+    waiting: int
+    running: int
+    completed: int
+    failed: int
+    timed_out: int
+    rejected: int
+    average_seconds: float
+
+
+class CacheStats(BaseModel):
+    inflight: int
+    coalesced: int
+    lock_acquired: int
+    lock_waits: int
+    lock_wait_hits: int
+    lock_wait_timeouts: int
+    refreshing: int
+    stale_served: int
+    refreshes: int
+    refresh_failures: int
@@ -24,12 +24,52 @@ class ParsedResumeRead(BaseModel):
     created_at: datetime
 
 
+class ParsedResumeStatsRead(BaseModel):
+    job_description_id: int
+    parsed_resumes: int
+    average_score: float
+    min_score: float
+    max_score: float
+    required_hard_yes: int
+    required_hard_partial: int
+    required_hard_no: int
+    required_hard_total: int
+    required_soft_yes: int
+    required_soft_partial: int
+    required_soft_no: int
+    required_soft_total: int
+    nice_to_have_hard_yes: int
+    nice_to_have_hard_partial: int
+    nice_to_have_hard_no: int
+    nice_to_have_hard_total: int
+    nice_to_have_soft_yes: int
+    nice_to_have_soft_partial: int
+    nice_to_have_soft_no: int
+    nice_to_have_soft_total: int
+
+
 class ParsedResumeCreate(ParsedResumeBase):
     model_config = ConfigDict(extra="forbid")
 
 
 class ParsedResumeCreateInternal(ParsedResumeCreate):
     created_by_user_id: int
+    required_hard_yes: int = 0
+    required_hard_partial: int = 0
+    required_hard_no: int = 0
+    required_hard_total: int = 0
+    required_soft_yes: int = 0
+    required_soft_partial: int = 0
+    required_soft_no: int = 0
+    required_soft_total: int = 0
+    nice_to_have_hard_yes: int = 0
+    nice_to_have_hard_partial: int = 0
+    nice_to_have_hard_no: int = 0
+    nice_to_have_hard_total: int = 0
+    nice_to_have_soft_yes: int = 0
+    nice_to_have_soft_partial: int = 0
+    nice_to_have_soft_no: int = 0
+    nice_to_have_soft_total: int = 0
 
 
 class ParsedResumeUpdate(BaseModel):
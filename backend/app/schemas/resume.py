@@ -40,13 +40,30 @@ class ResumeRead(BaseModel):
     created_at: datetime
 
 
+class ResumeSearchRead(BaseModel):
+    id: int
+    name: Annotated[str, Field(min_length=1, max_length=2000, examples=["John Doe Resume"])]
+    job_id: int
+    created_at: datetime
+    rank: Annotated[float, Field(examples=[0.4])]
+
+
 class ResumeCreate(ResumeBase):
     pdf_file: UploadFile | None
     model_config = ConfigDict(extra="forbid")
 
 
-class ResumeCreateInternal(ResumeCreate):
+class ResumeCreateInternal(ResumeBase):
     created_by_user_id: int
+    content_hash: Annotated[str | None, Field(min_length=64, max_length=64, default=None)]
+
+
+class ResumeUploadComplete(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    name: Annotated[str, Field(min_length=1, max_length=2000, examples=["John Doe Resume"])]
+    job_id: int
+    upload_token: str
 
 
 class ResumeUpdate(BaseModel):
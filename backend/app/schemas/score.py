@@ -7,10 +7,10 @@ from ..core.schemas import PersistentDeletion, TimestampSchema, UUIDSchema
 
 
 class ScoreBase(BaseModel):
-    score: Annotated[float, Field(min_length=1, max_length=10, examples=[95.00])]
-    resume_id: Annotated[int | None, Field(min_length=1, max_length=100, examples=[1], default=None)]
-    job_id: Annotated[int | None, Field(min_length=1, max_length=100, examples=[1], default=None)]
-    parsed_job_id: Annotated[int | None, Field(min_length=1, max_length=100, examples=[1], default=None)]
+    score: Annotated[float, Field(examples=[95.00])]
+    resume_id: Annotated[int | None, Field(examples=[1], default=None)]
+    job_id: Annotated[int | None, Field(examples=[1], default=None)]
+    parsed_job_id: Annotated[int | None, Field(examples=[1], default=None)]
 
 
 class Score(TimestampSchema, ScoreBase, UUIDSchema, PersistentDeletion):
@@ -23,6 +23,18 @@ class ScoreRead(BaseModel):
     created_at: datetime
 
 
+class ScoreRankingRead(BaseModel):
+    id: int
+    resume_id: int
+    score: float
+
+
+class LeaderboardEntryRead(BaseModel):
+    resume_id: int
+    score: float
+    rank: Annotated[int, Field(examples=[1])]
+
+
 class ScoreCreate(ScoreBase):
     model_config = ConfigDict(extra="forbid")
 
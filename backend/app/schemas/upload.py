@@ -0,0 +1,10 @@
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+
+class PresignedUploadRead(BaseModel):
+    url: Annotated[str, Field(examples=["https://tc-staging-documents.s3.amazonaws.com/"])]
+    fields: Annotated[dict[str, str], Field(examples=[{"key": "2024-01-01T00:00:00+00:00_resume.pdf"}])]
+    upload_token: str
+    expires_in: Annotated[int, Field(examples=[900])]
@@ -0,0 +1,58 @@
+from datetime import datetime
+from typing import Annotated
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from ..core.schemas import PersistentDeletion, TimestampSchema, UUIDSchema
+
+Weight = Annotated[float | None, Field(ge=0, examples=[1.0], default=None)]
+
+
+class ScoreWeights(BaseModel):
+    """The score weights, None keeps the configured value."""
+
+    yes_match_weight: Weight
+    partial_match_weight: Weight
+    no_match_weight: Weight
+    required_skills_weight: Weight
+    nice_to_have_skills_weight: Weight
+
+
+class WeightProfileBase(ScoreWeights):
+    name: Annotated[str, Field(min_length=1, max_length=100, examples=["Required skills count triple"])]
+    job_id: Annotated[int | None, Field(examples=[1], default=None)]
+
+
+class WeightProfile(TimestampSchema, WeightProfileBase, UUIDSchema, PersistentDeletion):
+    pass
+
+
+class WeightProfileRead(WeightProfileBase):
+    id: int
+    created_by_user_id: int
+    created_at: datetime
+
+
+class WeightProfileCreate(WeightProfileBase):
+    model_config = ConfigDict(extra="forbid")
+
+
+class WeightProfileCreateInternal(WeightProfileCreate):
+    created_by_user_id: int
+
+
+class WeightProfileUpdate(ScoreWeights):
+    model_config = ConfigDict(extra="forbid")
+
+    name: Annotated[str | None, Field(min_length=1, max_length=100, examples=["Soft skills first"], default=None)]
+
+
+class WeightProfileUpdateInternal(WeightProfileUpdate):
+    updated_at: datetime
+
+
+class WeightProfileDelete(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    is_deleted: bool
+    deleted_at: datetime
@@ -1,9 +1,7 @@
 import logging
 
-import instructor
-from openai import AsyncOpenAI
-
 from ...core.config import settings
+from ...core.utils import llm
 from ...services.job_description.prompt import (
     oa_35_system_prompt_step_1,
     oa_35_system_prompt_step_2,
@@ -20,7 +18,6 @@ async def gpt35_flow(
     response_model: SkillsExtract,
 ):
     total_tokens = 0
-    client = instructor.patch(AsyncOpenAI(api_key=settings.OPENAI_API_KEY))
 
     # Prompt 1
     logging.debug("GPT 3.5 - Prompt 1")
@@ -31,7 +28,7 @@ async def gpt35_flow(
             "content": oa_35_user_prompt_step_1.format(job_description=job_description),
         },
     ]
-    response = await client.chat.completions.create(
+    response = await llm.create_chat_completion(
         model="gpt-3.5-turbo-0125",
         messages=messages,
         seed=settings.OPENAI_SEED,
@@ -52,7 +49,7 @@ async def gpt35_flow(
             "content": oa_35_user_prompt_step_2.format(parsed_skills=response.choices[0].message.content),
         },
     ]
-    response = await client.chat.completions.create(
+    response = await llm.create_chat_completion(
         model="gpt-3.5-turbo-0125",
         messages=messages,
         response_model=response_model,
@@ -76,7 +73,6 @@ async def gpt4_flow(
     response_model: SkillsExtract,
 ):
     total_tokens = 0
-    client = instructor.patch(AsyncOpenAI(api_key=settings.OPENAI_API_KEY))
 
     logging.debug("GPT 4")
     messages = [
@@ -86,7 +82,7 @@ async def gpt4_flow(
             "content": user_prompt_job_description.format(job_description=job_description),
         },
     ]
-    response = await client.chat.completions.create(
+    response = await llm.create_chat_completion(
         model="gpt-4-turbo-0125",
         messages=messages,
         response_model=response_model,
@@ -0,0 +1,45 @@
+"""Text normalization of extracted PDFs."""
+
+import re
+import unicodedata
+
+# Control characters except whitespace, invisible format characters (soft hyphen, zero width and bidirectional
+# marks, byte order mark) and the private use area, where PDF symbol fonts put their bullet glyphs
+_INVISIBLE_CHARS = re.compile(
+    r"[\x00-\x08\x0e-\x1b\x7f-\x84\x86-\x9f\u00ad\u200b-\u200f\u202a-\u202e\u2060-\u2064\ufeff\ue000-\uf8ff]+"
+)
+
+
+def normalize_line(line: str) -> str:
+    """Normalize a single line of text, see `normalize_text`."""
+    # Every check below is a single C level pass, most lines of a CV are ASCII and printable and skip the rest
+    if not line.isascii() and not unicodedata.is_normalized("NFKC", line):
+        line = unicodedata.normalize("NFKC", line)
+    if not line.isprintable():
+        line = _INVISIBLE_CHARS.sub("", line)
+    if "*" in line:
+        line = line.replace("*", "")
+
+    # `str.split` splits on any Unicode whitespace, including non-breaking and typographic spaces
+    return " ".join(line.split())
+
+
+def normalize_text(text: str) -> str:
+    """Normalize the text extracted from a PDF.
+
+    The text is NFKC normalized, so ligatures such as 'ﬁ' become 'fi' while accented characters are kept. Control
+    and invisible characters and asterisks are removed, runs of whitespace are collapsed to a single space, lines are
+    trimmed and runs of blank lines are collapsed to a single blank line.
+
+    :param text: The extracted text.
+    :type text: str
+    :return: The normalized text.
+    :rtype: str
+    """
+    lines: list[str] = []
+    for line in text.splitlines():
+        line = normalize_line(line)
+        if line or (lines and lines[-1]):
+            lines.append(line)
+
+    return "\n".join(lines).strip()
@@ -1,45 +1,164 @@
+"""OCR Service."""
+
+import asyncio
 import logging
-import string
-from io import BytesIO
+import mmap
+import tempfile
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
 
 import pdfplumber
 
 from ...core.config import settings
-from ...core.utils.s3 import create_s3_client
+from ...core.utils.pdf_pool import run_in_pool
+from ...core.utils.s3 import download_s3_file
+from .normalize import normalize_text
 
 
 class PDFOcrParsingError(Exception):
     """Exception raised when a PDF cannot be parsed."""
 
 
+@contextmanager
+def _open_pdf(path: str, start: int = 0, end: int | None = None) -> Iterator[pdfplumber.PDF]:
+    # The file is memory-mapped, so its pages are read from the page cache instead of being copied into the process
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+        pages = list(range(start + 1, end + 1)) if end is not None else None
+        with pdfplumber.open(mapped_file, pages=pages) as pdf:  # type: ignore
+            yield pdf
+
+
+def count_pdf_pages(path: str) -> int:
+    """Count the pages of a PDF, run in the PDF process pool by `parse_pdf`.
+
+    :param path: The path of the PDF.
+    :type path: str
+    :return: The number of pages.
+    :rtype: int
+    """
+    with _open_pdf(path) as pdf:
+        return len(pdf.pages)
+
+
+def iter_pdf_pages_text(path: str, start: int = 0, end: int | None = None) -> Iterator[str]:
+    """Yield the normalized text of a range of pages of a PDF, one page at a time.
+
+    The layout objects of each page are released as soon as its text is extracted, so the memory used does not grow
+    with the number of pages.
+
+    :param path: The path of the PDF.
+    :type path: str
+    :param start: The index of the first page to extract.
+    :type start: int
+    :param end: The index after the last page to extract, defaults to the end of the document.
+    :type end: int | None
+    :return: The text of every page, empty pages are skipped.
+    :rtype: Iterator[str]
+    """
+    with _open_pdf(path, start, end) as pdf:
+        for page in pdf.pages:
+            try:
+                text = normalize_text(page.extract_text())
+            finally:
+                page.close()
+
+            if text:
+                yield text
+
+
+def extract_pdf_text(path: str, start: int = 0, end: int | None = None, max_length: int | None = None) -> str:
+    """Extract the text of a range of pages of a PDF, run in the PDF process pool by `parse_pdf`.
+
+    :param path: The path of the PDF.
+    :type path: str
+    :param start: The index of the first page to extract.
+    :type start: int
+    :param end: The index after the last page to extract, defaults to the end of the document.
+    :type end: int | None
+    :param max_length: Stop extracting pages once the text reaches this length.
+    :type max_length: int | None
+    :return: The normalized text of the pages, one line break between pages.
+    :rtype: str
+    """
+    pdf_pages_list = []
+    length = 0
+
+    for text in iter_pdf_pages_text(path, start, end):
+        pdf_pages_list.append(text)
+
+        length += len(text)
+        if max_length is not None and length >= max_length:
+            break
+
+    return "\n".join(pdf_pages_list)
+
+
+async def extract_text(path: str) -> str:
+    """Extract the text of a local PDF in the PDF process pool, splitting long documents in parallel page ranges.
+
+    The ranges are parsed in page order, one per pool worker at a time, and each one only extracts the text still
+    missing to reach `PDF_MAX_TEXT_LENGTH`. Once it is reached, the ranges after it are not parsed.
+
+    :param path: The path of the PDF.
+    :type path: str
+    :return: The normalized text, at most `PDF_MAX_TEXT_LENGTH` characters.
+    :rtype: str
+    """
+    page_count = await run_in_pool(count_pdf_pages, path)
+    if page_count > settings.PDF_MAX_PAGES:
+        logging.warning(f"PDF has {page_count} pages, only the first {settings.PDF_MAX_PAGES} are parsed")
+        page_count = settings.PDF_MAX_PAGES
+
+    max_length = settings.PDF_MAX_TEXT_LENGTH
+    if page_count < settings.PDF_PARALLEL_MIN_PAGES:
+        return (await run_in_pool(extract_pdf_text, path, 0, page_count, max_length))[:max_length]
+
+    starts = iter(range(0, page_count, settings.PDF_PARALLEL_CHUNK_PAGES))
+    running: deque[asyncio.Task[str]] = deque()
+    chunks: list[str] = []
+    length = 0
+    try:
+        while True:
+            while len(running) < settings.PDF_POOL_WORKERS and (start := next(starts, None)) is not None:
+                end = min(start + settings.PDF_PARALLEL_CHUNK_PAGES, page_count)
+                running.append(
+                    asyncio.create_task(run_in_pool(extract_pdf_text, path, start, end, max_length - length))
+                )
+            if not running:
+                break
+
+            chunk = await running.popleft()
+            if chunk:
+                chunks.append(chunk)
+                length += len(chunk) + 1
+            if length >= max_length:
+                break
+    finally:
+        # The ranges after the text limit, or after a failed range, are no longer needed
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+    return "\n".join(chunks)[:max_length]
+
+
 async def parse_pdf(path: str, is_s3_url=False) -> str:
     logging.info("Parsing PDF using OCR")
 
-    pdf_pages_list = []
+    if not is_s3_url:
+        logging.info(f"Parsing Local PDF {path}")
+        return await extract_text(path)
 
-    if is_s3_url:
+    # The object is streamed to a temporary file that the pool workers open by path, it is never held in memory
+    with tempfile.NamedTemporaryFile(suffix=".pdf", dir=settings.PDF_SPOOL_DIR) as spool_file:
         try:
-            s3_client = await create_s3_client()
-            bucket_name = settings.S3_BUCKET_NAME
-            object_name = str(path).split("/")[-1]
-            logging.info(f"Parsing S3 PDF {object_name}")
-
-            file_obj = BytesIO()
-            s3_client.download_fileobj(bucket_name, object_name, file_obj)
-            pdf = pdfplumber.open(BytesIO(file_obj.getvalue()))
+            logging.info(f"Parsing S3 PDF {path}")
+            await download_s3_file(path, spool_file)
+            spool_file.flush()
 
         except Exception as e:
             logging.error(f"Error downloading PDF from S3: {e}")
             raise PDFOcrParsingError(f"Error downloading PDF from S3: {e}") from e
-    else:
-        pdf = pdfplumber.open(path)
-        logging.info(f"Parsing Local PDF {path}")
-
-    for page in pdf.pages:
-        text = page.extract_text()
-        pdf_pages_list.append(text)
-
-    pdf_pages_list = "".join([page_text.replace("*", "") for page_text in pdf_pages_list])
-    pdf_pages_list = "".join(x for x in pdf_pages_list if x in string.printable)  # remove wrong chars
 
-    return pdf_pages_list
+        return await extract_text(spool_file.name)
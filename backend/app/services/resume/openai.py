@@ -1,9 +1,7 @@
 import logging
 
-import instructor
-from openai import AsyncOpenAI
-
 from ...core.config import settings
+from ...core.utils import llm
 from ...services.job_description.schema import SkillsExtract
 from ...services.resume.prompt import (
     oa_35_system_prompt_step_1,
@@ -23,7 +21,6 @@ async def gpt_mixed_flow(
     resume_text: str,
 ):
     total_tokens = 0
-    client = instructor.patch(AsyncOpenAI(api_key=settings.OPENAI_API_KEY))
 
     # Prompt: parse the resume into skills
     logging.debug("GPT 3.5 - Prompt 1")
@@ -31,7 +28,7 @@ async def gpt_mixed_flow(
         {"role": "system", "content": oa_35_system_prompt_step_1},
         {"role": "user", "content": oa_35_user_prompt_step_1.format(resume=resume_text)},
     ]
-    response = await client.chat.completions.create(
+    response = await llm.create_chat_completion(
         model="gpt-3.5-turbo-0125",
         messages=messages,
         seed=settings.OPENAI_SEED,
@@ -52,7 +49,7 @@ async def gpt_mixed_flow(
             "content": oa_35_user_prompt_step_2.format(parsed_skills=response.choices[0].message.content),
         },
     ]
-    response = await client.chat.completions.create(
+    response = await llm.create_chat_completion(
         model="gpt-3.5-turbo-0125",
         messages=messages,
         response_model=SkillsExtract,
@@ -75,7 +72,7 @@ async def gpt_mixed_flow(
             "content": oa_35_user_prompt_step_3.format(job_description_skills=parsed_skills, resume_skills=response),
         },
     ]
-    response = await client.chat.completions.create(
+    response = await llm.create_chat_completion(
         model="gpt-4-turbo-preview",
         messages=messages,
         response_model=EvaluationExtract,
@@ -99,7 +96,6 @@ async def gpt4_flow(
     resume_text: str,
 ) -> EvaluationExtract:
     total_tokens = 0
-    client = instructor.patch(AsyncOpenAI(api_key=settings.OPENAI_API_KEY))
 
     logging.debug("GPT 4")
     messages = [
@@ -109,7 +105,7 @@ async def gpt4_flow(
             "content": user_prompt_cv.format(job_description_skills=parsed_skills, resume_text=resume_text),
         },
     ]
-    response = await client.chat.completions.create(
+    response = await llm.create_chat_completion(
         model="gpt-4-turbo-0125",
         messages=messages,
         response_model=EvaluationExtract,
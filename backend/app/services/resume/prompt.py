@@ -1,3 +1,6 @@
+# Bump whenever the prompts below change, cached evaluations made with older prompts are then ignored
+PROMPT_VERSION = "1"
+
 # GPT 3.5
 
 oa_35_system_prompt_step_1 = """
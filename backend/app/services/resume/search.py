@@ -0,0 +1,68 @@
+from typing import Any
+
+from sqlalchemy import ColumnElement, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...models.job_description import JobDescription
+from ...models.resume import TEXT_SEARCH_CONFIGURATIONS, Resume
+
+
+def build_search_query(query: str) -> ColumnElement[Any]:
+    """Build the tsquery of a web search style query, e.g. `kubernetes "data engineer" -java`, in every configuration
+    of `Resume.text_search`."""
+    configuration_queries = [
+        func.websearch_to_tsquery(literal_column(f"'{configuration}'::regconfig"), query)
+        for configuration in TEXT_SEARCH_CONFIGURATIONS
+    ]
+    tsquery = configuration_queries[0]
+    for configuration_query in configuration_queries[1:]:
+        tsquery = tsquery.op("||")(configuration_query)
+
+    return tsquery
+
+
+async def search_resumes(
+    db: AsyncSession, user_id: int, query: str, job_id: int | None = None, offset: int = 0, limit: int = 20
+) -> dict[str, Any]:
+    """Search the text of the resumes of the jobs of a user, the best matches first.
+
+    The matches are found through the GIN index of `Resume.text_search`, only the matching rows are ranked.
+
+    :param db: The database session.
+    :param user_id: ID of the user owning the job descriptions.
+    :param query: The web search style query.
+    :param job_id: If given, only the resumes of this job are searched.
+    :param offset: The number of results to skip.
+    :param limit: The maximum number of results to return.
+    :return: The page of results in `data`, with the `id`, `name`, `job_id`, `created_at` and `rank` of the resumes,
+        and the number of matching resumes in `total_count`.
+    """
+    tsquery = build_search_query(query)
+    filters = [
+        Resume.text_search.op("@@")(tsquery),
+        Resume.is_deleted.is_(False),
+        JobDescription.created_by_user_id == user_id,
+        JobDescription.is_deleted.is_(False),
+    ]
+    if job_id is not None:
+        filters.append(Resume.job_id == job_id)
+
+    rank = func.ts_rank_cd(Resume.text_search, tsquery).label("rank")
+    page_query = (
+        select(Resume.id, Resume.name, Resume.job_id, Resume.created_at, rank)
+        .join(JobDescription, JobDescription.id == Resume.job_id)
+        .where(*filters)
+        .order_by(rank.desc(), Resume.id.desc())
+        .offset(offset)
+        .limit(limit)
+    )
+    count_query = (
+        select(func.count())
+        .select_from(Resume)
+        .join(JobDescription, JobDescription.id == Resume.job_id)
+        .where(*filters)
+    )
+
+    data = [dict(row) for row in (await db.execute(page_query)).mappings()]
+    total_count = (await db.execute(count_query)).scalar_one()
+    return {"data": data, "total_count": total_count}
@@ -0,0 +1,139 @@
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import ColumnElement, Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...models.parsed_resume import ParsedResume
+from ...models.resume import Resume
+from ...models.score import Score
+from ..scorer.counts import SKILL_COUNT_GROUPS, SKILL_COUNT_MATCHES
+
+SKILL_MATCHES = {match: count for count, match in SKILL_COUNT_MATCHES.items()}
+
+
+class SkillFilterError(ValueError):
+    """Exception raised when a skill predicate cannot be parsed."""
+
+
+@dataclass(frozen=True)
+class SkillPredicate:
+    """A skill of a group of `parsed_skills`, e.g. `required_hard`, evaluated with the given match."""
+
+    group: str
+    skill: str
+    match: str
+
+    @classmethod
+    def parse(cls, value: str) -> "SkillPredicate":
+        """Parse a `group:skill:match` predicate, e.g. `required_hard:Kubernetes:YES`."""
+        group, _, rest = value.partition(":")
+        skill, _, match = rest.rpartition(":")
+        if group not in SKILL_COUNT_GROUPS or not skill or match.upper() not in SKILL_MATCHES:
+            raise SkillFilterError(
+                f"Invalid skill filter '{value}', expected group:skill:match with a group among "
+                f"{', '.join(SKILL_COUNT_GROUPS)} and a match among {', '.join(SKILL_MATCHES)}"
+            )
+        return cls(group=group, skill=skill, match=match.upper())
+
+
+@dataclass(frozen=True)
+class GroupPredicate:
+    """Every skill of a group of `parsed_skills` evaluated with the given match."""
+
+    group: str
+    match: str
+
+    @classmethod
+    def parse(cls, value: str) -> "GroupPredicate":
+        """Parse a `group:match` predicate, e.g. `required_hard:YES`."""
+        group, _, match = value.partition(":")
+        if group not in SKILL_COUNT_GROUPS or match.upper() not in SKILL_MATCHES:
+            raise SkillFilterError(
+                f"Invalid skill group filter '{value}', expected group:match with a group among "
+                f"{', '.join(SKILL_COUNT_GROUPS)} and a match among {', '.join(SKILL_MATCHES)}"
+            )
+        return cls(group=group, match=match.upper())
+
+
+def build_skill_filters(
+    skills: list[SkillPredicate], every: list[GroupPredicate] | None = None
+) -> list[ColumnElement[bool]]:
+    """Translate skill predicates into conditions on `ParsedResume`, all of them must hold.
+
+    The skill predicates are merged into one `parsed_skills @> ...` containment, answered by the jsonb_path_ops GIN
+    index of `parsed_skills`. The group predicates compare the match counters of the group.
+
+    :param skills: The skill predicates.
+    :param every: The group predicates.
+    :return: The conditions to add to a query on `ParsedResume`.
+    """
+    filters: list[ColumnElement[bool]] = []
+
+    document: dict[str, dict[str, dict[str, Any]]] = {}
+    for predicate in skills:
+        requirement, skill_type = SKILL_COUNT_GROUPS[predicate.group]
+        group_skills = document.setdefault(requirement, {}).setdefault(skill_type, {})
+        if group_skills.get(predicate.skill, {}).get("match", predicate.match) != predicate.match:
+            # Two different matches for one skill, nothing can satisfy both
+            return [ParsedResume.id.is_(None)]
+        group_skills[predicate.skill] = {"match": predicate.match}
+    if document:
+        filters.append(ParsedResume.parsed_skills.contains(document))
+
+    for group_predicate in every or []:
+        count = SKILL_MATCHES[group_predicate.match]
+        filters.append(
+            getattr(ParsedResume, f"{group_predicate.group}_{count}")
+            == getattr(ParsedResume, f"{group_predicate.group}_total")
+        )
+
+    return filters
+
+
+def matching_resume_ids(job_id: int, filters: list[ColumnElement[bool]]) -> Select[Any]:
+    """Select the IDs of the resumes of a job whose latest parsed resume satisfies the filters."""
+    latest_ids = (
+        select(ParsedResume.id)
+        .join(Resume, Resume.id == ParsedResume.resume_id)
+        .where(
+            ParsedResume.job_description_id == job_id,
+            ParsedResume.is_deleted.is_(False),
+            Resume.is_deleted.is_(False),
+        )
+        .order_by(ParsedResume.resume_id, ParsedResume.created_at.desc())
+        .distinct(ParsedResume.resume_id)
+    )
+    return select(ParsedResume.resume_id).where(ParsedResume.id.in_(latest_ids), *filters)
+
+
+async def get_filtered_ranking(
+    db: AsyncSession, job_id: int, filters: list[ColumnElement[bool]], offset: int = 0, limit: int = 30
+) -> dict[str, Any]:
+    """Get a page of the score ranking of a job, restricted to the resumes satisfying skill filters.
+
+    :param db: The database session.
+    :param job_id: ID of the job description.
+    :param filters: The conditions on `ParsedResume`, see `build_skill_filters`.
+    :param offset: The number of scores to skip.
+    :param limit: The maximum number of scores to return.
+    :return: The `id`, `resume_id` and `score` of each score in `data` and the number of matching scores in
+        `total_count`, like `FastCRUD.get_multi`.
+    """
+    ranking_filters = (
+        Score.job_id == job_id,
+        Score.is_deleted.is_(False),
+        Score.resume_id.in_(matching_resume_ids(job_id, filters)),
+    )
+    page_query = (
+        select(Score.id, Score.resume_id, Score.score)
+        .where(*ranking_filters)
+        .order_by(Score.score.desc(), Score.id.desc())
+        .offset(offset)
+        .limit(limit)
+    )
+    count_query = select(func.count()).select_from(Score).where(*ranking_filters)
+
+    data = [dict(row) for row in (await db.execute(page_query)).mappings()]
+    total_count = (await db.execute(count_query)).scalar_one()
+    return {"data": data, "total_count": total_count}
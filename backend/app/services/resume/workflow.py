@@ -1,17 +1,39 @@
 import logging
 
 from ...core.config import settings
+from ...core.utils import llm_cache
 from ...core.utils.kv import set_key_value
 from ...schemas.parsed_job_description import ParsedJobDescriptionRead
 from ...schemas.resume import ResumeRead
 from ...services.ocr.parse_pdf import parse_pdf
 from ...services.resume.openai import oa_resume
+from ...services.resume.prompt import PROMPT_VERSION
+from ...services.resume.schema import EvaluationExtract
 
 
-async def evaluate_resume(resume: ResumeRead, parsed_job_description: ParsedJobDescriptionRead) -> ResumeRead:
+def evaluation_cache_key(resume_text: str, parsed_skills: dict) -> str:
+    """Build the cache key of the evaluation of a resume against the parsed skills of a job description.
+
+    The resume text is whitespace-normalized so that re-extractions of the same PDF hit the same entry, and the model
+    name and prompt version are part of the key so that changing either never serves an outdated evaluation.
+
+    :param resume_text: The text of the resume.
+    :param parsed_skills: The parsed skills of the job description.
+    :return: The cache key.
+    """
+    return llm_cache.make_cache_key(
+        " ".join(resume_text.split()),
+        llm_cache.canonical_json(parsed_skills),
+        settings.OPENAI_MODEL_NAME,
+        PROMPT_VERSION,
+    )
+
+
+async def evaluate_resume(resume: ResumeRead, parsed_job_description: ParsedJobDescriptionRead) -> EvaluationExtract:
     """Process the text workflow.
 
-    Extract skills from job description and CV and then evaluate CV.
+    Extract skills from job description and CV and then evaluate CV. Evaluations are cached by content, so evaluating
+    the same resume text against the same parsed skills again does not call the LLM.
 
     :param text: The text to process.
     :param parsed_resume: DAO for ParsedText models.
@@ -24,10 +46,22 @@ async def evaluate_resume(resume: ResumeRead, parsed_job_description: ParsedJobD
             request_function = oa_resume
 
         await set_key_value(key=f"job:{resume.job_id}:{resume.id}:evaluate_status", value=settings.STATUS_PROCESSING)
-        text_extracted = await request_function(
-            parsed_skills=parsed_job_description.parsed_skills,
-            resume_text=resume.text,
-        )
+
+        cache_key = evaluation_cache_key(resume.text, parsed_job_description.parsed_skills)
+        text_extracted = None
+        if settings.LLM_CACHE_ENABLED:
+            text_extracted = await llm_cache.get_cached_model(cache_key, EvaluationExtract)
+
+        if text_extracted is None:
+            text_extracted = await request_function(
+                parsed_skills=parsed_job_description.parsed_skills,
+                resume_text=resume.text,
+            )
+            if settings.LLM_CACHE_ENABLED:
+                await llm_cache.set_cached_model(cache_key, text_extracted)
+        else:
+            logging.info(f"Evaluation of resume {resume.id} served from the LLM cache")
+
         logging.info(f"Parsed skills: {text_extracted}")
         await set_key_value(key=f"job:{resume.job_id}:{resume.id}:evaluate_status", value=settings.STATUS_SUCCESS)
 
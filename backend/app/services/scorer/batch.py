@@ -0,0 +1,245 @@
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...models.parsed_resume import ParsedResume
+from ...models.resume import Resume
+from .calculation import ScoreError
+from .weight import ScoreWeight
+
+# Match codes, indexing the weight lookup table built by `score_skill_matrix`. Unknown matches count as skills
+# without adding to the score, like in `calc_skill_matches`.
+MATCH_UNKNOWN = 0
+MATCH_NO = 1
+MATCH_PARTIAL = 2
+MATCH_YES = 3
+MATCH_CODES = {"NO": MATCH_NO, "PARTIAL": MATCH_PARTIAL, "YES": MATCH_YES}
+
+# The skill groups in the order `score_calculation` sums them
+SKILL_GROUPS = (
+    ("required_skills", "hard_skills"),
+    ("required_skills", "soft_skills"),
+    ("nice_to_have_skills", "hard_skills"),
+    ("nice_to_have_skills", "soft_skills"),
+)
+
+# The skill matrices of the latest jobs loaded by this process, with the version of the parsed resumes they hold
+SKILL_MATRIX_CACHE_SIZE = 32
+_skill_matrices: OrderedDict[int, tuple[tuple[Any, ...], np.ndarray, "SkillMatrix"]] = OrderedDict()
+
+
+@dataclass(frozen=True)
+class SkillMatrix:
+    """The skill matches of a batch of parsed resumes, flattened into compact arrays with one item per skill.
+
+    Attributes
+    ----------
+    resume_index: np.ndarray
+        The position of the resume of each skill in the batch.
+    match: np.ndarray
+        The match code of each skill, see `MATCH_CODES`.
+    required: np.ndarray
+        True for required skills, False for nice to have ones.
+    hard: np.ndarray
+        True for hard skills, False for soft ones.
+    resume_count: int
+        The number of resumes in the batch, including the ones without skills.
+    """
+
+    resume_index: np.ndarray
+    match: np.ndarray
+    required: np.ndarray
+    hard: np.ndarray
+    resume_count: int
+
+    @property
+    def group(self) -> np.ndarray:
+        """The position of the skill group of each skill in `SKILL_GROUPS`."""
+        return (~self.required).astype(np.intp) * 2 + (~self.hard).astype(np.intp)
+
+
+def build_skill_matrix(parsed_skills: Iterable[Mapping[str, Any]]) -> SkillMatrix:
+    """Flatten the `parsed_skills` of a batch of parsed resumes into a `SkillMatrix`.
+
+    Parameters
+    ----------
+    parsed_skills: Iterable[Mapping[str, Any]]
+        The `parsed_skills` of each resume, as stored on `ParsedResume`.
+
+    Returns
+    -------
+    SkillMatrix
+        The skill matches of the batch, in the order of the resumes and of their skills.
+    """
+    match: list[int] = []
+    # One run of consecutive skills per resume and skill group, expanded with np.repeat
+    run_resume: list[int] = []
+    run_group: list[int] = []
+    run_length: list[int] = []
+
+    resume_count = 0
+    for index, skills in enumerate(parsed_skills):
+        resume_count += 1
+        for group, (requirement, skill_type) in enumerate(SKILL_GROUPS):
+            group_skills = skills[requirement].get(skill_type)
+            if not group_skills:
+                continue
+            match.extend([MATCH_CODES.get(skill["match"], MATCH_UNKNOWN) for skill in group_skills.values()])
+            run_resume.append(index)
+            run_group.append(group)
+            run_length.append(len(group_skills))
+
+    group = np.repeat(np.array(run_group, dtype=np.int8), run_length)
+    return SkillMatrix(
+        resume_index=np.repeat(np.array(run_resume, dtype=np.int32), run_length),
+        match=np.array(match, dtype=np.int8),
+        required=group < 2,
+        hard=group % 2 == 0,
+        resume_count=resume_count,
+    )
+
+
+def score_skill_matrix(matrix: SkillMatrix, weight: ScoreWeight | None = None) -> np.ndarray:
+    """Calculate the score of every resume of a batch in one vectorized pass.
+
+    The sums are accumulated in the same order as `score_calculation`, so the scores are identical to the ones of
+    the per-resume function, not only close.
+
+    Parameters
+    ----------
+    matrix: SkillMatrix
+        The skill matches of the batch.
+    weight: ScoreWeight | None
+        The weights to apply, defaults to the configured ones.
+
+    Returns
+    -------
+    np.ndarray
+        The score of each resume of the batch, 0 for resumes without skills.
+
+    Raises
+    ------
+    ScoreError
+        If a score is negative.
+    """
+    weight = weight or ScoreWeight()
+    match_weights = np.array(
+        [
+            0.0,
+            weight.get_no_match_weight(),
+            weight.get_partial_match_weight(),
+            weight.get_yes_match_weight(),
+        ]
+    )
+    group_weights = np.array(
+        [
+            weight.get_required_skills_weight(),
+            weight.get_required_skills_weight(),
+            weight.get_nice_to_have_skills_weight(),
+            weight.get_nice_to_have_skills_weight(),
+        ]
+    )
+
+    # bincount accumulates in input order, the per group sums match the loop of `calc_skill_matches`
+    cells = matrix.resume_index.astype(np.intp) * len(SKILL_GROUPS) + matrix.group
+    minlength = matrix.resume_count * len(SKILL_GROUPS)
+    shape = (matrix.resume_count, len(SKILL_GROUPS))
+    match_sums = np.bincount(cells, weights=match_weights[matrix.match], minlength=minlength).reshape(shape)
+    totals = np.bincount(cells, minlength=minlength).reshape(shape)
+
+    weighted_matches = match_sums * group_weights
+    weighted_totals = totals * group_weights
+    result_x = np.zeros(matrix.resume_count)
+    result_y = np.zeros(matrix.resume_count)
+    for group in range(len(SKILL_GROUPS)):
+        result_x += weighted_matches[:, group]
+        result_y += weighted_totals[:, group]
+
+    scores = np.divide(result_x, result_y, out=np.zeros(matrix.resume_count), where=result_y > 0)
+    if (scores < 0).any():
+        raise ScoreError("Exception raised when a Score cannot be calculated")
+
+    return scores
+
+
+def score_batch(parsed_skills: Iterable[Mapping[str, Any]], weight: ScoreWeight | None = None) -> list[float]:
+    """Calculate the scores of a batch of parsed resumes, see `score_skill_matrix`."""
+    scores: list[float] = score_skill_matrix(build_skill_matrix(parsed_skills), weight).tolist()
+    return scores
+
+
+async def load_skill_matrix(db: AsyncSession, job_id: int) -> tuple[np.ndarray, SkillMatrix]:
+    """Load the latest parsed skills of each resume parsed for a job as a `SkillMatrix`.
+
+    Flattening thousands of `parsed_skills` documents costs much more than scoring them, so the matrix of the
+    latest jobs is kept in memory and only rebuilt when the parsed resumes of the job change.
+
+    :param db: The database session.
+    :param job_id: ID of the job description.
+    :return: The resume IDs, in the order of the matrix, and the matrix.
+    """
+    # Deleting a resume only soft deletes the resume row, it changes the version through the join
+    filters = (
+        ParsedResume.job_description_id == job_id,
+        ParsedResume.is_deleted.is_(False),
+        Resume.is_deleted.is_(False),
+    )
+    version_query = (
+        select(func.count(ParsedResume.id), func.max(ParsedResume.id), func.max(ParsedResume.updated_at))
+        .join(Resume, Resume.id == ParsedResume.resume_id)
+        .where(*filters)
+    )
+    version = tuple((await db.execute(version_query)).one())
+
+    cached = _skill_matrices.get(job_id)
+    if cached is not None and cached[0] == version:
+        _skill_matrices.move_to_end(job_id)
+        return cached[1], cached[2]
+
+    query = (
+        select(ParsedResume.resume_id, ParsedResume.parsed_skills)
+        .join(Resume, Resume.id == ParsedResume.resume_id)
+        .where(*filters)
+        .order_by(ParsedResume.resume_id, ParsedResume.created_at.desc())
+        .distinct(ParsedResume.resume_id)
+    )
+    rows = (await db.execute(query)).all()
+    resume_ids = np.array([resume_id for resume_id, _ in rows], dtype=np.int64)
+    matrix = build_skill_matrix(parsed_skills for _, parsed_skills in rows)
+
+    _skill_matrices[job_id] = (version, resume_ids, matrix)
+    _skill_matrices.move_to_end(job_id)
+    if len(_skill_matrices) > SKILL_MATRIX_CACHE_SIZE:
+        _skill_matrices.popitem(last=False)
+
+    return resume_ids, matrix
+
+
+async def rank_job(
+    db: AsyncSession, job_id: int, weight: ScoreWeight | None = None, offset: int = 0, limit: int = 10
+) -> tuple[list[dict[str, int | float]], int]:
+    """Rank the resumes parsed for a job under the given weights, without calling the LLM again.
+
+    :param db: The database session.
+    :param job_id: ID of the job description.
+    :param weight: The weights to apply, defaults to the configured ones.
+    :param offset: The number of entries to skip.
+    :param limit: The maximum number of entries to return.
+    :return: The `resume_id`, `score` and 1-based `rank` of each entry, the best scores first, and the number of
+        ranked resumes.
+    """
+    resume_ids, matrix = await load_skill_matrix(db=db, job_id=job_id)
+    scores = score_skill_matrix(matrix, weight)
+
+    # Best scores first, equal scores by resume ID
+    order = np.lexsort((resume_ids, -scores))[offset : offset + limit]
+    entries = [
+        {"resume_id": resume_id, "score": score, "rank": offset + index + 1}
+        for index, (resume_id, score) in enumerate(zip(resume_ids[order].tolist(), scores[order].tolist(), strict=True))
+    ]
+    return entries, len(resume_ids)
@@ -0,0 +1,126 @@
+from collections.abc import Mapping
+from typing import Any
+
+from sqlalchemy import ColumnElement, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from ...models.parsed_resume import ParsedResume
+from ...models.resume import Resume
+from .weight import ScoreWeight
+
+# The skill groups of `parsed_skills`, by prefix of their counter columns on `ParsedResume`
+SKILL_COUNT_GROUPS = {
+    "required_hard": ("required_skills", "hard_skills"),
+    "required_soft": ("required_skills", "soft_skills"),
+    "nice_to_have_hard": ("nice_to_have_skills", "hard_skills"),
+    "nice_to_have_soft": ("nice_to_have_skills", "soft_skills"),
+}
+# `total` also counts the skills with an unknown match, like the denominator of `score_calculation`
+SKILL_COUNT_MATCHES = {"yes": "YES", "partial": "PARTIAL", "no": "NO"}
+SKILL_COUNT_COLUMNS = tuple(
+    f"{prefix}_{count}" for prefix in SKILL_COUNT_GROUPS for count in (*SKILL_COUNT_MATCHES, "total")
+)
+
+
+def count_skill_matches(parsed_skills: Mapping[str, Any]) -> dict[str, int]:
+    """Count the skills of each group of `parsed_skills` by match, see `SKILL_COUNT_COLUMNS`.
+
+    Parameters
+    ----------
+    parsed_skills: Mapping[str, Any]
+        The parsed skills of a resume, as stored on `ParsedResume`.
+
+    Returns
+    -------
+    dict[str, int]
+        The value of each counter column.
+    """
+    counts = dict.fromkeys(SKILL_COUNT_COLUMNS, 0)
+    for prefix, (requirement, skill_type) in SKILL_COUNT_GROUPS.items():
+        group_skills = (parsed_skills.get(requirement) or {}).get(skill_type) or {}
+        counts[f"{prefix}_total"] = len(group_skills)
+        for skill in group_skills.values():
+            for count, match in SKILL_COUNT_MATCHES.items():
+                if skill["match"] == match:
+                    counts[f"{prefix}_{count}"] += 1
+
+    return counts
+
+
+def score_expression(
+    weight: ScoreWeight | None = None, parsed_resume: type[ParsedResume] = ParsedResume
+) -> ColumnElement[float]:
+    """Build the SQL expression of the score of a parsed resume from its counter columns.
+
+    The expression follows the weighted arithmetic mean of `score_calculation`, it lets the database rank and
+    aggregate scores without decoding `parsed_skills`. The floating point sums are not accumulated in the same order,
+    so a score may differ from the Python one in its last digits.
+
+    Parameters
+    ----------
+    weight: ScoreWeight | None
+        The weights to apply, defaults to the configured ones.
+    parsed_resume: type[ParsedResume]
+        The entity holding the counters, e.g. an alias of a subquery.
+
+    Returns
+    -------
+    ColumnElement[float]
+        The score, 0 for parsed resumes without skills.
+    """
+    weight = weight or ScoreWeight()
+    group_weights = {
+        "required_hard": weight.get_required_skills_weight(),
+        "required_soft": weight.get_required_skills_weight(),
+        "nice_to_have_hard": weight.get_nice_to_have_skills_weight(),
+        "nice_to_have_soft": weight.get_nice_to_have_skills_weight(),
+    }
+    match_weights = {
+        "yes": weight.get_yes_match_weight(),
+        "partial": weight.get_partial_match_weight(),
+        "no": weight.get_no_match_weight(),
+    }
+
+    numerator: ColumnElement[float] = literal(0.0)
+    denominator: ColumnElement[float] = literal(0.0)
+    for prefix, group_weight in group_weights.items():
+        for count, match_weight in match_weights.items():
+            numerator = numerator + getattr(parsed_resume, f"{prefix}_{count}") * (match_weight * group_weight)
+        denominator = denominator + getattr(parsed_resume, f"{prefix}_total") * group_weight
+
+    return func.coalesce(numerator / func.nullif(denominator, 0), 0.0)
+
+
+async def job_skill_stats(db: AsyncSession, job_id: int, weight: ScoreWeight | None = None) -> dict[str, int | float]:
+    """Aggregate the counters and the scores of the latest parsed resume of each resume of a job, in SQL.
+
+    :param db: The database session.
+    :param job_id: ID of the job description.
+    :param weight: The weights of the scores, defaults to the configured ones.
+    :return: The number of parsed resumes, the average, min and max score and the sum of each counter.
+    """
+    latest = (
+        select(ParsedResume)
+        .join(Resume, Resume.id == ParsedResume.resume_id)
+        .where(
+            ParsedResume.job_description_id == job_id,
+            ParsedResume.is_deleted.is_(False),
+            Resume.is_deleted.is_(False),
+        )
+        .order_by(ParsedResume.resume_id, ParsedResume.created_at.desc())
+        .distinct(ParsedResume.resume_id)
+        .subquery()
+    )
+    latest_resume = aliased(ParsedResume, latest)
+    score = score_expression(weight, latest_resume)
+    query = select(
+        func.count().label("parsed_resumes"),
+        func.coalesce(func.avg(score), 0.0).label("average_score"),
+        func.coalesce(func.min(score), 0.0).label("min_score"),
+        func.coalesce(func.max(score), 0.0).label("max_score"),
+        *(func.coalesce(func.sum(getattr(latest_resume, column)), 0).label(column) for column in SKILL_COUNT_COLUMNS),
+    )
+    stats = dict((await db.execute(query)).mappings().one())
+    stats["job_description_id"] = job_id
+    return stats
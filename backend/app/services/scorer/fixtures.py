@@ -0,0 +1,24 @@
+import random
+
+
+def make_parsed_skills(rng: random.Random, min_skills: int = 0, max_skills: int = 12) -> dict:
+    """Generate the `parsed_skills` of a resume, with random matches in every skill group.
+
+    Used by the tests and the benchmarks of the scorer, it needs nothing but the standard library.
+
+    :param rng: The random generator, seeded for reproducible skills.
+    :param min_skills: The minimum number of skills per group.
+    :param max_skills: The maximum number of skills per group.
+    :return: The skills, with the structure of `parsed_skills`.
+    """
+
+    def group() -> dict:
+        return {
+            f"skill {index}": {"match": rng.choice(["YES", "PARTIAL", "NO", "UNKNOWN"])}
+            for index in range(rng.randint(min_skills, max_skills))
+        }
+
+    return {
+        "required_skills": {"hard_skills": group(), "soft_skills": group()},
+        "nice_to_have_skills": {"hard_skills": group(), "soft_skills": group()},
+    }
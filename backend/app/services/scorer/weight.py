@@ -17,6 +17,17 @@ class ScoreWeight:
     _hard_skills_weights: float = settings.HARD_SKILLS_WEIGHT
     _soft_skills_weights: float = settings.SOFT_SKILLS_WEIGHT
 
+    def __init__(self, **weights: float | None) -> None:
+        """Override some of the configured weights, e.g. `ScoreWeight(required_skills_weight=18)`.
+
+        A weight set to None keeps its configured value.
+        """
+        for name, value in weights.items():
+            if not hasattr(self, f"_{name}"):
+                raise ValueError(f"Unknown score weight: {name}")
+            if value is not None:
+                setattr(self, f"_{name}", value)
+
     def get_yes_match_weight(self) -> float:
         return self._yes_match_weight
 
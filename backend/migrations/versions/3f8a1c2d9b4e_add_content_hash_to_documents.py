@@ -0,0 +1,36 @@
+"""add content hash to resumes and job descriptions
+
+Revision ID: 3f8a1c2d9b4e
+Revises:
+Create Date: 2026-10-18 18:10:00.000000
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f8a1c2d9b4e"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The tables are created by the application on startup, so the new columns may already exist
+TABLES = ("resumes", "job_descriptions")
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)")
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_created_by_user_id_content_hash "
+            f"ON {table} (created_by_user_id, content_hash)"
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_created_by_user_id_content_hash")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS content_hash")
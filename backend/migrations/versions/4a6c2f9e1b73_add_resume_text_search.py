@@ -0,0 +1,36 @@
+"""add a full-text search column to resumes
+
+Revision ID: 4a6c2f9e1b73
+Revises: e91b7c3a5d28
+Create Date: 2026-10-18 22:30:00.000000
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4a6c2f9e1b73"
+down_revision: Union[str, None] = "e91b7c3a5d28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Adding a stored generated column rewrites the table once, filling the column for the existing resumes
+    op.execute(
+        "ALTER TABLE resumes ADD COLUMN IF NOT EXISTS text_search TSVECTOR GENERATED ALWAYS AS ("
+        "to_tsvector('english'::regconfig, coalesce(text, '')) || to_tsvector('dutch'::regconfig, coalesce(text, ''))"
+        ") STORED NOT NULL"
+    )
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_resumes_text_search ON resumes USING gin (text_search)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_resumes_job_id ON resumes (job_id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_resumes_job_id")
+    op.execute("DROP INDEX IF EXISTS ix_resumes_text_search")
+    op.drop_column("resumes", "text_search")
@@ -0,0 +1,45 @@
+"""use integer foreign keys on scores and index the ranking
+
+Revision ID: 7b2e4d91c6a3
+Revises: 3f8a1c2d9b4e
+Create Date: 2026-10-18 18:30:00.000000
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7b2e4d91c6a3"
+down_revision: Union[str, None] = "3f8a1c2d9b4e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FOREIGN_KEYS = {
+    "resume_id": "resumes",
+    "job_id": "job_descriptions",
+    "parsed_job_id": "parsed_job_descriptions",
+}
+
+
+def upgrade() -> None:
+    for column, referred_table in FOREIGN_KEYS.items():
+        op.execute(f"ALTER TABLE scores ALTER COLUMN {column} TYPE INTEGER USING {column}::integer")
+        op.execute(f"ALTER TABLE scores DROP CONSTRAINT IF EXISTS scores_{column}_fkey")
+        op.create_foreign_key(f"scores_{column}_fkey", "scores", referred_table, [column], ["id"])
+
+    op.execute("CREATE INDEX IF NOT EXISTS ix_scores_resume_id ON scores (resume_id)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_scores_job_id_is_deleted_score "
+        "ON scores (job_id, is_deleted, score DESC, id DESC) INCLUDE (resume_id)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_scores_job_id_is_deleted_score")
+    op.execute("DROP INDEX IF EXISTS ix_scores_resume_id")
+    for column in FOREIGN_KEYS:
+        op.drop_constraint(f"scores_{column}_fkey", "scores", type_="foreignkey")
+        op.execute(f"ALTER TABLE scores ALTER COLUMN {column} TYPE VARCHAR(100) USING {column}::varchar")
@@ -0,0 +1,30 @@
+"""index parsed skills for containment queries
+
+Revision ID: 8d3f0b6a2c51
+Revises: 4a6c2f9e1b73
+Create Date: 2026-10-18 23:10:00.000000
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d3f0b6a2c51"
+down_revision: Union[str, None] = "4a6c2f9e1b73"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_parsed_resumes_parsed_skills "
+            "ON parsed_resumes USING gin (parsed_skills jsonb_path_ops)"
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_parsed_resumes_parsed_skills")
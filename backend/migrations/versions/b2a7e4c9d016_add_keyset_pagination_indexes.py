@@ -0,0 +1,40 @@
+"""add the indexes of the keyset pagination
+
+Revision ID: b2a7e4c9d016
+Revises: 8d3f0b6a2c51
+Create Date: 2026-10-19 09:20:00.000000
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b2a7e4c9d016"
+down_revision: Union[str, None] = "8d3f0b6a2c51"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_resumes_created_by_user_id_job_id_created_at": (
+        "resumes (created_by_user_id, job_id, is_deleted, created_at DESC, id DESC)"
+    ),
+    "ix_job_descriptions_created_by_user_id_created_at": (
+        "job_descriptions (created_by_user_id, is_deleted, created_at DESC, id DESC)"
+    ),
+    "ix_post_created_by_user_id_created_at": "post (created_by_user_id, is_deleted, created_at DESC, id DESC)",
+    "ix_user_is_deleted_created_at": '"user" (is_deleted, created_at DESC, id DESC)',
+}
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
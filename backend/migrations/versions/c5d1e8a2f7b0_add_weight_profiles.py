@@ -0,0 +1,60 @@
+"""add weight profiles and index parsed resumes by job
+
+Revision ID: c5d1e8a2f7b0
+Revises: 7b2e4d91c6a3
+Create Date: 2026-10-18 20:15:00.000000
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5d1e8a2f7b0"
+down_revision: Union[str, None] = "7b2e4d91c6a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The table may already exist, created at startup by the application
+    if "weight_profiles" in sa.inspect(op.get_bind()).get_table_names():
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_parsed_resumes_job_description_id ON parsed_resumes (job_description_id)"
+        )
+        return
+
+    op.create_table(
+        "weight_profiles",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("created_by_user_id", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=True),
+        sa.Column("yes_match_weight", sa.Float(), nullable=True),
+        sa.Column("partial_match_weight", sa.Float(), nullable=True),
+        sa.Column("no_match_weight", sa.Float(), nullable=True),
+        sa.Column("required_skills_weight", sa.Float(), nullable=True),
+        sa.Column("nice_to_have_skills_weight", sa.Float(), nullable=True),
+        sa.Column("uuid", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("is_deleted", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(["created_by_user_id"], ["user.id"]),
+        sa.ForeignKeyConstraint(["job_id"], ["job_descriptions.id"]),
+        sa.PrimaryKeyConstraint("id", "uuid"),
+        sa.UniqueConstraint("id"),
+        sa.UniqueConstraint("uuid"),
+    )
+    op.create_index("ix_weight_profiles_created_by_user_id", "weight_profiles", ["created_by_user_id"])
+    op.create_index("ix_weight_profiles_job_id", "weight_profiles", ["job_id"])
+    op.create_index("ix_weight_profiles_is_deleted", "weight_profiles", ["is_deleted"])
+    op.execute("CREATE INDEX IF NOT EXISTS ix_parsed_resumes_job_description_id ON parsed_resumes (job_description_id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_parsed_resumes_job_description_id")
+    op.drop_table("weight_profiles")
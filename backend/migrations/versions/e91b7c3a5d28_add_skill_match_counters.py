@@ -0,0 +1,67 @@
+"""add skill match counters to parsed resumes
+
+Revision ID: e91b7c3a5d28
+Revises: c5d1e8a2f7b0
+Create Date: 2026-10-18 21:40:00.000000
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e91b7c3a5d28"
+down_revision: Union[str, None] = "c5d1e8a2f7b0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SKILL_COUNT_GROUPS = {
+    "required_hard": ("required_skills", "hard_skills"),
+    "required_soft": ("required_skills", "soft_skills"),
+    "nice_to_have_hard": ("nice_to_have_skills", "hard_skills"),
+    "nice_to_have_soft": ("nice_to_have_skills", "soft_skills"),
+}
+SKILL_COUNT_MATCHES = {"yes": "YES", "partial": "PARTIAL", "no": "NO"}
+BATCH_SIZE = 5000
+
+
+def _count_expression(requirement: str, skill_type: str, match: str | None) -> str:
+    """Count the skills of a group of `parsed_skills`, the ones with the given match or all of them."""
+    group = f"parsed_skills -> '{requirement}' -> '{skill_type}'"
+    condition = f"WHERE skill.value ->> 'match' = '{match}'" if match is not None else ""
+    return (
+        f"CASE WHEN jsonb_typeof({group}) = 'object' "
+        f"THEN (SELECT count(*) FROM jsonb_each({group}) AS skill {condition}) ELSE 0 END"
+    )
+
+
+def upgrade() -> None:
+    columns: dict[str, str] = {}
+    for prefix, (requirement, skill_type) in SKILL_COUNT_GROUPS.items():
+        for count, match in SKILL_COUNT_MATCHES.items():
+            columns[f"{prefix}_{count}"] = _count_expression(requirement, skill_type, match)
+        columns[f"{prefix}_total"] = _count_expression(requirement, skill_type, None)
+
+    for column in columns:
+        op.execute(f"ALTER TABLE parsed_resumes ADD COLUMN IF NOT EXISTS {column} INTEGER NOT NULL DEFAULT 0")
+
+    # Backfill in id ranges committed one by one, so that row locks are only held for one batch at a time
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        min_id, max_id = connection.execute(sa.text("SELECT min(id), max(id) FROM parsed_resumes")).one()
+        if min_id is None:
+            return
+
+        assignments = ", ".join(f"{column} = {expression}" for column, expression in columns.items())
+        update = sa.text(f"UPDATE parsed_resumes SET {assignments} WHERE id >= :start AND id < :end")
+        for start in range(min_id, max_id + 1, BATCH_SIZE):
+            connection.execute(update, {"start": start, "end": start + BATCH_SIZE})
+
+
+def downgrade() -> None:
+    for prefix in SKILL_COUNT_GROUPS:
+        for count in (*SKILL_COUNT_MATCHES, "total"):
+            op.drop_column("parsed_resumes", f"{prefix}_{count}")
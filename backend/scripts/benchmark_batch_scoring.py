@@ -0,0 +1,48 @@
+"""Compare the throughput of the batch scorer with the per-resume score calculation.
+
+Run from the backend directory with `python -m scripts.benchmark_batch_scoring`.
+"""
+
+import asyncio
+import logging
+import random
+import timeit
+
+from app.schemas.parsed_resume import ParsedResumeRead
+from app.services.scorer.batch import build_skill_matrix, score_batch, score_skill_matrix
+from app.services.scorer.calculation import score_calculation
+from app.services.scorer.fixtures import make_parsed_skills
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RESUMES = 10_000
+REPEAT = 5
+
+
+async def score_one_by_one(parsed_resumes: list[ParsedResumeRead]) -> list[float]:
+    return [await score_calculation(parsed_resume) for parsed_resume in parsed_resumes]
+
+
+def main() -> None:
+    rng = random.Random(0)
+    parsed_skills = [make_parsed_skills(rng, min_skills=3, max_skills=10) for _ in range(RESUMES)]
+    parsed_resumes = [ParsedResumeRead.model_construct(parsed_skills=skills) for skills in parsed_skills]
+    matrix = build_skill_matrix(parsed_skills)
+    logger.info(f"Scoring {RESUMES} resumes with {len(matrix.match)} skills, best of {REPEAT} runs")
+
+    if score_batch(parsed_skills) != asyncio.run(score_one_by_one(parsed_resumes)):
+        raise AssertionError("The batch scores differ from the per-resume scores")
+
+    runs = (
+        ("score_calculation per resume", lambda: asyncio.run(score_one_by_one(parsed_resumes))),
+        ("score_batch including build_skill_matrix", lambda: score_batch(parsed_skills)),
+        ("score_skill_matrix only", lambda: score_skill_matrix(matrix)),
+    )
+    for name, func in runs:
+        seconds = min(timeit.repeat(func, number=1, repeat=REPEAT))
+        logger.info(f"{name}: {seconds * 1000:.1f}ms, {RESUMES / seconds:,.0f} resumes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Compare the cost of storing a cached response before and after the compiled key templates and the fast codec.
+
+Only the work done in the process is measured, the write path also went from three Redis round trips (SET, EXPIRE
+and the tags pipeline) to a single pipeline.
+
+Run from the backend directory with `python -m scripts.benchmark_cache_codec`.
+"""
+
+import json
+import logging
+import random
+import re
+import string
+import timeit
+from datetime import UTC, datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.utils import cache_codec
+from app.core.utils.cache import _compile_template
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ITEMS_PER_PAGE = 20
+TEXT_LENGTH = 4000
+NUMBER = 200
+REPEAT = 5
+KEY_PREFIX = "{username}_resumes:job_{job_id}:page_{page}:items_per_page:{items_per_page}:cursor_{cursor}:total_{total}"
+KWARGS = {
+    "username": "alice",
+    "job_id": 12,
+    "page": 3,
+    "items_per_page": ITEMS_PER_PAGE,
+    "cursor": None,
+    "total": "none",
+}
+
+
+def make_page(rng: random.Random) -> dict:
+    now = datetime.now(UTC)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10))) for _ in range(300)]
+    return {
+        "data": [
+            {
+                "id": index,
+                "candidate_name": f"Candidate {index}",
+                "job_id": KWARGS["job_id"],
+                "s3_url": f"https://bucket.s3.amazonaws.com/resumes/{index}.pdf",
+                "resume_text": " ".join(rng.choices(words, k=TEXT_LENGTH // 6)),
+                "created_at": now - timedelta(minutes=index),
+                "updated_at": None,
+            }
+            for index in range(ITEMS_PER_PAGE)
+        ],
+        "total_count": 1000,
+        "has_more": True,
+        "page": KWARGS["page"],
+        "items_per_page": ITEMS_PER_PAGE,
+    }
+
+
+def format_prefix(prefix: str, kwargs: dict) -> str:
+    # The key formatting of the decorator before the templates were compiled
+    data_inside_brackets = re.findall(r"{(.*?)}", prefix)
+    return prefix.format(**{key: kwargs[key] for key in data_inside_brackets})
+
+
+def old_path(page: dict) -> tuple[str, bytes]:
+    key = f"{format_prefix(KEY_PREFIX, KWARGS)}:{KWARGS['username']}"
+    serialized_data = json.dumps(jsonable_encoder(page))
+    json.loads(serialized_data)
+    return key, serialized_data.encode()
+
+
+def new_path(page: dict, codec: cache_codec.CacheCodec, compress_min_size: int) -> tuple[str, bytes]:
+    key = f"{format_key_prefix(KWARGS)}:{KWARGS['username']}"
+    return key, cache_codec.encode(page, codec, compress_min_size)
+
+
+format_key_prefix = _compile_template(KEY_PREFIX)
+
+
+def main() -> None:
+    page = make_page(random.Random(0))
+    logger.info(f"Storing a page of {ITEMS_PER_PAGE} resumes, best of {REPEAT} runs of {NUMBER}")
+
+    runs = {
+        "json, as before": lambda: old_path(page),
+        "json codec, compiled key": lambda: new_path(page, cache_codec.CODECS["json"], 0),
+        "orjson codec, compiled key": lambda: new_path(page, cache_codec.CODECS["orjson"], 0),
+        "orjson codec, zlib": lambda: new_path(page, cache_codec.CODECS["orjson"], 1),
+    }
+    expected = json.loads(old_path(page)[1])
+    for name, func in runs.items():
+        key, value = func()
+        if key != old_path(page)[0] or cache_codec.decode(value, cache_codec.CODECS["orjson"]) != expected:
+            raise AssertionError(f"{name} does not store the same response under the same key")
+
+        seconds = min(timeit.repeat(func, number=NUMBER, repeat=REPEAT)) / NUMBER
+        logger.info(f"{name}: {seconds * 1_000_000:.0f}us per response, {len(value):,} bytes")
+
+    for name, codec in cache_codec.CODECS.items():
+        for compress_min_size in (0, 1):
+            value = cache_codec.encode(page, codec, compress_min_size)
+            seconds = (
+                min(timeit.repeat(lambda: cache_codec.decode(value, codec), number=NUMBER, repeat=REPEAT)) / NUMBER
+            )
+            logger.info(
+                f"read with {name}{', zlib' if compress_min_size else ''}: {seconds * 1_000_000:.0f}us per response"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Compare the throughput of the text normalization of extracted PDFs with the previous character filter.
+
+Run from the backend directory with `python -m scripts.benchmark_text_normalization`.
+"""
+
+import logging
+import string
+import timeit
+
+from app.services.ocr.normalize import normalize_text
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Mostly ASCII like the CVs we receive, with Dutch accents, ligatures, bullets and odd whitespace on some lines
+PAGE = (
+    "Curriculum Vitae - Jürgen de Vries\n"
+    "Senior data engineer with 8 years of experience building data platforms on AWS.\n"
+    "Ervaring:\t* Senior data engineer bij Café Noord (2019–heden)\n"
+    "  * Built ETL pipelines in Python, SQL and Spark processing 2TB of events per day\n"
+    "\uf0b7 Led the migration of the reporting stack to dbt and Snowflake ; ﬁnanciële rapportages\n\n\n"
+    "Skills:  Python,  Kubernetes,  AWS \u200b Terraform\x0c\n"
+    "Languages: Dutch (native), English (fluent), German (basic)\n"
+)
+TEXT_SIZE = 4 * 1024 * 1024
+REPEAT = 5
+
+
+def legacy_filter(text: str) -> str:
+    text = text.replace("*", "")
+    return "".join(x for x in text if x in string.printable)
+
+
+def main() -> None:
+    text = PAGE * (TEXT_SIZE // len(PAGE))
+    size_mb = len(text.encode()) / 1024 / 1024
+    logger.info(f"Normalizing {size_mb:.1f}MB of text, best of {REPEAT} runs")
+
+    for name, func in (("legacy printable filter", legacy_filter), ("normalize_text", normalize_text)):
+        seconds = min(timeit.repeat(lambda: func(text), number=1, repeat=REPEAT))
+        logger.info(f"{name}: {seconds * 1000:.1f}ms, {size_mb / seconds:.1f}MB/s")
+
+
+if __name__ == "__main__":
+    main()
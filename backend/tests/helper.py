@@ -1,4 +1,7 @@
+from __future__ import annotations
+
 from fastapi.testclient import TestClient
+from redis.exceptions import WatchError
 
 
 def _get_token(username: str, password: str, client: TestClient):
@@ -7,3 +10,112 @@ def _get_token(username: str, password: str, client: TestClient):
         data={"username": username, "password": password},
         headers={"content-type": "application/x-www-form-urlencoded"},
     )
+
+
+class FakeLock:
+    def __init__(self, held: set[str], name: str) -> None:
+        self.held = held
+        self.name = name
+
+    async def acquire(self, blocking: bool = True) -> bool:
+        if self.name in self.held:
+            return False
+        self.held.add(self.name)
+        return True
+
+    async def release(self) -> None:
+        self.held.discard(self.name)
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis) -> None:
+        self.redis = redis
+        self.commands: list[tuple[str, tuple, dict]] = []
+        self.watched: dict[str, int] = {}
+
+    async def __aenter__(self) -> FakePipeline:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.commands.clear()
+
+    def __getattr__(self, name: str):
+        return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+
+    async def watch(self, *keys: str) -> None:
+        self.watched = {key: self.redis.versions.get(key, 0) for key in keys}
+
+    def multi(self) -> None:
+        pass
+
+    async def execute(self) -> list:
+        if any(self.redis.versions.get(key, 0) != version for key, version in self.watched.items()):
+            self.commands.clear()
+            raise WatchError
+        results = [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+        self.commands.clear()
+        return results
+
+
+class FakeRedis:
+    """The subset of the Redis client used by the cache and the leaderboard, in memory and without expiration."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, bytes] = {}
+        self.sets: dict[str, set[bytes]] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+        # Bumped by every write to a sorted set, for WATCH
+        self.versions: dict[str, int] = {}
+        self.held: set[str] = set()
+        self.published: list[tuple[str, str]] = []
+
+    def lock(self, name: str, timeout: float) -> FakeLock:
+        return FakeLock(self.held, name)
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    async def get(self, key: str) -> bytes | None:
+        return self.values.get(key)
+
+    async def set(self, key: str, value: bytes, ex: int | None = None) -> bool:
+        self.values[key] = value
+        return True
+
+    async def expire(self, key: str, seconds: int, nx: bool = False, gt: bool = False) -> bool:
+        return True
+
+    async def sadd(self, key: str, *members: str) -> int:
+        self.sets.setdefault(key, set()).update(member.encode() for member in members)
+        return len(members)
+
+    async def smembers(self, key: str) -> set[bytes]:
+        return set(self.sets.get(key, set()))
+
+    async def srem(self, key: str, *members: str) -> int:
+        self.sets.get(key, set()).difference_update(member.encode() for member in members)
+        return len(members)
+
+    async def unlink(self, *keys: str) -> int:
+        return sum(self.values.pop(key, None) is not None for key in keys)
+
+    async def publish(self, channel: str, message: str) -> int:
+        self.published.append((channel, message))
+        return 0
+
+    async def exists(self, *keys: str) -> int:
+        return sum(key in self.values or key in self.zsets for key in keys)
+
+    async def delete(self, *keys: str) -> int:
+        for key in keys:
+            self.versions[key] = self.versions.get(key, 0) + 1
+        return sum((self.values.pop(key, None) is not None) + (self.zsets.pop(key, None) is not None) for key in keys)
+
+    async def zadd(self, key: str, mapping: dict[str, float]) -> int:
+        self.versions[key] = self.versions.get(key, 0) + 1
+        self.zsets.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    async def zrem(self, key: str, *members: str) -> int:
+        self.versions[key] = self.versions.get(key, 0) + 1
+        return sum(self.zsets.get(key, {}).pop(member, None) is not None for member in members)
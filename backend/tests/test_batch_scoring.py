@@ -0,0 +1,47 @@
+import asyncio
+import random
+
+from app.schemas.parsed_resume import ParsedResumeRead
+from app.services.scorer.batch import score_batch
+from app.services.scorer.calculation import score_calculation
+from app.services.scorer.counts import count_skill_matches
+from app.services.scorer.fixtures import make_parsed_skills
+from app.services.scorer.weight import ScoreWeight
+
+
+def test_score_batch_matches_score_calculation():
+    rng = random.Random(42)
+    parsed_skills = [make_parsed_skills(rng) for _ in range(500)]
+    parsed_skills.append({"required_skills": {}, "nice_to_have_skills": {"hard_skills": {}}})
+
+    expected = [
+        asyncio.run(score_calculation(ParsedResumeRead.model_construct(parsed_skills=skills)))
+        for skills in parsed_skills
+    ]
+
+    assert score_batch(parsed_skills) == expected
+
+
+def test_score_batch_applies_weight_overrides():
+    parsed_skills = [
+        {
+            "required_skills": {"hard_skills": {"Python": {"match": "YES"}}},
+            "nice_to_have_skills": {"hard_skills": {"Spark": {"match": "NO"}}},
+        }
+    ]
+
+    assert score_batch(parsed_skills, ScoreWeight(required_skills_weight=3, nice_to_have_skills_weight=1)) == [0.75]
+
+
+def test_count_skill_matches_counts_unknown_matches_in_total():
+    parsed_skills = {
+        "required_skills": {"hard_skills": {"Python": {"match": "YES"}, "Go": {"match": "MAYBE"}}},
+        "nice_to_have_skills": {"soft_skills": {"Dutch": {"match": "PARTIAL"}}},
+    }
+
+    counts = count_skill_matches(parsed_skills)
+
+    assert counts["required_hard_yes"] == 1
+    assert counts["required_hard_total"] == 2
+    assert counts["nice_to_have_soft_partial"] == 1
+    assert sum(counts.values()) == 5
@@ -0,0 +1,45 @@
+import json
+from datetime import UTC, datetime
+
+from app.core.utils import cache_codec
+from app.core.utils.cache import _compile_template
+from app.schemas.common import CommonResponse
+
+
+def test_codecs_store_the_same_json():
+    data = {"data": [{"id": 1, "created_at": datetime(2024, 5, 1, 12, 30, tzinfo=UTC)}], "total_count": 1}
+
+    decoded = [cache_codec.decode(cache_codec.encode(data, codec), codec) for codec in cache_codec.CODECS.values()]
+
+    assert (
+        decoded[0] == decoded[1] == {"data": [{"id": 1, "created_at": "2024-05-01T12:30:00+00:00"}], "total_count": 1}
+    )
+
+
+def test_orjson_codec_serializes_pydantic_models():
+    codec = cache_codec.CODECS["orjson"]
+    response = CommonResponse(status="success", message="ok")
+
+    assert cache_codec.decode(cache_codec.encode({"response": response}, codec), codec) == {
+        "response": response.model_dump()
+    }
+
+
+def test_large_values_are_compressed_and_plain_values_still_read():
+    codec = cache_codec.CODECS["orjson"]
+    data = {"text": "resume " * 1000}
+
+    compressed = cache_codec.encode(data, codec, compress_min_size=1024)
+    small = cache_codec.encode({"id": 1}, codec, compress_min_size=1024)
+
+    assert len(compressed) < 1024
+    assert cache_codec.decode(compressed, codec) == data
+    assert cache_codec.decode(small, codec) == {"id": 1}
+    assert cache_codec.decode(json.dumps(data).encode(), codec) == data
+
+
+def test_compiled_template_formats_the_named_arguments():
+    format_key = _compile_template("{username}_resumes:job_{job_id}")
+
+    assert format_key({"username": "alice", "job_id": 3, "db": None}) == "alice_resumes:job_3"
+    assert _compile_template("leaderboard")({}) == "leaderboard"
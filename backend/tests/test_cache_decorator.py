@@ -0,0 +1,143 @@
+import asyncio
+import contextlib
+import json
+import time
+
+import pytest
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.utils import cache
+
+from .helper import FakeRedis
+
+
+def make_request(method: str) -> Request:
+    return Request({"type": "http", "method": method, "headers": []})
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(cache, "client", fake_redis)
+    monkeypatch.setattr(cache, "local_cache", None)
+    monkeypatch.setattr(cache, "metrics", dict.fromkeys(cache.metrics, 0))
+    return fake_redis
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    opened = []
+
+    @contextlib.asynccontextmanager
+    async def local_session():
+        opened.append(object.__new__(AsyncSession))
+        yield opened[-1]
+
+    monkeypatch.setattr(cache, "local_session", local_session)
+    return opened
+
+
+async def wait_for_refreshes() -> None:
+    await asyncio.gather(*cache._refresh_tasks.values(), return_exceptions=True)
+
+
+def test_stale_response_is_served_then_refreshed_in_the_background(redis, clock, sessions):
+    calls = []
+
+    @cache.cache("{username}_resumes", resource_id_name="username", expiration=60, stale_ttl=300)
+    async def read_resumes(request: Request, username: str, db: AsyncSession) -> dict:
+        calls.append(db)
+        return {"data": [len(calls)]}
+
+    request_db = object.__new__(AsyncSession)
+
+    async def run():
+        assert await read_resumes(make_request("GET"), username="alice", db=request_db) == {"data": [1]}
+        assert list(redis.values) == ["alice_resumes:alice:swr"]
+
+        clock[0] += 61
+        assert await read_resumes(make_request("GET"), username="alice", db=request_db) == {"data": [1]}
+        await wait_for_refreshes()
+
+        assert await read_resumes(make_request("GET"), username="alice", db=request_db) == {"data": [2]}
+
+    asyncio.run(run())
+
+    # The refresh ran with a new session, not the one of the request already answered
+    assert calls == [request_db, sessions[0]]
+    assert cache.metrics["stale_served"] == 1
+    assert cache.metrics["refreshes"] == 1
+
+
+def test_failed_refresh_keeps_serving_the_stale_response(redis, clock, sessions):
+    calls = 0
+
+    @cache.cache("{username}_resumes", resource_id_name="username", expiration=60, stale_ttl=300)
+    async def read_resumes(request: Request, username: str, db: AsyncSession) -> dict:
+        nonlocal calls
+        calls += 1
+        if calls > 1:
+            raise RuntimeError("database unavailable")
+        return {"data": [calls]}
+
+    db = object.__new__(AsyncSession)
+
+    async def run():
+        await read_resumes(make_request("GET"), username="alice", db=db)
+        clock[0] += 61
+        assert await read_resumes(make_request("GET"), username="alice", db=db) == {"data": [1]}
+        await wait_for_refreshes()
+        assert await read_resumes(make_request("GET"), username="alice", db=db) == {"data": [1]}
+        await wait_for_refreshes()
+
+    asyncio.run(run())
+
+    assert cache.metrics["refresh_failures"] == 2
+    assert cache.metrics["refreshes"] == 0
+    assert redis.held == set()
+
+
+def test_tagged_pages_are_invalidated_together(redis):
+    @cache.cache("{username}_posts:page_{page}", resource_id_name="username", tags=["{username}_posts"])
+    async def read_posts(request: Request, username: str, page: int) -> dict:
+        return {"data": [page]}
+
+    @cache.cache("{username}_post_cache", resource_id_name="id", tags_to_invalidate=["{username}_posts"])
+    async def patch_post(request: Request, username: str, id: int) -> dict:
+        return {"message": "Post updated"}
+
+    async def run():
+        for username, page in (("alice", 1), ("alice", 2), ("bob", 1)):
+            await read_posts(make_request("GET"), username=username, page=page)
+
+        assert redis.sets["cache:tag:alice_posts"] == {b"alice_posts:page_1:alice", b"alice_posts:page_2:alice"}
+
+        await patch_post(make_request("PATCH"), username="alice", id=3)
+
+    asyncio.run(run())
+
+    assert "alice_posts:page_1:alice" not in redis.values
+    assert "alice_posts:page_2:alice" not in redis.values
+    assert redis.sets["cache:tag:alice_posts"] == set()
+    assert "bob_posts:page_1:bob" in redis.values
+    assert redis.sets["cache:tag:bob_posts"] == {b"bob_posts:page_1:bob"}
+
+
+def test_invalidation_is_published_without_a_local_cache(redis):
+    @cache.cache("{username}_post_cache", resource_id_name="id")
+    async def patch_post(request: Request, username: str, id: int) -> dict:
+        return {"message": "Post updated"}
+
+    asyncio.run(patch_post(make_request("PATCH"), username="alice", id=3))
+
+    [(channel, message)] = redis.published
+    assert channel == cache.INVALIDATION_CHANNEL
+    assert "alice_post_cache:3" in json.loads(message)["keys"]
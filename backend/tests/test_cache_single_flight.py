@@ -0,0 +1,43 @@
+import asyncio
+
+from app.core.utils import cache
+
+from .helper import FakeRedis
+
+
+def test_concurrent_misses_compute_once(monkeypatch):
+    monkeypatch.setattr(cache, "client", FakeRedis())
+    monkeypatch.setattr(cache, "metrics", dict.fromkeys(cache.metrics, 0))
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"id": 1}
+
+    async def run():
+        return await asyncio.gather(*(cache._compute_once("post:1", compute) for _ in range(5)))
+
+    results = asyncio.run(run())
+
+    assert calls == 1
+    assert results == [{"id": 1}] * 5
+    assert cache.get_stats()["coalesced"] == 4
+    assert cache.get_stats()["inflight"] == 0
+
+
+def test_failed_recomputation_is_raised_to_every_caller(monkeypatch):
+    monkeypatch.setattr(cache, "client", FakeRedis())
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def run():
+        return await asyncio.gather(*(cache._compute_once("post:1", compute) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert cache._inflight == {}
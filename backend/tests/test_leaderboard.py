@@ -0,0 +1,119 @@
+import asyncio
+import random
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_current_user
+from app.api.v1 import scores
+from app.core.db.database import async_get_db
+from app.core.utils import leaderboard
+from app.main import app
+from app.schemas.parsed_resume import ParsedResumeRead
+from app.services.scorer.fixtures import make_parsed_skills
+
+from .helper import FakeRedis
+
+JOB_ID = 7
+
+
+class ScoresSession:
+    """Return a new snapshot of the scores on each read, running a concurrent leaderboard write during the read."""
+
+    def __init__(self, snapshots: list[list[tuple[int, float]]], during_read: Callable[[], Awaitable[None]]) -> None:
+        self.snapshots = snapshots
+        self.during_read = during_read
+
+    async def execute(self, query):
+        await self.during_read()
+        rows = self.snapshots.pop(0) if len(self.snapshots) > 1 else self.snapshots[0]
+        return SimpleNamespace(all=lambda: rows)
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(leaderboard, "client", fake_redis)
+    return fake_redis
+
+
+def once(write: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+    calls = []
+
+    async def during_read() -> None:
+        if not calls:
+            calls.append(None)
+            await write()
+
+    return during_read
+
+
+def test_score_added_during_rebuild_is_kept(redis):
+    db = ScoresSession(
+        [[(1, 50.0)], [(1, 50.0), (2, 80.0)]],
+        once(lambda: leaderboard.add_score(job_id=JOB_ID, resume_id=2, score=80.0)),
+    )
+
+    assert asyncio.run(leaderboard.rebuild(db=db, job_id=JOB_ID)) == 2
+    assert redis.zsets[leaderboard._key(JOB_ID)] == {"1": 50.0, "2": 80.0}
+    assert leaderboard._built_key(JOB_ID) in redis.values
+
+
+def test_resume_removed_during_rebuild_stays_removed(redis):
+    asyncio.run(leaderboard.add_score(job_id=JOB_ID, resume_id=2, score=80.0))
+    db = ScoresSession(
+        [[(1, 50.0), (2, 80.0)], [(1, 50.0)]],
+        once(lambda: leaderboard.remove_resume(job_id=JOB_ID, resume_id=2)),
+    )
+
+    assert asyncio.run(leaderboard.rebuild(db=db, job_id=JOB_ID)) == 1
+    assert redis.zsets[leaderboard._key(JOB_ID)] == {"1": 50.0}
+
+
+def test_rebuild_racing_every_attempt_is_not_marked_built(redis):
+    db = ScoresSession([[]], lambda: leaderboard.add_score(job_id=JOB_ID, resume_id=3, score=60.0))
+
+    assert asyncio.run(leaderboard.rebuild(db=db, job_id=JOB_ID)) is None
+    assert redis.zsets[leaderboard._key(JOB_ID)] == {"3": 60.0}
+    assert leaderboard._built_key(JOB_ID) not in redis.values
+
+
+def test_create_score_updates_the_leaderboard(redis, monkeypatch):
+    user = {"id": 1, "username": "alice"}
+    parsed_resume = ParsedResumeRead(
+        id=40,
+        job_description_id=JOB_ID,
+        resume_id=12,
+        parsed_skills=make_parsed_skills(random.Random(0), min_skills=1),
+        created_at=datetime.now(UTC),
+    )
+    queries = {}
+
+    async def get_user(**kwargs):
+        return user
+
+    async def get_parsed_resumes(**kwargs):
+        queries["parsed_resume"] = kwargs
+        return {"data": [parsed_resume], "total_count": 1}
+
+    async def get_parsed_job_description(**kwargs):
+        return {"id": 5}
+
+    async def create_score(db, object):
+        return SimpleNamespace(id=1, created_at=datetime.now(UTC), **object.model_dump())
+
+    monkeypatch.setattr(scores.crud_users, "get", get_user)
+    monkeypatch.setattr(scores.crud_parsed_resume, "get_multi", get_parsed_resumes)
+    monkeypatch.setattr(scores.crud_parsed_job_description, "get", get_parsed_job_description)
+    monkeypatch.setattr(scores.crud_scores, "create", create_score)
+    monkeypatch.setitem(app.dependency_overrides, async_get_db, lambda: None)
+    monkeypatch.setitem(app.dependency_overrides, get_current_user, lambda: user)
+
+    response = TestClient(app).post(f"/api/v1/alice/{parsed_resume.resume_id}/{JOB_ID}", json={"score": 0})
+
+    assert response.status_code == 200
+    assert queries["parsed_resume"]["resume_id"] == parsed_resume.resume_id
+    assert list(redis.zsets[leaderboard._key(JOB_ID)]) == [str(parsed_resume.resume_id)]
@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.core.utils.llm_scheduler import LLMScheduler, TokenBucket, parse_reset_duration
+
+
+def test_token_bucket_refills_continuously():
+    bucket = TokenBucket(60, now=0.0)
+    bucket.consume(60, now=0.0)
+
+    assert bucket.wait_time(1, now=0.0) == pytest.approx(1.0)
+    assert bucket.wait_time(30, now=10.0) == pytest.approx(20.0)
+    assert bucket.wait_time(30, now=30.0) == 0.0
+    # Requests larger than the limit wait for a full bucket
+    assert bucket.wait_time(600, now=30.0) == pytest.approx(30.0)
+
+
+def test_token_bucket_sync_never_raises_the_configured_limit():
+    bucket = TokenBucket(100, now=0.0)
+
+    bucket.sync(limit=1000, remaining=900, reset_after=None, now=0.0)
+    assert bucket.limit == 100
+    assert bucket.available == 100
+
+    bucket.sync(limit=50, remaining=None, reset_after=None, now=0.0)
+    assert bucket.limit == 50
+    assert bucket.available == 50
+
+
+def test_token_bucket_sync_waits_for_the_reset_when_exhausted():
+    bucket = TokenBucket(60, now=0.0)
+
+    bucket.sync(limit=None, remaining=0, reset_after=parse_reset_duration("2s"), now=0.0)
+
+    assert bucket.wait_time(1, now=0.0) == pytest.approx(3.0)
+    assert bucket.wait_time(1, now=3.0) == 0.0
+
+
+def test_scheduler_budgets_are_per_model():
+    scheduler = LLMScheduler(requests_per_minute=500, tokens_per_minute=10000)
+
+    scheduler.observe({"x-ratelimit-limit-tokens": "2000", "x-ratelimit-remaining-tokens": "0"}, 200, "gpt-4")
+    scheduler.observe({"retry-after": "5"}, 429, "gpt-4")
+
+    assert scheduler.budget("gpt-4").tokens.limit == 2000
+    assert scheduler.budget("gpt-4").blocked_until > 0
+    assert scheduler.budget("gpt-3.5").tokens.limit == 10000
+    assert scheduler.budget("gpt-3.5").blocked_until == 0
+
+
+def test_request_hook_reserves_the_budget_of_the_model():
+    scheduler = LLMScheduler(requests_per_minute=500, tokens_per_minute=10000)
+    body = {"model": "gpt-4", "messages": [{"role": "user", "content": "x" * 400}], "max_tokens": 100}
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions", content=json.dumps(body))
+
+    asyncio.run(scheduler.before_request(request))
+
+    # 100 prompt tokens, 4 for the message and the 100 of max_tokens
+    assert scheduler.budget("gpt-4").tokens.available == pytest.approx(10000 - 204, abs=1)
+    assert scheduler.budget("gpt-4").requests.available == pytest.approx(499, abs=0.1)
+    assert "gpt-3.5" not in scheduler.budgets
@@ -0,0 +1,39 @@
+import time
+
+from app.core.utils.cache import LocalCache
+
+
+def test_local_cache_evicts_least_recently_used_entry():
+    local_cache = LocalCache(max_size=2, ttl=60)
+    local_cache.set("a", 1)
+    local_cache.set("b", 2)
+    local_cache.get("a")
+    local_cache.set("c", 3)
+
+    assert local_cache.get("a") == 1
+    assert local_cache.get("b") is None
+    assert local_cache.get("c") == 3
+
+
+def test_local_cache_entries_expire(monkeypatch):
+    local_cache = LocalCache(max_size=10, ttl=5)
+    local_cache.set("a", 1)
+    local_cache.set("b", 2, ttl=1)
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 2)
+
+    assert local_cache.get("a") == 1
+    assert local_cache.get("b") is None
+
+
+def test_local_cache_deletes_keys_matching_pattern():
+    local_cache = LocalCache(max_size=10, ttl=60)
+    for key in ("alice_posts:page_1:1", "alice_posts:page_2:2", "alice_post_cache:1"):
+        local_cache.set(key, key)
+
+    local_cache.delete_pattern("alice_posts:*")
+
+    assert local_cache.get("alice_posts:page_1:1") is None
+    assert local_cache.get("alice_posts:page_2:2") is None
+    assert local_cache.get("alice_post_cache:1") == "alice_post_cache:1"
@@ -0,0 +1,17 @@
+from app.services.ocr.normalize import normalize_text
+
+
+def test_normalize_text_keeps_accented_characters():
+    assert normalize_text("Jürgen de Vries, café, coöperatie") == "Jürgen de Vries, café, coöperatie"
+
+
+def test_normalize_text_collapses_whitespace():
+    assert normalize_text("  Python,\u00a0\tSQL  \r\n\n\n\n  Spark \n") == "Python, SQL\n\nSpark"
+
+
+def test_normalize_text_strips_control_characters():
+    assert normalize_text("Py\x00th\u200bon\x07 *Kubernetes* \ufeff\uf0b7") == "Python Kubernetes"
+
+
+def test_normalize_text_expands_ligatures():
+    assert normalize_text("ﬁnance ﬂow") == "finance flow"
@@ -0,0 +1,18 @@
+from datetime import UTC, datetime
+
+import pytest
+from fastcrud.exceptions.http_exceptions import BadRequestException
+
+from app.api.paginated import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip_keeps_microseconds_and_timezone():
+    created_at = datetime(2026, 10, 18, 9, 30, 15, 123456, tzinfo=UTC)
+
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "WyJub3QgYSBkYXRlIiwgMV0=", "e30="])
+def test_decode_cursor_rejects_invalid_cursors(cursor):
+    with pytest.raises(BadRequestException):
+        decode_cursor(cursor)
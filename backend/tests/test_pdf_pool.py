@@ -0,0 +1,35 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.core.utils import pdf_pool
+
+
+def test_stuck_document_does_not_block_the_pool(monkeypatch):
+    monkeypatch.setattr(settings, "PDF_POOL_WORKERS", 1)
+    monkeypatch.setattr(settings, "PDF_POOL_TIMEOUT", 3.0)
+
+    async def run():
+        pdf_pool.executor = pdf_pool.create_executor()
+        pdf_pool.semaphore = asyncio.Semaphore(settings.PDF_POOL_WORKERS)
+        try:
+            # Warm up the child, the timeout must not include its start
+            assert await pdf_pool.run_in_pool(abs, -1) == 1
+            stuck_pool = pdf_pool.executor
+
+            with pytest.raises(TimeoutError):
+                await pdf_pool.run_in_pool(time.sleep, 60)
+
+            assert pdf_pool.executor is not stuck_pool
+            assert await pdf_pool.run_in_pool(abs, -2) == 2
+        finally:
+            pdf_pool.executor.shutdown(wait=False, cancel_futures=True)
+            pdf_pool.executor = None
+            pdf_pool.semaphore = None
+
+    asyncio.run(run())
+
+    assert pdf_pool.metrics["timed_out"] >= 1
+    assert pdf_pool.metrics["running"] == 0
@@ -0,0 +1,28 @@
+import pytest
+
+from app.services.resume.skill_filter import GroupPredicate, SkillFilterError, SkillPredicate, build_skill_filters
+
+
+def test_skill_predicate_keeps_colons_in_skill_names():
+    assert SkillPredicate.parse("nice_to_have_hard:C++:partial") == SkillPredicate(
+        group="nice_to_have_hard", skill="C++", match="PARTIAL"
+    )
+    assert SkillPredicate.parse("required_hard:ISO 27001:2013:YES").skill == "ISO 27001:2013"
+
+
+@pytest.mark.parametrize("value", ["required_hard:Kubernetes", "required:Kubernetes:YES", "required_hard::YES"])
+def test_skill_predicate_rejects_invalid_values(value):
+    with pytest.raises(SkillFilterError):
+        SkillPredicate.parse(value)
+
+
+def test_build_skill_filters_merges_predicates_into_one_containment():
+    filters = build_skill_filters(
+        skills=[SkillPredicate.parse("required_hard:Kubernetes:YES"), SkillPredicate.parse("required_hard:Go:NO")],
+        every=[GroupPredicate.parse("required_soft:YES")],
+    )
+
+    assert len(filters) == 2
+    assert filters[0].right.value == {
+        "required_skills": {"hard_skills": {"Kubernetes": {"match": "YES"}, "Go": {"match": "NO"}}}
+    }